@@ -7,50 +7,48 @@
 # 5. Urbano Meza Joseph Gael
 
 import ply.lex as lex
+from array import array
+from collections import Counter, defaultdict
+from itertools import compress
+import glob
+import importlib.util
+import os
+import sys
+
+# La tabla de reglas (perfil 'category') y la firma de las reglas vienen de SCANNER_C,
+# que solo usa la biblioteca estándar. Esa carpeta no es un paquete (tiene puntos en
+# el nombre), así que se carga por ruta: sin tocar sys.path ni sys.modules y sin
+# ejecutar ningún otro módulo del compilador.
+SCANNER_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                                             'unam.fi.compilers.g5.01', 'SCANNER_C.py'))
+
+def _load_scanner():
+    """SCANNER_C del compilador; el que ya esté importado si viene del mismo archivo"""
+    module = sys.modules.get('SCANNER_C')
+    if module is not None and os.path.abspath(getattr(module, '__file__', None) or '') == SCANNER_PATH:
+        return module
+    spec = importlib.util.spec_from_file_location('SCANNER_C', SCANNER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+SCANNER_C = _load_scanner()
 
 # Lista para guardar los errores.
 errores = []
 
 # Definimos los tokens que edintificara el programa.
 
-tokens = ('KEYWORDS', 'IDENTIFIER', 'OPERATOR', 'CONSTANT', 'PUNCTUATION', 'LITERAL')
+tokens = SCANNER_C.CATEGORY_TOKENS
 
-# Definición de expresiones regulares para cada tipo de token.
+# Reglas de cada tipo de token: se generan de los patrones del perfil 'category' de
+# SCANNER_C.RULES. Las palabras reservadas van con \b a los dos lados (t_word), los
+# encabezados #include y los saltos de línea se ignoran (t_header, t_newline).
+globals().update(SCANNER_C.ply_rules('category'))
 
-def t_KEYWORDS(t):
-    r'\b(const|double|float|int|short|char|long|struct|break|for|if|else|switch|case|do|while|default|goto|void|return)\b'
-    return t
+# Ignorar espacios (los saltos de línea los consume t_newline)
 
-    return t
-    
-def t_IDENTIFIER(t):
-    r'[a-zA-Z_][a-zA-Z_0-9]*'
-    return t
-
-def t_OPERATOR(t):
-    r'==|!=|<=|>=|<|>|=|\+|\-|\*|/'
-    return t
-
-def t_CONSTANT(t):
-    r'\d+(\.\d+)?'
-    return t
-
-def t_PUNCTUATION(t):
-    r'[\(\):\[\]\{\};,.]'
-    return t
-
-def t_LITERAL(t):
-    r'"([^"\\]|\\.)*"'
-    return t
-
-def t_HEADER(t):
-    r'\#include\s*(<[^>]+>|"[^"]+")'
-    pass  # No retorna token, por lo tanto lo ignora completamente. 
-
-
-# Ignorar espacios y saltos de línea
-
-t_ignore = ' \t\n'
+t_ignore = SCANNER_C.BLANKS
 
 # Manejo de errores en caracteres desconocidos
 def t_error(t):
@@ -58,45 +56,165 @@ def t_error(t):
     errores.append(mensaje_error)  # Agregar el mensaje a la lista global
     t.lexer.skip(1)
 
-# Crea el lexer
-lexer = lex.lex()
+# Crea el lexer. La tabla se guarda en lextab_<hash>.py; el hash cambia cuando
+# cambia cualquier regla, así que una tabla vieja nunca se re-usa.
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+lextab = f"lextab_{SCANNER_C.rules_signature(globals())}"
+if not os.path.exists(os.path.join(TABLE_DIR, lextab + ".py")):
+    for stale in glob.glob(os.path.join(TABLE_DIR, "lextab_*.py")):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+lexer = lex.lex(optimize=True, lextab=lextab, outputdir=TABLE_DIR)
+
+# ==================== ESTADÍSTICAS EN BLOQUE ====================
+
+# Categorías del reporte, en el mismo orden que 'tokens' (código = índice)
+CATEGORIES = ("Keywords", "Identifiers", "Operators", "Constants", "Punctuation", "Literals")
+TYPE_CODES = {token_type: code for code, token_type in enumerate(tokens)}
+IDENTIFIER_CODE = TYPE_CODES['IDENTIFIER']
+_IDENTIFIER_MASK = bytes(1 if code == IDENTIFIER_CODE else 0 for code in range(256))
+
+class TokenStats:
+    """Tokens de uno o varios archivos guardados como códigos de tipo (un byte por token)
+
+    Los histogramas por categoría, la frecuencia de identificadores y las
+    estadísticas por archivo se calculan de una vez sobre todos los archivos
+    (bytes.count, Counter). Los reportes de texto se arman solo cuando se piden.
+    """
+    def __init__(self):
+        self.names = []             # nombre de cada archivo
+        self.codes = array('b')     # tipo de cada token (índice en CATEGORIES)
+        self.values = []            # texto de cada token
+        self.offsets = [0]          # primer token de cada archivo (y el total al final)
+        self.errors = []            # errores léxicos de cada archivo
+        self._identifiers = None
+        self._reports = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, code, name=None):
+        """Tokeniza un archivo y lo agrega al corpus; retorna su índice"""
+        lexer.input(code)
+        found = [(tok.type, tok.value) for tok in lexer]
+        self.codes.frombytes(bytes([TYPE_CODES[token_type] for token_type, _ in found]))
+        self.values += [value for _, value in found]
+        self.names.append(name if name is not None else f"<{len(self.names)}>")
+        self.offsets.append(len(self.codes))
+        self.errors.append(list(errores))
+        errores.clear()
+        self._identifiers = None
+        return len(self.names) - 1
+
+    def add_files(self, paths, encoding='utf-8'):
+        for path in paths:
+            with open(path, encoding=encoding, errors='replace') as file:
+                self.add(file.read(), path)
+        return self
+
+    # ---------- agregados ----------
+
+    def _identifier_table(self):
+        """(vocabulario, índice en el vocabulario de cada IDENTIFIER, apariciones de cada uno)
+
+        Todo con funciones de C (translate, compress, map): sin un ciclo de Python por token.
+        """
+        if self._identifiers is None:
+            mask = self.codes.tobytes().translate(_IDENTIFIER_MASK)
+            index_of = defaultdict()
+            index_of.default_factory = index_of.__len__    # nuevo identificador -> siguiente índice
+            ids = array('q', map(index_of.__getitem__, compress(self.values, mask)))
+            counter = Counter(ids)
+            counts = [counter[index] for index in range(len(index_of))]
+            self._identifiers = (list(index_of), ids, counts)
+        return self._identifiers
+
+    def histogram(self):
+        """{categoría: tokens} de todo el corpus"""
+        raw = self.codes.tobytes()
+        counts = [raw.count(code) for code in range(len(CATEGORIES))]
+        return dict(zip(CATEGORIES, counts))
+
+    def file_histograms(self):
+        """[[tokens de cada categoría] por archivo]"""
+        width = len(CATEGORIES)
+        raw = self.codes.tobytes()
+        offsets = self.offsets
+        return [[raw.count(code, offsets[index], offsets[index + 1]) for code in range(width)]
+                for index in range(len(self.names))]
+
+    def identifier_frequencies(self, top=None):
+        """[(identificador, apariciones)] de todo el corpus, del más usado al menos usado"""
+        vocabulary, _, counts = self._identifier_table()
+        return sorted(zip(vocabulary, counts), key=lambda item: (-item[1], item[0]))[:top]
+
+    def distinct_identifiers(self):
+        """[identificadores distintos] por archivo"""
+        _, ids, _ = self._identifier_table()
+        result = []
+        position = 0
+        for count in (row[IDENTIFIER_CODE] for row in self.file_histograms()):
+            result.append(len(set(ids[position:position + count])))
+            position += count
+        return result
+
+    def file_stats(self):
+        """[{archivo, tokens, categorías, errores, identificadores distintos}] por archivo"""
+        stats = []
+        for name, row, errors, distinct in zip(self.names, self.file_histograms(), self.errors,
+                                               self.distinct_identifiers()):
+            entry = {'file': name, 'tokens': sum(row), 'errors': len(errors), 'distinct_identifiers': distinct}
+            entry.update(zip(CATEGORIES, row))
+            stats.append(entry)
+        return stats
+
+    # ---------- reportes ----------
+
+    def report(self, index=0):
+        """Reporte de un archivo (el mismo texto que analyze_code); se arma la primera vez que se pide"""
+        text = self._reports.get(index)
+        if text is None:
+            start, end = self.offsets[index], self.offsets[index + 1]
+            codes = self.codes[start:end]
+            values = self.values[start:end]
+            by_type = [[] for _ in CATEGORIES]
+            for code, value in zip(codes, values):
+                by_type[code].append(value)
+            lines = [""]
+            lines += self.errors[index]
+            lines.append("\n=== Tokens ===")
+            lines += [f"{key}: {values}" for key, values in zip(CATEGORIES, by_type)]
+            lines.append(f"\nTotal de tokens = {end - start}")
+            text = self._reports[index] = "\n".join(lines)
+        return text
+
+    def summary(self, top=10):
+        """Reporte del corpus: histograma, identificadores más usados y una línea por archivo"""
+        total = self.offsets[-1]
+        lines = [f"=== Corpus: {len(self.names)} archivos, {total} tokens ==="]
+        for category, count in self.histogram().items():
+            share = count / total * 100 if total else 0.0
+            lines.append(f"{category:<12}{count:>10}{share:>8.1f}%")
+        lines.append(f"\n=== {top} identificadores más usados ===")
+        lines += [f"{name:<24}{count:>8}" for name, count in self.identifier_frequencies(top)]
+        lines.append("\n=== Por archivo ===")
+        header = "".join(f"{category[:5]:>7}" for category in CATEGORIES)
+        lines.append(f"{'Archivo':<30}{'Tokens':>8}{header}{'Errores':>9}{'Ids':>6}")
+        for entry in self.file_stats():
+            row = "".join(f"{entry[category]:>7}" for category in CATEGORIES)
+            lines.append(f"{os.path.basename(entry['file'])[:29]:<30}{entry['tokens']:>8}{row}"
+                         f"{entry['errors']:>9}{entry['distinct_identifiers']:>6}")
+        return "\n".join(lines)
+
+def analyze_files(paths, encoding='utf-8'):
+    """TokenStats de varios archivos (un solo corpus)"""
+    return TokenStats().add_files(paths, encoding)
 
 # Función para analizar código y devolver los tokens
 def analyze_code(code):
-    lexer.input(code)
-    
-    tokens_by_type = {
-        "Keywords": [],
-        "Identifiers": [],
-        "Operators": [],
-        "Constants": [],
-        "Punctuation": [],
-        "Literals": []
-    }
-    
-    total_tokens = 0
-    for tok in lexer:
-        total_tokens += 1
-        if tok.type == "KEYWORDS":
-            tokens_by_type["Keywords"].append(tok.value)
-        elif tok.type == "IDENTIFIER":
-            tokens_by_type["Identifiers"].append(tok.value)
-        elif tok.type == "OPERATOR":
-            tokens_by_type["Operators"].append(tok.value)
-        elif tok.type == "CONSTANT":
-            tokens_by_type["Constants"].append(tok.value)
-        elif tok.type == "PUNCTUATION":
-            tokens_by_type["Punctuation"].append(tok.value)
-        elif tok.type == "LITERAL":
-            tokens_by_type["Literals"].append(tok.value)
-    
-    # Formatear salida
-    result = "\n"
-    for error in errores:
-        result += f"{error}\n"
-    result += "\n=== Tokens ===\n"
-    for key, values in tokens_by_type.items():
-        result += f"{key}: {values}\n"
-    result += f"\nTotal de tokens = {total_tokens}"
-    errores.clear()
-    return result
+    stats = TokenStats()
+    stats.add(code)
+    return stats.report()
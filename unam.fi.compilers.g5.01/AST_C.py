@@ -0,0 +1,317 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Nodos del AST. Cada clase usa __slots__ (sin __dict__ por nodo) y guarda la
+# línea y posición del primer token. Para no romper el código que recorría las
+# tuplas anteriores, node[0] es el tipo ('binop', 'if', ...) y node[1:] son los
+# campos en el mismo orden que en la tupla (también con índices negativos), y dos
+# nodos son iguales si lo serían sus tuplas: mismo tipo y mismos campos, sin importar
+# la posición. Para comparar con una tupla anterior se usa node.astuple().
+#
+# Las expresiones (BinOp, Number, Id) guardan además 'folded': su valor constante,
+# calculado una sola vez por el parser al reducir la expresión (None si no se conoce).
+# No es un campo del árbol, así que no aparece en values() ni en el árbol impreso.
+#
+# Un árbol de una expresión larga (a + b + ... ) es tan profundo como términos
+# tiene, así que nada aquí lo recorre con recursión: as_tuple usa una pila y
+# pickle/JSON usan la tabla plana de to_rows (ver Node.__reduce__).
+
+class Node:
+    """Nodo base del AST"""
+    __slots__ = ('lineno', 'lexpos')
+    kind = 'node'
+    fields = ()
+
+    def values(self):
+        """Campos del nodo en orden (equivalente a tupla[1:])"""
+        return tuple(getattr(self, name) for name in self.fields)
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.kind
+        return ((self.kind,) + self.values())[index]
+
+    def __len__(self):
+        return len(self.fields) + 1
+
+    def __iter__(self):
+        yield self.kind
+        yield from self.values()
+
+    def __eq__(self, other):
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self is other or _flat(self) == _flat(other)
+
+    def __hash__(self):
+        return hash(_flat(self))
+
+    def __repr__(self):
+        args = ", ".join(repr(value) for value in self.values())
+        return f"{type(self).__name__}({args})"
+
+    def astuple(self):
+        """Convierte el nodo (y sus hijos) a la representación anterior con tuplas"""
+        return as_tuple(self)
+
+    def __reduce__(self):
+        # pickle (y copy) recorrerían el árbol con recursión: se serializa su tabla plana
+        return from_rows, (to_rows(self),)
+
+class Program(Node):
+    __slots__ = ('statements',)
+    kind = 'program'
+    fields = ('statements',)
+
+    def __init__(self, statements, lineno=0, lexpos=0):
+        self.statements = statements
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+class Tipo(Node):
+    __slots__ = ('name',)
+    kind = 'tipo'
+    fields = ('name',)
+
+    def __init__(self, name, lineno=0, lexpos=0):
+        self.name = name
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+class Declaration(Node):
+    __slots__ = ('tipo', 'name')
+    kind = 'declaration'
+    fields = ('tipo', 'name')
+
+    def __init__(self, tipo, name, lineno=0, lexpos=0):
+        self.tipo = tipo
+        self.name = name
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+class InvalidDeclaration(Declaration):
+    """Declaración que no pasó la verificación semántica"""
+    __slots__ = ()
+    kind = 'declaration_error'
+
+class Assignment(Node):
+    __slots__ = ('name', 'expr')
+    kind = 'assignment'
+    fields = ('name', 'expr')
+
+    def __init__(self, name, expr, lineno=0, lexpos=0):
+        self.name = name
+        self.expr = expr
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+class InvalidAssignment(Assignment):
+    """Asignación a una variable no declarada"""
+    __slots__ = ()
+    kind = 'assignment_error'
+
+class BinOp(Node):
+    __slots__ = ('op', 'left', 'right', 'folded')
+    kind = 'binop'
+    fields = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right, lineno=0, lexpos=0, folded=None):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.folded = folded
+
+class Number(Node):
+    __slots__ = ('value', 'folded')
+    kind = 'number'
+    fields = ('value',)
+
+    def __init__(self, value, lineno=0, lexpos=0):
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.folded = value
+
+class Id(Node):
+    __slots__ = ('name', 'folded')
+    kind = 'id'
+    fields = ('name',)
+
+    def __init__(self, name, lineno=0, lexpos=0, folded=None):
+        self.name = name
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.folded = folded  # valor de la variable cuando se leyó
+
+class InvalidId(Id):
+    """Uso de una variable no declarada"""
+    __slots__ = ()
+    kind = 'id_error'
+
+class If(Node):
+    __slots__ = ('cond', 'body', 'orelse')
+    kind = 'if'
+    fields = ('cond', 'body', 'orelse')
+
+    def __init__(self, cond, body, orelse=None, lineno=0, lexpos=0):
+        self.cond = cond
+        self.body = body
+        self.orelse = orelse  # Else o None
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+class Else(Node):
+    __slots__ = ('body',)
+    kind = 'else'
+    fields = ('body',)
+
+    def __init__(self, body, lineno=0, lexpos=0):
+        self.body = body
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+class Printf(Node):
+    __slots__ = ('text',)
+    kind = 'printf'
+    fields = ('text',)
+
+    def __init__(self, text, lineno=0, lexpos=0):
+        self.text = text
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+class Return(Node):
+    __slots__ = ('value',)
+    kind = 'return'
+    fields = ('value',)
+
+    def __init__(self, value=None, lineno=0, lexpos=0):
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+def _all_subclasses(cls):
+    found = set()
+    pending = [cls]
+    while pending:
+        for sub in pending.pop().__subclasses__():
+            if sub not in found:
+                found.add(sub)
+                pending.append(sub)
+    return found
+
+# Todas las clases de nodo (para comprobar el tipo con una búsqueda en un set)
+NODE_CLASSES = frozenset(_all_subclasses(Node) | {Node})
+
+# Clase de cada tipo de nodo ('binop' -> BinOp)
+KIND_CLASSES = {cls.kind: cls for cls in NODE_CLASSES}
+
+# Clases que guardan 'folded' (el slot es un atributo de la clase)
+FOLDED_CLASSES = frozenset(cls for cls in NODE_CLASSES if hasattr(cls, 'folded'))
+
+def as_tuple(node):
+    """Representación con tuplas y listas anidadas, igual a la que generaba el parser antes
+
+    Se arma de abajo hacia arriba con una pila explícita (sin límite de profundidad).
+    """
+    results = []
+    stack = [(node, False)]
+    while stack:
+        item, ready = stack.pop()
+        cls = type(item)
+        if cls in NODE_CLASSES:
+            children = item.values()
+        elif cls is list:
+            children = item
+        else:
+            results.append(item)
+            continue
+        if not ready:
+            stack.append((item, True))
+            stack.extend((child, False) for child in reversed(children))
+            continue
+        start = len(results) - len(children)
+        values = results[start:]
+        del results[start:]
+        results.append((item.kind,) + tuple(values) if cls is not list else values)
+    return results[0]
+
+# Marcas de _flat: no son iguales a ningún valor de un campo
+_NODE_MARK = object()
+_LIST_MARK = object()
+
+def _flat(node):
+    """El árbol en preorden como una tupla plana (tipo y campos), para __eq__ y __hash__ sin recursión"""
+    flat = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if type(item) in NODE_CLASSES:
+            flat += (_NODE_MARK, item.kind)
+            stack.extend(reversed(item.values()))
+        elif type(item) is list:
+            flat += (_LIST_MARK, len(item))
+            stack.extend(reversed(item))
+        else:
+            flat.append(item)
+    return tuple(flat)
+
+def to_rows(node):
+    """Tabla plana del árbol: una fila por nodo, la raíz en la fila 0
+
+    Cada fila es (tipo, lineno, lexpos, folded, campos...); un campo que es un nodo
+    se guarda como {'node': fila} y una lista de nodos como una lista de esas
+    referencias. Solo tiene tipos básicos y no está anidada, así que pickle y
+    JSON no dependen de la profundidad del árbol. Un valor que no es nodo da [].
+    """
+    if type(node) not in NODE_CLASSES:
+        return []
+    rows = [None]
+    pending = [(0, node)]
+
+    def encode(value):
+        cls = type(value)
+        if cls in NODE_CLASSES:
+            pending.append((len(rows), value))
+            rows.append(None)
+            return {'node': len(rows) - 1}
+        if cls is list:
+            return [encode(item) for item in value]
+        return value
+
+    while pending:
+        index, item = pending.pop()
+        rows[index] = (item.kind, item.lineno, item.lexpos, getattr(item, 'folded', None)) \
+            + tuple(encode(value) for value in item.values())
+    return rows
+
+def from_rows(rows):
+    """Reconstruye el árbol de una tabla de to_rows (None si está vacía)"""
+    nodes = []
+    for kind, lineno, lexpos, folded, *values in rows:
+        cls = KIND_CLASSES[kind]
+        node = cls.__new__(cls)
+        node.lineno = lineno
+        node.lexpos = lexpos
+        if cls in FOLDED_CLASSES:
+            node.folded = folded
+        nodes.append(node)
+
+    def decode(value):
+        if type(value) is dict:
+            return nodes[value['node']]
+        if type(value) is list:
+            return [decode(item) for item in value]
+        return value
+
+    for node, (kind, lineno, lexpos, folded, *values) in zip(nodes, rows):
+        for name, value in zip(node.fields, values):
+            setattr(node, name, decode(value))
+    return nodes[0] if nodes else None
@@ -0,0 +1,486 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Generación de código nativo: ensamblador x86-64 (sintaxis AT&T de GNU as, System V)
+# para main, a partir del IR de tres direcciones de IR_C (ya optimizado).
+#   - Asignación de registros por linear scan (Poletto y Sarkar): cada variable o
+#     temporal vive en un registro mientras hay uno libre y solo las que no caben
+#     van a la pila. Las que siguen vivas después de una llamada (puts/printf) solo
+#     usan registros callee-saved.
+#   - printf("texto") se traduce a puts (una línea por printf).
+#   - La aritmética es de 64 bits; '/' sigue la semántica de VM_C (división entera
+#     hacia abajo y x / 0 = 0). Las constantes (literales o plegadas por IR_C) se
+#     reducen a 64 bits con signo, igual que los resultados calculados en ejecución.
+# Con report=True, antes de cada return el programa imprime el valor de retorno y
+# las variables globales de main, para comparar su resultado con el de VM_C.
+#
+# Uso: python Asm_Obj.py archivo.c [-o salida.s] [--build ejecutable] [--run] [--no-optimize]
+
+import argparse
+import heapq
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+
+import IR_C
+
+# Compilador de C del sistema (ensambla y enlaza con la libc); None si no hay uno
+CC = shutil.which('cc') or shutil.which('gcc')
+TOOLCHAIN_AVAILABLE = CC is not None
+
+# Registros que el linear scan puede asignar; %rax, %rcx y %rdx quedan para
+# las instrucciones (división, comparaciones y movimientos memoria -> memoria)
+CALLEE_SAVED = ('%rbx', '%r12', '%r13', '%r14', '%r15')
+CALLER_SAVED = ('%rsi', '%rdi', '%r8', '%r9', '%r10', '%r11')
+
+REPORT_MARKER = "\x1eexit"  # línea que separa la salida del programa de su reporte
+
+class AsmError(Exception):
+    """El programa no se puede traducir, ensamblar o ejecutar"""
+    pass
+
+# ==================== REGISTER ALLOCATION ====================
+
+class Allocation:
+    """Resultado del linear scan: dónde vive cada variable del IR"""
+    def __init__(self, locations, slots, registers, spilled):
+        self.locations = locations  # {variable: registro ('%rbx') o memoria ('-56(%rbp)')}
+        self.slots = slots          # espacios de 8 bytes en la pila para las que no cupieron
+        self.registers = registers  # registros callee-saved usados (se guardan en el prólogo)
+        self.spilled = spilled      # variables que quedaron en la pila
+
+def _defined_globals(function, order):
+    """{id(bloque return): [variables globales definidas en todos los caminos a ese return]}"""
+    bit = {name: 1 << index for index, name in enumerate(function.globals)}
+    preds = function.predecessors()
+    out = {}
+    defined = {}
+    for block in order:
+        known = None
+        for pred in preds[id(block)]:
+            if id(pred) in out:
+                known = out[id(pred)] if known is None else known & out[id(pred)]
+        known = known or 0
+        for instr in block.instrs:
+            if instr.dest in bit:
+                known |= bit[instr.dest]
+        out[id(block)] = known
+        if block.kind == 'return':
+            defined[id(block)] = [name for name in function.globals if known & bit[name]]
+    return defined
+
+def _intervals(function, order, reported):
+    """Intervalos [inicio, fin] de cada variable y posiciones de las llamadas
+
+    Las posiciones siguen el orden de los bloques (topológico, el CFG no tiene
+    ciclos), así que una variable está viva a lo más entre su primera y su última
+    aparición.
+    """
+    start = {}
+    end = {}
+    calls = []
+    position = 0
+
+    def occurs(name):
+        if name not in start:
+            start[name] = position
+        end[name] = position
+
+    for block in order:
+        for instr in block.instrs:
+            position += 1
+            if instr.op == 'print':
+                calls.append(position)
+                continue
+            for operand in (instr.a, instr.b):
+                if type(operand) is str:
+                    occurs(operand)
+            occurs(instr.dest)
+        position += 1
+        if type(block.value) is str:
+            occurs(block.value)
+        if reported is not None and block.kind == 'return':
+            calls.append(position)
+            for name in reported[id(block)]:
+                occurs(name)
+    return start, end, calls
+
+def allocate_registers(function, order=None, reported=None):
+    """Linear scan sobre los bloques en 'order' (por defecto el postorden inverso)
+
+    reported: {id(bloque return): [globales]} que el reporte lee antes de ese return.
+    """
+    if order is None:
+        order = function.reverse_postorder()
+    start, end, calls = _intervals(function, order, reported)
+    locations = {}
+    spilled = []
+    used = set()
+    free = {'callee': list(reversed(CALLEE_SAVED)), 'caller': list(reversed(CALLER_SAVED))}
+    active = []         # [(fin, variable)] con registro (a lo más len(registros))
+    on_stack = []       # heap de (fin, slot) de las variables en la pila
+    free_slots = []
+    slots = 0
+
+    def slot_address(slot):
+        return f"{-8 * (slot + 1) - 8 * len(CALLEE_SAVED)}(%rbp)"
+
+    for name in sorted(start, key=start.get):
+        position = start[name]
+        # Libera los registros y espacios de pila de los intervalos que ya terminaron
+        for entry in [entry for entry in active if entry[0] <= position]:
+            active.remove(entry)
+            register = locations[entry[1]]
+            free['callee' if register in CALLEE_SAVED else 'caller'].append(register)
+        while on_stack and on_stack[0][0] <= position:
+            heapq.heappush(free_slots, heapq.heappop(on_stack)[1])
+        # Si cruza una llamada, solo le sirve un registro callee-saved
+        index = bisect_right(calls, position)
+        crosses = index < len(calls) and calls[index] <= end[name]
+        classes = ('callee',) if crosses else ('caller', 'callee')
+        register = next((free[kind].pop() for kind in classes if free[kind]), None)
+        if register is None:
+            # Sin registro libre: a la pila va el intervalo que termina más tarde
+            candidates = [entry for entry in active if not crosses or locations[entry[1]] in CALLEE_SAVED]
+            victim = max(candidates) if candidates else None
+            if victim is not None and victim[0] > end[name]:
+                active.remove(victim)
+                register = locations[victim[1]]
+                # El espacio debe estar libre en todo el intervalo de la víctima: uno nuevo
+                locations[victim[1]] = slot_address(slots)
+                heapq.heappush(on_stack, (victim[0], slots))
+                spilled.append(victim[1])
+                slots += 1
+            else:
+                slot = heapq.heappop(free_slots) if free_slots else None
+                if slot is None:
+                    slot = slots
+                    slots += 1
+                locations[name] = slot_address(slot)
+                heapq.heappush(on_stack, (end[name], slot))
+                spilled.append(name)
+                continue
+        locations[name] = register
+        if register in CALLEE_SAVED:
+            used.add(register)
+        active.append((end[name], name))
+    return Allocation(locations, slots, [register for register in CALLEE_SAVED if register in used], spilled)
+
+# ==================== CODE GENERATION ====================
+
+def int64(value):
+    """value reducido a 64 bits con signo (complemento a dos), como lo guarda el código nativo"""
+    return (value + 2 ** 63) % 2 ** 64 - 2 ** 63
+
+def _fits_imm32(value):
+    return -2 ** 31 <= value < 2 ** 31
+
+def _asm_string(text):
+    """Literal de .asciz (UTF-8, con escapes octales para lo que no es ASCII imprimible)"""
+    out = []
+    for byte in text.encode('utf-8'):
+        char = chr(byte)
+        if char in '"\\':
+            out.append('\\' + char)
+        elif 32 <= byte < 127:
+            out.append(char)
+        else:
+            out.append(f"\\{byte:03o}")
+    return '"' + ''.join(out) + '"'
+
+class Emitter:
+    """Traduce una Function de IR_C a texto de ensamblador"""
+    def __init__(self, function, report=False):
+        self.function = function
+        self.report = report
+        self.lines = []
+        self.strings = {}   # texto -> etiqueta .LC<n>
+        self.labels = 0
+
+    def emit(self):
+        function = self.function
+        order = function.reverse_postorder()
+        reported = _defined_globals(function, order) if self.report else None
+        self.allocation = allocation = allocate_registers(function, order, reported)
+        self.locations = allocation.locations
+        lines = self.lines
+        # Marco: %rbp, los callee-saved (siempre el espacio de los 5) y los spills;
+        # %rsp queda alineado a 16 bytes para las llamadas
+        frame = (8 * (len(CALLEE_SAVED) + allocation.slots) + 15) // 16 * 16
+        lines += ["    .text", "    .globl main", "    .type main, @function", "main:",
+                  "    pushq %rbp", "    movq %rsp, %rbp", f"    subq ${frame}, %rsp"]
+        for index, register in enumerate(allocation.registers):
+            lines.append(f"    movq {register}, {-8 * (index + 1)}(%rbp)")
+        for position, block in enumerate(order):
+            following = order[position + 1] if position + 1 < len(order) else None
+            lines.append(f".L{block.label}:")
+            for instr in block.instrs:
+                self._instr(instr)
+            self._terminator(block, following, reported)
+        lines.append(".Lepilogue:")
+        for index, register in enumerate(allocation.registers):
+            lines.append(f"    movq {-8 * (index + 1)}(%rbp), {register}")
+        lines += ["    leave", "    ret", "    .size main, .-main"]
+        if self.strings:
+            lines.append("    .section .rodata")
+            for text, label in self.strings.items():
+                lines.append(f"{label}:")
+                lines.append(f"    .asciz {_asm_string(text)}")
+        lines.append('    .section .note.GNU-stack,"",@progbits')
+        return "\n".join(lines) + "\n"
+
+    # ---------- operandos ----------
+
+    def _operand(self, value):
+        """Operando de AT&T: $constante, registro o dirección en la pila"""
+        if type(value) is str:
+            return self.locations[value]
+        if type(value) is not int:
+            raise AsmError(f"Solo hay enteros en código nativo: {value!r}")
+        return f"${int64(value)}"
+
+    def _move(self, value, target):
+        """target <- value (target es registro o memoria; usa %rax si hace falta)"""
+        if type(value) is int:
+            value = int64(value)
+        source = self._operand(value)
+        if source == target:
+            return
+        if type(value) is int and not _fits_imm32(value):
+            if target.startswith('%'):
+                self.lines.append(f"    movabsq {source}, {target}")
+                return
+            self.lines.append(f"    movabsq {source}, %rax")
+            source = '%rax'
+        elif not source.startswith(('%', '$')) and not target.startswith('%'):
+            self.lines.append(f"    movq {source}, %rax")
+            source = '%rax'
+        self.lines.append(f"    movq {source}, {target}")
+
+    def _source(self, value, scratch):
+        """Operando utilizable como fuente de una instrucción (constantes grandes a 'scratch')"""
+        if type(value) is int and not _fits_imm32(int64(value)):
+            self.lines.append(f"    movabsq ${int64(value)}, {scratch}")
+            return scratch
+        return self._operand(value)
+
+    def _label(self):
+        self.labels += 1
+        return f".Lt{self.labels}"
+
+    def _string(self, text):
+        label = self.strings.get(text)
+        if label is None:
+            label = self.strings[text] = f".LC{len(self.strings)}"
+        return label
+
+    # ---------- instrucciones ----------
+
+    def _instr(self, instr):
+        op = instr.op
+        lines = self.lines
+        if op == 'print':
+            lines.append(f"    leaq {self._string(instr.a)}(%rip), %rdi")
+            lines.append("    call puts@PLT")
+            return
+        dest = self.locations[instr.dest]
+        if op == 'copy':
+            self._move(instr.a, dest)
+        elif op in ('+', '-', '*'):
+            right = self._operand(instr.b) if type(instr.b) is str else None
+            target = dest if dest.startswith('%') and right != dest else '%rax'
+            self._move(instr.a, target)
+            mnemonic = {'+': 'addq', '-': 'subq', '*': 'imulq'}[op]
+            lines.append(f"    {mnemonic} {self._source(instr.b, '%rcx')}, {target}")
+            if target != dest:
+                lines.append(f"    movq %rax, {dest}")
+        elif op == '/':
+            self._divide(instr, dest)
+        else:
+            # Comparación: 1 o 0
+            self._move(instr.a, '%rax')
+            lines.append(f"    cmpq {self._source(instr.b, '%rcx')}, %rax")
+            lines.append(f"    set{ {'>': 'g', '<': 'l', '==': 'e'}[op]} %al")
+            lines.append("    movzbq %al, %rax")
+            lines.append(f"    movq %rax, {dest}")
+
+    def _divide(self, instr, dest):
+        """dest = a // b (hacia abajo, como Python) y 0 si b == 0"""
+        lines = self.lines
+        divisor = instr.b
+        if divisor == 0:
+            self._move(0, dest)
+            return
+        done = self._label()
+        self._move(instr.a, '%rax')
+        self._move(divisor, '%rcx')
+        if type(divisor) is str:
+            zero = self._label()
+            lines.append("    testq %rcx, %rcx")
+            lines.append(f"    je {zero}")
+        lines += ["    cqto", "    idivq %rcx",
+                  # idiv trunca hacia cero: si hay residuo y los signos difieren, resta 1
+                  "    testq %rdx, %rdx", f"    je {done}",
+                  "    xorq %rcx, %rdx", f"    jns {done}",
+                  "    decq %rax"]
+        if type(divisor) is str:
+            lines += [f"    jmp {done}", f"{zero}:", "    xorl %eax, %eax"]
+        lines += [f"{done}:", f"    movq %rax, {dest}"]
+
+    def _terminator(self, block, following, reported):
+        lines = self.lines
+        if block.kind == 'jump':
+            if block.targets[0] is not following:
+                lines.append(f"    jmp .L{block.targets[0].label}")
+        elif block.kind == 'branch':
+            then_block, else_block = block.targets
+            if type(block.value) is int:
+                target = then_block if int64(block.value) else else_block
+                if target is not following:
+                    lines.append(f"    jmp .L{target.label}")
+                return
+            condition = self.locations[block.value]
+            if condition.startswith('%'):
+                lines.append(f"    testq {condition}, {condition}")
+            else:
+                lines.append(f"    cmpq $0, {condition}")
+            if then_block is following:
+                lines.append(f"    je .L{else_block.label}")
+            else:
+                lines.append(f"    jne .L{then_block.label}")
+                if else_block is not following:
+                    lines.append(f"    jmp .L{else_block.label}")
+        else:
+            if reported is not None:
+                self._report(block, reported[id(block)])
+            self._move(0 if block.value is None else block.value, '%rax')
+            if following is not None:
+                lines.append("    jmp .Lepilogue")
+
+    def _report(self, block, names):
+        """Imprime el marcador, el valor de retorno y las globales definidas ('nombre valor')"""
+        lines = self.lines
+        lines.append(f"    leaq {self._string(REPORT_MARKER)}(%rip), %rdi")
+        lines.append("    call puts@PLT")
+        values = [('return', block.value)] if block.value is not None else []
+        values += [(self.function.globals[name], name) for name in names]
+        if block.value is None:
+            lines.append(f"    leaq {self._string('return')}(%rip), %rdi")
+            lines.append("    call puts@PLT")
+        for label, value in values:
+            self._move(value, '%rsi')
+            lines.append(f"    leaq {self._string(label + ' %ld' + chr(10))}(%rip), %rdi")
+            lines.append("    xorl %eax, %eax")
+            lines.append("    call printf@PLT")
+
+def emit_function(function, report=False):
+    """Texto de ensamblador x86-64 (GNU as) de una Function de IR_C"""
+    return Emitter(function, report).emit()
+
+def emit_program(program, optimize=True, report=False, profiler=None):
+    """Ensamblador de un Program de PARSER_C sin errores semánticos"""
+    function = IR_C.lower(program)
+    if optimize:
+        IR_C.optimize(function, profiler=profiler)
+    if profiler is not None:
+        with profiler.phase('asm'):
+            return emit_function(function, report)
+    return emit_function(function, report)
+
+def emit_code(code, optimize=True, report=False):
+    """Parsea y traduce código fuente; AsmError si tiene errores de sintaxis o semánticos"""
+    from PARSER_C import parse_result
+    result = parse_result(code)
+    if not result.parsing_success or result.semantic_errors:
+        errors = result.semantic_errors or ["el parse no terminó"]
+        raise AsmError(f"El programa tiene errores: {errors[0]}")
+    return emit_program(result.ast, optimize, report)
+
+# ==================== TOOLCHAIN ====================
+
+def build_executable(assembly, output, cc=None):
+    """Ensambla y enlaza con el compilador de C del sistema; retorna la ruta del ejecutable"""
+    cc = cc or CC
+    if cc is None:
+        raise AsmError("No se encontró un compilador de C (cc/gcc) para ensamblar")
+    source = output + '.s'
+    with open(source, 'w', encoding='utf-8') as file:
+        file.write(assembly)
+    completed = subprocess.run([cc, '-o', output, source], capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise AsmError(f"{cc} falló:\n{completed.stderr}")
+    return output
+
+def run_executable(path, timeout=60):
+    """Ejecuta un programa generado con report=True; (VM_C.ExecutionResult, segundos)"""
+    from VM_C import ExecutionResult
+    started = time.perf_counter()
+    completed = subprocess.run([path], capture_output=True, timeout=timeout)
+    seconds = time.perf_counter() - started
+    lines = completed.stdout.decode('utf-8', errors='replace').split('\n')[:-1]
+    if REPORT_MARKER not in lines:
+        raise AsmError(f"El programa no imprimió su reporte (código de salida {completed.returncode})")
+    marker = len(lines) - 1 - lines[::-1].index(REPORT_MARKER)
+    output = lines[:marker]
+    return_value = None
+    variables = {}
+    for line in lines[marker + 1:]:
+        name, _, value = line.partition(' ')
+        if name == 'return':
+            return_value = int(value) if value else None
+        else:
+            variables[name] = int(value)
+    return ExecutionResult(return_value, output, variables), seconds
+
+def run_native(program, optimize=True, directory=None):
+    """Compila un Program a un ejecutable temporal, lo corre y retorna (ExecutionResult, segundos)"""
+    assembly = emit_program(program, optimize, report=True)
+    with tempfile.TemporaryDirectory(dir=directory) as folder:
+        path = build_executable(assembly, os.path.join(folder, 'main'))
+        return run_executable(path)
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Ensamblador x86-64 para programas de PARSER_C")
+    arg_parser.add_argument('source', help="archivo de código fuente")
+    arg_parser.add_argument('-o', '--output', default=None, help="archivo .s de salida (por defecto stdout)")
+    arg_parser.add_argument('--build', default=None, help="ensambla y enlaza a este ejecutable")
+    arg_parser.add_argument('--run', action='store_true', help="ejecuta el programa y muestra su resultado")
+    arg_parser.add_argument('--no-optimize', action='store_true', help="sin los pases de IR_C")
+    args = arg_parser.parse_args(argv)
+
+    with open(args.source, encoding='utf-8', errors='replace') as file:
+        code = file.read()
+    try:
+        assembly = emit_code(code, not args.no_optimize, report=args.run)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                file.write(assembly)
+        elif not (args.build or args.run):
+            sys.stdout.write(assembly)
+        if args.build:
+            build_executable(assembly, args.build)
+        if args.run:
+            with tempfile.TemporaryDirectory() as folder:
+                path = build_executable(assembly, os.path.join(folder, 'main'))
+                result, seconds = run_executable(path)
+            print("\n".join(result.output))
+            print(f"return {result.return_value} ({seconds * 1000:.2f} ms)")
+            print(f"variables: {result.variables}")
+    except AsmError as error:
+        print(error, file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Análisis Parser + SDT por lotes, sin GUI, usando todos los núcleos.
+# Uso: python BATCH_C.py carpeta_o_archivos... [-j N] [-o resultados.jsonl]
+# Cada línea de salida es un JSON con el resultado de un archivo; al final se
+# reporta el rendimiento (archivos/s, tokens/s) en stderr.
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+SOURCE_EXTENSIONS = ('.c', '.txt')
+# Tareas enviadas por worker que aún no se han escrito (acota la memoria con muchos archivos)
+TASKS_PER_WORKER = 4
+
+# ==================== FILE DISCOVERY ====================
+
+def iter_source_files(paths, extensions=SOURCE_EXTENSIONS):
+    """Recorre archivos y carpetas (recursivamente) y genera las rutas a analizar"""
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(extensions):
+                        yield os.path.join(dirpath, filename)
+        else:
+            # Los archivos indicados explícitamente se analizan sin importar su extensión
+            yield path
+
+def read_source(path):
+    """Lee un archivo probando varias codificaciones (saltos de línea como en la GUI)"""
+    with open(path, 'rb') as file:
+        data = file.read()
+    for encoding in ('utf-8', 'cp1252', 'latin-1'):
+        try:
+            code = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    return code.replace('\r\n', '\n')
+
+# ==================== WORKER ====================
+
+# Una sesión por proceso: el lexer y el parser se construyen una sola vez por worker
+_session = None
+# Caché de resultados del proceso (CACHE_C); con --cache su nivel en disco es compartido
+_cache = None
+
+def _init_worker(max_lex_errors=None, lexer_backend='ply', cache_path=None, cache_size=1024):
+    global _session, _cache
+    import PARSER_C
+    _session = PARSER_C.AnalysisSession(max_lex_errors, lexer_backend)
+    if cache_path is not None:
+        import CACHE_C
+        _cache = CACHE_C.ResultCache(cache_size, cache_path)
+
+def _analyze(code):
+    """Resultado del análisis de un código (sin los datos del archivo); no se arma el reporte de texto"""
+    return _session.run(code).to_dict(include_ast=False)
+
+def analyze_file(path):
+    """Analiza un archivo con la sesión del proceso y retorna un resultado serializable"""
+    if _session is None:
+        _init_worker()
+    start = time.perf_counter()
+    try:
+        code = read_source(path)
+        cached = None
+        if _cache is not None:
+            key = _cache.key('batch', code, _session.max_lex_errors)
+            cached = _cache.get(key)
+        analysis = cached if cached is not None else _analyze(code)
+        if _cache is not None and cached is None:
+            # Los tiempos son de este análisis: un resultado re-usado no los trae
+            _cache.put(key, {name: value for name, value in analysis.items() if name != 'timings'})
+    except Exception as e:
+        return {'file': path, 'error': str(e), 'tokens': 0,
+                'seconds': round(time.perf_counter() - start, 6)}
+    result = {'file': path}
+    result.update(analysis)
+    if _cache is not None:
+        result['cached'] = cached is not None
+    result['seconds'] = round(time.perf_counter() - start, 6)
+    return result
+
+def analyze_files(paths):
+    """analyze_file de varios archivos en una sola tarea (menos mensajes entre procesos)"""
+    return [analyze_file(path) for path in paths]
+
+# ==================== DRIVER ====================
+
+def run_batch(paths, workers=None, chunksize=8, max_lex_errors=None, lexer_backend='ply',
+              cache_path=None, cache_size=1024):
+    """Analiza todos los archivos en paralelo; genera los resultados en el orden de los archivos
+
+    Los archivos se envían en tareas de chunksize a medida que se consumen los
+    resultados: nunca hay más de TASKS_PER_WORKER tareas por worker pendientes,
+    así que ni la lista de archivos ni los resultados se acumulan en memoria.
+    """
+    files = iter_source_files(paths)
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(max_lex_errors, lexer_backend, cache_path, cache_size)) as pool:
+        while True:
+            while len(pending) < workers * TASKS_PER_WORKER:
+                chunk = list(islice(files, max(chunksize, 1)))
+                if not chunk:
+                    break
+                pending.append(pool.submit(analyze_files, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Parser + SDT por lotes (salida JSON lines)")
+    arg_parser.add_argument('paths', nargs='+', help="archivos o carpetas con código fuente")
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help="número de procesos (por defecto, todos los núcleos)")
+    arg_parser.add_argument('-o', '--output', default=None, help="archivo de salida (por defecto stdout)")
+    arg_parser.add_argument('--chunksize', type=int, default=8, help="archivos enviados por tarea")
+    arg_parser.add_argument('--max-lex-errors', type=int, default=None,
+                            help="detener el análisis léxico de un archivo después de N errores")
+    arg_parser.add_argument('--lexer', choices=('ply', 'fast'), default='ply',
+                            help="backend del lexer (mismos tokens; 'fast' es más rápido)")
+    arg_parser.add_argument('--cache', default=None, metavar='PATH',
+                            help="base SQLite con resultados anteriores (se re-usan si el archivo no cambió)")
+    arg_parser.add_argument('--cache-size', type=int, default=1024,
+                            help="resultados guardados en memoria por proceso")
+    args = arg_parser.parse_args(argv)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    files = 0
+    failed = 0
+    cached = 0
+    total_tokens = 0
+    start = time.perf_counter()
+    try:
+        for result in run_batch(args.paths, args.jobs, args.chunksize, args.max_lex_errors,
+                                args.lexer, args.cache, args.cache_size):
+            files += 1
+            total_tokens += result['tokens']
+            cached += bool(result.get('cached'))
+            if not result.get('parsing_success'):
+                failed += 1
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    rate = files / elapsed if elapsed else 0.0
+    token_rate = total_tokens / elapsed if elapsed else 0.0
+    cache_line = f"Cache: {cached} of {files} results re-used ({args.cache})\n" if args.cache else ""
+    print(f"=== BATCH SUMMARY ===\n"
+          f"Files: {files} ({failed} failed to parse)\n"
+          f"Tokens: {total_tokens}\n"
+          f"{cache_line}"
+          f"Time: {elapsed:.3f} s\n"
+          f"Throughput: {rate:.1f} files/s, {token_rate:.0f} tokens/s", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,907 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Benchmarks del Lexer + Parser. Uso: python BENCH_C.py [statements]
+# Suite con línea base: python BENCH_C.py --suite [--save-baseline] [--baseline archivo.json]
+# Solo mide tiempos: las verificaciones de que los resultados son correctos están en
+# tests/ (python -m pytest tests).
+
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import AST_C
+import GEN_C
+import LEX_C
+import PARSER_C
+import SCANNER_C
+
+def synthetic_program(statements):
+    """Genera un programa válido con el número de sentencias indicado"""
+    lines = ["int main(){", "    int x;", "    int y;"]
+    for i in range(statements):
+        if i % 4 == 0:
+            lines.append(f"    x = {i} * 2 + y;")
+        elif i % 4 == 1:
+            lines.append(f"    y = (x - {i}) / 3;")
+        elif i % 4 == 2:
+            lines.append("    if (x > y){ printf(\"mayor\"); }else{ x = 1; }")
+        else:
+            lines.append("    printf(\"linea\");")
+    lines.append("    return 0;")
+    lines.append("}")
+    return "\n".join(lines)
+
+def best_of(func, repeat=5):
+    """Mejor tiempo (segundos) de varias ejecuciones"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# ==================== SINGLE-PASS LEXING ====================
+
+def bench_single_pass(statements=2000, repeat=5):
+    """Compara lexear dos veces (versión anterior) contra re-usar los tokens"""
+    code = synthetic_program(statements)
+
+    session = PARSER_C.AnalysisSession()
+
+    def double_pass():
+        session.reset()
+        LEX_C.analyze_code(code)
+        session.lexer.lineno = 1
+        session.parser.parse(code, lexer=session.lexer, tracking=True)
+
+    def replay():
+        session.parse(code)
+
+    def lazy():
+        session.parse(code, lazy_tokens=True)
+
+    results = {
+        'double_pass': best_of(double_pass, repeat),
+        'replay': best_of(replay, repeat),
+        'lazy': best_of(lazy, repeat),
+    }
+    print(f"=== SINGLE-PASS LEXING ({statements} statements, {len(code)} chars) ===")
+    for name, seconds in results.items():
+        speedup = results['double_pass'] / seconds
+        print(f"  {name:<12} {seconds * 1000:9.2f} ms   x{speedup:.2f}")
+    return results
+
+# ==================== LEXER BACKENDS ====================
+
+def lexer_inputs(statements):
+    """Entradas de distinto tipo para medir tokens/s"""
+    names = ["    int interval_%d; iffy_%d = elsewhere + returned * 2;" % (i, i) for i in range(statements)]
+    errors = ["    x = 1 $ 2 @@ 3; ` y = 'a';" for _ in range(statements)]
+    return {
+        'synthetic': synthetic_program(statements),
+        'expressions': expression_program(statements // 8, 64),
+        'identifiers': "\n".join(names),
+        'errors': "\n".join(errors),
+    }
+
+def bench_lexer_backends(statements=20_000, repeat=3):
+    """Tokens por segundo de cada backend del lexer ('ply' y 'fast') y parse completo con cada uno"""
+    print(f"=== LEXER BACKENDS ({statements} statements) ===")
+    lexers = {backend: LEX_C.new_lexer(backend) for backend in LEX_C.LEXER_BACKENDS}
+    for name, code in lexer_inputs(statements).items():
+        count = len(LEX_C.lex_tokens(code, lexers['ply']))
+        rates = {}
+        for backend, lexer in lexers.items():
+            seconds = best_of(lambda: LEX_C.lex_tokens(code, lexer), repeat)
+            rates[backend] = count / seconds
+        print(f"  {name:<12} {count:>9,} tokens: "
+              + ", ".join(f"{backend} {rate:>11,.0f} tokens/s" for backend, rate in rates.items())
+              + f"   x{rates['fast'] / rates['ply']:.2f}")
+    code = synthetic_program(statements)
+    times = {}
+    for backend in LEX_C.LEXER_BACKENDS:
+        session = PARSER_C.AnalysisSession(lexer_backend=backend)
+        times[backend] = best_of(lambda: session.parse(code), repeat)
+    print("  parse:       " + ", ".join(f"{backend} {seconds * 1000:.1f} ms" for backend, seconds in times.items()))
+
+# ==================== TOKEN BUFFER ====================
+
+def dict_tokens(code):
+    """Versión anterior de LEX_C.analyze_code: un dict por token"""
+    return [{'type': tok.type, 'value': tok.value, 'lineno': tok.lineno, 'lexpos': tok.lexpos}
+            for tok in LEX_C.iter_tokens(code)]
+
+def bench_token_buffer(statements=50_000):
+    """Memoria y tiempo de analyze_code: lista de dicts contra TokenBuffer (columnas)"""
+    code = synthetic_program(statements)
+    count = len(LEX_C.analyze_code(code))
+    print(f"=== TOKEN BUFFER ({count:,} tokens) ===")
+    for label, build in (("dicts", lambda: dict_tokens(code)),
+                         ("buffer", lambda: LEX_C.analyze_code(code))):
+        seconds = best_of(build, 3)
+        memory = traced_size(build)
+        tokens = build()
+        # Mismo recorrido que GUI.analyze_lexical
+        read = best_of(lambda: [f"{token['type']} = '{token['value']}'" for token in tokens], 3)
+        print(f"  {label:>6}: lex {seconds * 1000:7.1f} ms ({count / seconds:,.0f} tokens/s), "
+              f"{memory / count:6.1f} bytes/token, read all {read * 1000:6.1f} ms")
+
+# ==================== STREAMING LEXER ====================
+
+def current_rss():
+    """Memoria residente actual del proceso en MB (Linux: /proc/self/statm; si no, el pico)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def write_synthetic_file(path, megabytes):
+    """Escribe un programa sintético de aproximadamente 'megabytes' MB"""
+    block = synthetic_program(2_000).encode('utf-8') + b"\n"
+    with open(path, 'wb') as file:
+        for _ in range(max(1, megabytes * 2**20 // len(block))):
+            file.write(block)
+
+def bench_streaming(megabytes=256, samples=8):
+    """RSS mientras LEX_C.iter_file_tokens recorre un archivo grande (debe mantenerse plano)"""
+    import tempfile
+    print(f"=== STREAMING LEXER ({megabytes} MB file) ===")
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'big.c')
+        write_synthetic_file(path, megabytes)
+        size = os.path.getsize(path)
+        baseline = current_rss()
+        readings = []
+        count = 0
+        every = None
+        start = time.perf_counter()
+        for tok in LEX_C.iter_file_tokens(path):
+            count += 1
+            if every is not None and count % every == 0:
+                readings.append(current_rss())
+            elif every is None and tok.lexpos > size // 100:
+                # Tokens por cada 1/samples del archivo, estimado con el primer 1%
+                every = max(1, count * 100 // samples)
+        seconds = time.perf_counter() - start
+        print(f"  {count:,} tokens in {seconds:.1f} s ({size / seconds / 2**20:.1f} MB/s, "
+              f"{count / seconds:,.0f} tokens/s)")
+        print(f"  RSS before {baseline:.1f} MB, while streaming: "
+              + ", ".join(f"{rss:.1f}" for rss in readings) + " MB")
+
+# ==================== STARTUP (TABLE CACHE) ====================
+
+def bench_startup(repeat=5):
+    """Tiempo de 'import PARSER_C' en un proceso nuevo, sin tablas guardadas (frío) y con ellas (caliente)"""
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    def remove_tables():
+        for pattern in ('parsetab_c.*', 'lextab_*', os.path.join('__pycache__', 'parsetab_c.*'),
+                        os.path.join('__pycache__', 'lextab_*')):
+            for path in glob.glob(os.path.join(here, pattern)):
+                os.remove(path)
+
+    def run(statement):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], cwd=here, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return time.perf_counter() - start
+
+    interpreter = min(run('import ply.lex, ply.yacc') for _ in range(repeat))
+    cold = []
+    for _ in range(repeat):
+        remove_tables()
+        cold.append(run('import PARSER_C'))
+    warm = [run('import PARSER_C') for _ in range(repeat)]
+
+    print(f"=== STARTUP ({repeat} runs, best) ===")
+    print(f"  python + ply   {interpreter * 1000:8.2f} ms")
+    print(f"  cold import    {min(cold) * 1000:8.2f} ms   (+{(min(cold) - interpreter) * 1000:.2f} ms)")
+    print(f"  warm import    {min(warm) * 1000:8.2f} ms   (+{(min(warm) - interpreter) * 1000:.2f} ms)")
+    return {'interpreter': interpreter, 'cold': min(cold), 'warm': min(warm)}
+
+# ==================== PARSE TREE PRINTER ====================
+
+def recursive_tree_to_string(node, level=0):
+    """Versión anterior de build_parse_tree (recursiva, concatenando strings) para comparar"""
+    indent = "  " * level
+    if isinstance(node, tuple):
+        result = f"{indent}{node[0]}\n"
+        for child in node[1:]:
+            result += recursive_tree_to_string(child, level + 1)
+        return result
+    elif isinstance(node, list):
+        result = ""
+        for item in node:
+            result += recursive_tree_to_string(item, level)
+        return result
+    else:
+        return f"{indent}{node}\n"
+
+def synthetic_tree(statements, depth=3):
+    """Árbol ('program', [...]) con sentencias cuyas expresiones tienen la profundidad indicada"""
+    expr = ('number', 1)
+    for i in range(depth):
+        expr = ('binop', '+', expr, ('id', 'x'))
+    body = [('assignment', 'x', expr) if i % 2 else ('declaration', ('tipo', 'int'), f"v{i}")
+            for i in range(statements)]
+    return ('program', body)
+
+def bench_parse_tree(sizes=(10_000, 100_000, 1_000_000), deep=5_000):
+    """Compara el printer recursivo con write_parse_tree en árboles grandes y profundos"""
+    print("=== PARSE TREE PRINTER ===")
+    for size in sizes:
+        tree = synthetic_tree(size)
+        with open(os.devnull, 'w') as sink:
+            streamed = best_of(lambda: PARSER_C.write_parse_tree(tree, sink), 1)
+        line = f"  {size:>9} statements: stream {streamed * 1000:9.1f} ms"
+        if size <= 100_000:
+            built = best_of(lambda: PARSER_C.build_parse_tree(tree), 1)
+            old = best_of(lambda: recursive_tree_to_string(tree), 1)
+            line += f", string {built * 1000:9.1f} ms, recursive {old * 1000:9.1f} ms"
+        print(line)
+    for depth in (300, deep):
+        tree = synthetic_tree(2, depth)
+        try:
+            old = f"{best_of(lambda: recursive_tree_to_string(tree), 1) * 1000:.1f} ms"
+        except RecursionError:
+            old = "RecursionError"
+        with open(os.devnull, 'w') as sink:
+            seconds = best_of(lambda: PARSER_C.write_parse_tree(tree, sink), 1)
+        print(f"  binop depth {depth}: stream {seconds * 1000:.1f} ms, recursive {old}")
+
+# ==================== AST NODES ====================
+
+def traced_size(build):
+    """Memoria (bytes) que retiene el objeto retornado por build()"""
+    import tracemalloc
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size
+
+def bench_ast(sizes=(2_000, 8_000, 32_000)):
+    """Tiempo de parse (debe crecer linealmente) y memoria del AST con __slots__ contra tuplas"""
+    print("=== AST NODES ===")
+    session = PARSER_C.AnalysisSession()
+    for size in sizes:
+        code = synthetic_program(size)
+        seconds = best_of(lambda: session.parse(code), 3)
+        tree = session.result
+        nodes = traced_size(lambda: session.parse(code))
+        tuples = traced_size(lambda: AST_C.as_tuple(tree))
+        print(f"  {size:>6} statements: parse {seconds * 1000:8.1f} ms "
+              f"({size / seconds:,.0f} stmts/s), AST {nodes / 1e6:6.2f} MB, "
+              f"tuple tree {tuples / 1e6:6.2f} MB")
+
+# ==================== CONSTANT FOLDING ====================
+
+def recursive_evaluate(expr, symbol_table):
+    """Versión anterior de evaluate_expression (recursiva, cadena if/elif) para comparar"""
+    if isinstance(expr, (tuple, AST_C.Node)):
+        if expr[0] == 'number':
+            return expr[1]
+        elif expr[0] == 'id':
+            try:
+                return symbol_table.get_symbol(expr[1]).value
+            except PARSER_C.SemanticError:
+                return None
+        elif expr[0] == 'binop':
+            left_val = recursive_evaluate(expr[2], symbol_table)
+            right_val = recursive_evaluate(expr[3], symbol_table)
+            if left_val is None or right_val is None:
+                return None
+            op = expr[1]
+            if op == '+':
+                return left_val + right_val
+            elif op == '-':
+                return left_val - right_val
+            elif op == '*':
+                return left_val * right_val
+            elif op == '/':
+                return left_val // right_val if right_val != 0 else 0
+            elif op == '>':
+                return 1 if left_val > right_val else 0
+            elif op == '<':
+                return 1 if left_val < right_val else 0
+            elif op == '==':
+                return 1 if left_val == right_val else 0
+    return None
+
+def expression_program(statements, operators=64):
+    """Programa con asignaciones de expresiones largas (variables, constantes y todos los operadores)"""
+    ops = ['+', '-', '*', '/', '+', '>', '<', '==']
+    lines = ["int main(){", "    int x;", "    int y;", "    x = 7;", "    y = 3;"]
+    for i in range(statements):
+        terms = [str(i % 10 + 1)]
+        for k in range(operators):
+            terms.append(ops[(i + k) % len(ops)])
+            terms.append(("x", "y", str(k % 9 + 1), f"({k} - y)")[(i + k) % 4])
+        lines.append(f"    {'xy'[i % 2]} = {' '.join(terms)};")
+    lines.append("}")
+    return "\n".join(lines)
+
+def bench_constant_folding(statements=2_000, operators=64, deep=20_000):
+    """Parse de entradas con muchas expresiones: folding al reducir contra re-evaluar cada asignación"""
+    print(f"=== CONSTANT FOLDING ({statements} assignments x {operators} operators) ===")
+    code = expression_program(statements, operators)
+    session = PARSER_C.AnalysisSession()
+    parse = best_of(lambda: session.parse(code), 3)
+    assignments = [node for node in session.result.statements if isinstance(node, AST_C.Assignment)]
+    table = session.symbol_table
+    old = best_of(lambda: [recursive_evaluate(node.expr, table) for node in assignments], 3)
+    new = best_of(lambda: [PARSER_C.evaluate_expression(node.expr, table) for node in assignments], 3)
+    folded = best_of(lambda: [node.expr.folded for node in assignments], 3)
+    print(f"  parse (folding included) {parse * 1000:8.1f} ms")
+    print(f"  evaluate all assignments: recursive {old * 1000:7.1f} ms, iterative "
+          f"{new * 1000:7.1f} ms, folded values {folded * 1000:5.2f} ms")
+
+    # Expresión muy profunda: 'x = 1 + 1 + ... + 1;' (árbol binop de profundidad 'deep')
+    code = "int main(){ int x; x = " + " + ".join(["1"] * deep) + "; }"
+    seconds = best_of(lambda: session.parse(code), 1)
+    value = session.symbol_table.get_symbol('x').value
+    try:
+        recursive_evaluate(session.result.statements[1].expr, session.symbol_table)
+        old = "ok"
+    except RecursionError:
+        old = "RecursionError"
+    print(f"  depth {deep}: parse {seconds * 1000:.1f} ms, x = {value}; recursive evaluation: {old}")
+
+# ==================== SYMBOL TABLE ====================
+
+class FlatSymbolTable:
+    """Versión anterior de SymbolTable (un dict por símbolo, sin scopes) para comparar"""
+    def __init__(self):
+        self.symbols = {}
+
+    def add_symbol(self, name, type, value=None):
+        if name in self.symbols:
+            raise PARSER_C.SemanticError(f"Variable '{name}' ya está declarada")
+        self.symbols[name] = {'type': type, 'value': value}
+
+    def get_symbol(self, name):
+        if name not in self.symbols:
+            raise PARSER_C.SemanticError(f"Variable '{name}' no declarada")
+        return self.symbols[name]
+
+def scoped_program(blocks):
+    """Programa con muchas variables globales y bloques if anidados que las ocultan"""
+    lines = ["int main(){", "    int x;", "    x = 1;"]
+    for i in range(blocks):
+        lines.append(f"    int g{i};")
+        lines.append(f"    if (x > {i % 7}){{ int x; x = {i}; if (x){{ int g{i}; g{i} = x + 1; }} }}")
+        lines.append(f"    g{i} = x * 2;")
+    lines.append("    return 0;")
+    lines.append("}")
+    return "\n".join(lines)
+
+def bench_symbol_table(symbols=200_000, blocks=20_000):
+    """Declarar/buscar muchos símbolos, abrir y cerrar scopes, y parse con bloques anidados"""
+    print(f"=== SYMBOL TABLE ({symbols} symbols) ===")
+    names = [f"var_{i}" for i in range(symbols)]
+    for label, table_class in (("flat dict", FlatSymbolTable), ("scoped", PARSER_C.SymbolTable)):
+        def fill():
+            table = table_class()
+            for name in names:
+                table.add_symbol(name, 'int', 0)
+            return table
+        add = best_of(fill, 3)
+        table = fill()
+        get = best_of(lambda: [table.get_symbol(name) for name in names], 3)
+        memory = traced_size(fill)
+        print(f"  {label:>9}: add {symbols / add / 1e6:5.2f} M/s, get {symbols / get / 1e6:5.2f} M/s, "
+              f"{memory / symbols:5.0f} bytes/symbol")
+
+    # Un scope por cada nombre: entra, oculta la variable global y sale
+    table = PARSER_C.SymbolTable()
+    for name in names:
+        table.add_symbol(name, 'int', 0)
+
+    def nest():
+        for name in names:
+            table.enter_scope()
+            table.add_symbol(name, 'int', 1)
+            table.exit_scope()
+        table.scoped.clear()
+    seconds = best_of(nest, 3)
+    print(f"  enter + shadow + exit: {symbols / seconds / 1e6:.2f} M scopes/s")
+
+    code = scoped_program(blocks)
+    session = PARSER_C.AnalysisSession()
+    seconds = best_of(lambda: session.parse(code), 3)
+    print(f"  parse {blocks} nested blocks: {seconds * 1000:.1f} ms, "
+          f"{len(session.symbol_table.symbols)} visible, {len(session.symbol_table.scoped)} block-scoped, "
+          f"{len(session.semantic_errors)} errors")
+
+# ==================== RESULT CACHE ====================
+
+def bench_cache(files=200, statements=200, builds=5, changed=0.05, seed=17):
+    """
+    Build repetido: se analizan los mismos archivos varias veces y entre builds
+    cambia una fracción de ellos; sin caché, con caché en memoria y con caché
+    SQLite abierta de nuevo en cada build (como un proceso nuevo)
+    """
+    import random
+    import tempfile
+    import CACHE_C
+    rng = random.Random(seed)
+    sources = [synthetic_program(statements).replace("x = 0 * 2", f"x = {i} * 2") for i in range(files)]
+    workload = []
+    for _ in range(builds):
+        workload.append(list(sources))
+        for index in rng.sample(range(files), max(1, int(files * changed))):
+            sources[index] += f"\n// build {rng.random()}"  # Cambio: un error léxico nuevo al final
+    print(f"=== RESULT CACHE ({builds} builds x {files} files, {changed:.0%} changed per build) ===")
+
+    def run(label, make_cache):
+        times = []
+        reused = 0
+        cache = None
+        for build in workload:
+            cache = make_cache(cache)
+            before = cache.stats() if cache is not None else None
+            start = time.perf_counter()
+            for code in build:
+                PARSER_C.parse_code(code, cache=cache)
+            times.append(time.perf_counter() - start)
+            if cache is not None:
+                after = cache.stats()
+                reused = after['hits'] + after['disk_hits'] - before['hits'] - before['disk_hits']
+        if cache is not None:
+            cache.close()
+        print(f"  {label:<20} first build {times[0] * 1000:7.1f} ms, next builds "
+              f"{sum(times[1:]) / (len(times) - 1) * 1000:7.1f} ms avg, "
+              f"last build re-used {reused}/{files}")
+
+    run("no cache", lambda previous: None)
+    run("memory LRU", lambda previous: previous or CACHE_C.ResultCache(files * 2))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'results.sqlite')
+
+        def reopen(previous):
+            # Cada build abre la caché de nuevo: solo el nivel en disco sobrevive
+            if previous is not None:
+                previous.close()
+            return CACHE_C.ResultCache(files * 2, path)
+        run("sqlite (new process)", reopen)
+
+# ==================== STRUCTURED RESULTS ====================
+
+def bench_result_objects(sizes=(500, 5_000), repeat=5):
+    """Costo de armar el reporte de texto contra usar solo el AnalysisResult (BATCH_C, GUI)"""
+    print("=== STRUCTURED RESULTS ===")
+    session = PARSER_C.AnalysisSession()
+    for size in sizes:
+        code = synthetic_program(size)
+        report = best_of(lambda: session.analyze(code), repeat)
+        result = best_of(lambda: session.run(code), repeat)
+        to_json = best_of(lambda: session.run(code).to_json(include_ast=False), repeat)
+        assert session.run(code).to_text() == session.analyze(code)
+        print(f"  {size:>6} statements: report {report * 1000:7.2f} ms, result only {result * 1000:7.2f} ms "
+              f"({report / result:.2f}x), result + JSON {to_json * 1000:7.2f} ms")
+
+# ==================== PROFILING ====================
+
+def bench_profiling(statements=5_000, repeat=3):
+    """Costo de las mediciones por fase (siempre activas) y de los modos cProfile / tracemalloc"""
+    print(f"=== PROFILING ({statements} statements) ===")
+    code = synthetic_program(statements)
+    result = PARSER_C.parse_result(code)
+    result.to_text()
+    print("\n".join("  " + line for line in result.profiler.summary().split("\n")))
+    plain = best_of(lambda: PARSER_C.parse_result(code).to_text(), repeat)
+    for label, options in (("cProfile", {'capture_profile': True}),
+                           ("tracemalloc", {'trace_memory': True})):
+        measured = best_of(lambda: PARSER_C.parse_result(code, **options).to_text(), repeat)
+        print(f"  {label:<12} {measured * 1000:8.2f} ms ({measured / plain:.2f}x of {plain * 1000:.2f} ms)")
+
+# ==================== INCREMENTAL (LIVE ANALYSIS) ====================
+
+def bench_incremental(sizes=(1_000, 5_000), edits=50):
+    """Latencia por cambio en INCREMENTAL_C contra un análisis completo, editando a la mitad del programa"""
+    import INCREMENTAL_C
+    print("=== INCREMENTAL (LIVE ANALYSIS) ===")
+    session = PARSER_C.AnalysisSession()
+    for size in sizes:
+        lines = synthetic_program(size).split("\n")
+        middle = len(lines) // 2
+        full = best_of(lambda: session.parse("\n".join(lines)), 3)
+        analyzer = INCREMENTAL_C.IncrementalAnalyzer()
+        analyzer.update("\n".join(lines))
+        latencies = []
+        for i in range(edits):
+            # Alterna entre editar un valor y declarar una variable nueva
+            edited = list(lines)
+            if i % 2:
+                edited[middle] = f"    y = {i} + x;"
+            else:
+                edited.insert(middle, f"    int v{i};")
+            start = time.perf_counter()
+            analyzer.update("\n".join(edited))
+            latencies.append(time.perf_counter() - start)
+            assert analyzer.last_mode == 'incremental'
+        latencies.sort()
+        median = latencies[len(latencies) // 2]
+        print(f"  {len(lines):>6} lines: full parse {full * 1000:7.1f} ms, incremental "
+              f"median {median * 1000:5.1f} ms / max {latencies[-1] * 1000:5.1f} ms "
+              f"(x{full / median:.0f})")
+
+# ==================== BACKGROUND ANALYSIS (GUI) ====================
+
+def bench_background(statements=20_000):
+    """Costo de reportar el avance y tiempo que tarda un análisis en detenerse después de cancel()"""
+    import threading
+    code = synthetic_program(statements)
+    session = PARSER_C.AnalysisSession()
+    plain = best_of(lambda: session.parse(code), 3)
+    watched = best_of(lambda: session.parse(code, progress=lambda fraction: None), 3)
+    print(f"=== BACKGROUND ANALYSIS ({statements} statements) ===")
+    print(f"  parse {plain * 1000:.1f} ms, with progress/cancel checks {watched * 1000:.1f} ms "
+          f"(+{(watched / plain - 1) * 100:.1f}%)")
+    for lazy in (False, True):
+        stopped = {}
+
+        def work():
+            try:
+                session.parse(code, lazy_tokens=lazy, progress=lambda fraction: None)
+            except PARSER_C.AnalysisCancelled:
+                stopped['at'] = time.perf_counter()
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        time.sleep(plain / 3)
+        requested = time.perf_counter()
+        session.cancel()
+        worker.join()
+        latency = (stopped['at'] - requested) * 1000 if stopped else float('nan')
+        print(f"  cancel latency ({'lazy' if lazy else 'eager'} tokens): {latency:.2f} ms")
+
+# ==================== BYTECODE VM ====================
+
+def bench_vm(statements=50_000, depth=4, repeat=5, seed=21):
+    """Instrucciones por segundo de la VM contra el intérprete que recorre el AST (mismo programa)"""
+    import VM_C
+    code = GEN_C.ProgramGenerator(seed, max_depth=depth, early_returns=False).program(statements)
+    program = PARSER_C.parse_result(code).ast
+    compile_time = best_of(lambda: VM_C.compile_program(program), repeat)
+    bytecode = VM_C.compile_program(program)
+    executed = VM_C.execute(bytecode, count_instructions=True).instructions
+    vm = best_of(lambda: VM_C.execute(bytecode), repeat)
+    tree = best_of(lambda: VM_C.interpret(program), repeat)
+    assert VM_C.execute(bytecode) == VM_C.interpret(program)
+    print(f"=== BYTECODE VM ({statements} statements, {len(bytecode)} instructions) ===")
+    print(f"  compile        {compile_time * 1000:8.2f} ms")
+    print(f"  VM             {vm * 1000:8.2f} ms ({executed / vm / 1e6:.1f} M instructions/s)")
+    print(f"  tree-walking   {tree * 1000:8.2f} ms ({tree / vm:.1f}x slower)")
+
+# ==================== THREE-ADDRESS IR ====================
+
+def bench_ir_passes(statements=50_000, depth=4, repeat=3, seed=22):
+    """Tiempo de cada pase sobre IR recién generado (tamaño antes -> después) y del pipeline completo"""
+    import IR_C
+    code = GEN_C.ProgramGenerator(seed, max_depth=depth, early_returns=False).program(statements)
+    program = PARSER_C.parse_result(code).ast
+    lowering = best_of(lambda: IR_C.lower(program), repeat)
+    size = IR_C.lower(program).size()
+    print(f"=== IR PASSES ({statements} statements, {size} IR instructions) ===")
+    print(f"  {'lowering':<36}{lowering * 1000:9.2f} ms")
+    for name, run in list(IR_C.PASSES) + [('full pipeline', IR_C.optimize)]:
+        best = float('inf')
+        for _ in range(repeat):
+            function = IR_C.lower(program)
+            start = time.perf_counter()
+            run(function)
+            best = min(best, time.perf_counter() - start)
+        print(f"  {name:<36}{best * 1000:9.2f} ms   {size} -> {function.size()}")
+
+# ==================== NATIVE CODE (x86-64) ====================
+
+def bench_native(statements=50_000, depth=4, repeat=5, seed=23):
+    """Emitir, ensamblar y correr el ejecutable contra la VM y el intérprete (mismo programa)"""
+    import Asm_Obj
+    import VM_C
+    if not Asm_Obj.TOOLCHAIN_AVAILABLE:
+        print("=== NATIVE CODE: skipped (no C compiler to assemble and link) ===")
+        return
+    code = GEN_C.ProgramGenerator(seed, max_depth=depth, early_returns=False).program(statements)
+    result = PARSER_C.parse_result(code)
+    program = result.ast
+    function = result.ir()
+    emit = best_of(lambda: Asm_Obj.emit_function(function, report=True), repeat)
+    assembly = Asm_Obj.emit_function(function, report=True)
+    allocation = Asm_Obj.allocate_registers(function)
+    expected = VM_C.execute(VM_C.compile_program(program))
+    with tempfile.TemporaryDirectory() as folder:
+        start = time.perf_counter()
+        path = Asm_Obj.build_executable(assembly, os.path.join(folder, 'main'))
+        build = time.perf_counter() - start
+        empty = Asm_Obj.build_executable(Asm_Obj.emit_code("int main(){ return 0; }", report=True),
+                                         os.path.join(folder, 'empty'))
+        executed = Asm_Obj.run_executable(path)[0]
+        native = min(Asm_Obj.run_executable(path)[1] for _ in range(repeat))
+        startup = min(Asm_Obj.run_executable(empty)[1] for _ in range(repeat))
+    assert executed == expected
+    bytecode = VM_C.compile_program(program)
+    vm = best_of(lambda: VM_C.execute(bytecode), repeat)
+    tree = best_of(lambda: VM_C.interpret(program), repeat)
+    print(f"=== NATIVE CODE ({statements} statements, {assembly.count(chr(10))} lines of assembly, "
+          f"{len(allocation.spilled)}/{len(allocation.locations)} spilled) ===")
+    print(f"  emit (regalloc + asm)   {emit * 1000:8.2f} ms")
+    print(f"  assemble + link         {build * 1000:8.2f} ms")
+    print(f"  native run              {native * 1000:8.2f} ms (process startup {startup * 1000:.2f} ms)")
+    print(f"  VM                      {vm * 1000:8.2f} ms ({vm / native:.1f}x the native run)")
+    print(f"  tree-walking            {tree * 1000:8.2f} ms ({tree / native:.1f}x the native run)")
+
+# ==================== LEGACY LEXER STATISTICS ====================
+
+LEGACY_LEXER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Lexer', 'LEX_C.py')
+
+def load_legacy_lexer(path=LEGACY_LEXER):
+    """Lexer/LEX_C.py como módulo aparte (tiene el mismo nombre que el LEX_C de este directorio)"""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location('LEGACY_LEX_C', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def legacy_analyze_code(module, code):
+    """Versión anterior de analyze_code (cadena if/elif y listas por categoría), como referencia"""
+    module.lexer.input(code)
+    tokens_by_type = {"Keywords": [], "Identifiers": [], "Operators": [], "Constants": [],
+                      "Punctuation": [], "Literals": []}
+    total_tokens = 0
+    for tok in module.lexer:
+        total_tokens += 1
+        if tok.type == "KEYWORDS":
+            tokens_by_type["Keywords"].append(tok.value)
+        elif tok.type == "IDENTIFIER":
+            tokens_by_type["Identifiers"].append(tok.value)
+        elif tok.type == "OPERATOR":
+            tokens_by_type["Operators"].append(tok.value)
+        elif tok.type == "CONSTANT":
+            tokens_by_type["Constants"].append(tok.value)
+        elif tok.type == "PUNCTUATION":
+            tokens_by_type["Punctuation"].append(tok.value)
+        elif tok.type == "LITERAL":
+            tokens_by_type["Literals"].append(tok.value)
+    result = "\n"
+    for error in module.errores:
+        result += f"{error}\n"
+    result += "\n=== Tokens ===\n"
+    for key, values in tokens_by_type.items():
+        result += f"{key}: {values}\n"
+    result += f"\nTotal de tokens = {total_tokens}"
+    errors = len(module.errores)
+    module.errores.clear()
+    return result, tokens_by_type, errors
+
+def bench_legacy_stats(files=300, statements=200, repeat=3, seed=24):
+    """Histogramas, frecuencia de identificadores y estadísticas por archivo de un corpus:
+    listas por archivo + Counter (versión anterior) contra TokenStats"""
+    from collections import Counter
+    legacy = load_legacy_lexer()
+    corpus = GEN_C.generate_corpus(files, statements, seed=seed, errors=1, error_kinds=('lexical',))
+
+    def old_aggregate(results):
+        histogram = Counter()
+        identifiers = Counter()
+        per_file = []
+        for lists, errors in results:
+            row = {key: len(values) for key, values in lists.items()}
+            histogram.update(row)
+            identifiers.update(lists["Identifiers"])
+            per_file.append((row, errors, len(set(lists["Identifiers"]))))
+        return histogram, identifiers.most_common(), per_file
+
+    def old_path():
+        return old_aggregate([legacy_analyze_code(legacy, code)[1:] for code in corpus])
+
+    def new_path():
+        stats = legacy.TokenStats()
+        for index, code in enumerate(corpus):
+            stats.add(code, f"file{index}")
+        return stats, (stats.histogram(), stats.identifier_frequencies(), stats.file_stats())
+
+    # Mismos resultados por los dos caminos
+    histogram, identifiers, per_file = old_path()
+    stats, (new_histogram, new_identifiers, file_stats) = new_path()
+    assert dict(histogram) == new_histogram
+    assert sorted(identifiers) == sorted(new_identifiers)
+    assert [(row, errors, distinct) for row, errors, distinct in per_file] == [
+        ({key: entry[key] for key in legacy.CATEGORIES}, entry['errors'], entry['distinct_identifiers'])
+        for entry in file_stats]
+    assert all(legacy.analyze_code(code) == legacy_analyze_code(legacy, code)[0] for code in corpus[:20])
+
+    def aggregate():
+        stats._identifiers = None
+        return (stats.histogram(), stats.file_histograms(), stats.identifier_frequencies(),
+                stats.distinct_identifiers())
+
+    tokens = stats.offsets[-1]
+    print(f"=== LEGACY LEXER STATISTICS ({files} files, {tokens} tokens) ===")
+    old = best_of(old_path, repeat)
+    results = [legacy_analyze_code(legacy, code)[1:] for code in corpus]
+    old_aggregation = best_of(lambda: old_aggregate(results), repeat)
+    print(f"  lists + Counter (previous)     {old * 1000:9.2f} ms (aggregation only {old_aggregation * 1000:.2f} ms)")
+    total = best_of(new_path, repeat)
+    aggregation = best_of(aggregate, repeat)
+    print(f"  TokenStats                     {total * 1000:9.2f} ms (aggregation only {aggregation * 1000:.2f} ms)")
+    report = best_of(lambda: [legacy_analyze_code(legacy, code) for code in corpus], repeat)
+    new_report = best_of(lambda: [legacy.analyze_code(code) for code in corpus], repeat)
+    print(f"  per-file report: previous {report * 1000:.2f} ms, TokenStats {new_report * 1000:.2f} ms")
+
+def bench_lexer_profiles(files=300, statements=200, repeat=3, seed=25):
+    """Tokens del parser + reporte de categorías de un corpus: los dos lexers de PLY
+    (versión anterior), dos recorridos con la tabla de reglas, y un solo recorrido"""
+    legacy = load_legacy_lexer()
+    corpus = GEN_C.generate_corpus(files, statements, seed=seed, errors=1, error_kinds=('lexical',))
+
+    def two_ply():
+        return [(LEX_C.analyze_code(code), legacy.analyze_code(code)) for code in corpus]
+
+    def two_scans():
+        return [(LEX_C.TokenBuffer.from_code(code, LEX_C.new_lexer('fast')),
+                 SCANNER_C.scan(code, ('category',))['category'].report()) for code in corpus]
+
+    def one_scan():
+        results = []
+        for code in corpus:
+            buffer, category = LEX_C.analyze_profiles(code)
+            results.append((buffer, category.report()))
+        return results
+
+    expected = [(buffer.columns(), report) for buffer, report in two_ply()]
+    for path in (two_scans, one_scan):
+        assert [(buffer.columns(), report) for buffer, report in path()] == expected
+    tokens = sum(len(buffer) for buffer, _ in one_scan())
+    print(f"=== LEXER PROFILES ({files} files, {tokens} parser tokens, parser stream + category report) ===")
+    previous = best_of(two_ply, repeat)
+    print(f"  two PLY lexers (previous)      {previous * 1000:9.2f} ms")
+    for label, path in (("fast backend + category scan", two_scans), ("one scan, both profiles", one_scan)):
+        seconds = best_of(path, repeat)
+        print(f"  {label:<30} {seconds * 1000:9.2f} ms ({previous / seconds:.2f}x)")
+
+# ==================== BENCHMARK SUITE (BASELINE) ====================
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+# Cargas del suite: nombre -> (programas, sentencias por programa, profundidad de if, errores)
+SUITE_WORKLOADS = {
+    'small': (200, 50, 2, 0),
+    'large': (1, 20_000, 3, 0),
+    'nested': (20, 1_000, 10, 0),
+    'invalid': (50, 400, 3, 8),
+}
+# Etapas medidas -> fases de PROFILE_C que suman su tiempo. Las acciones SDT corren
+# dentro del parser, así que 'sdt' es lo que queda del SDT después: el parse tree
+# y la verificación del reporte.
+SUITE_STAGES = {
+    'lexer': ('lex',),
+    'parser': ('parse',),
+    'sdt': ('parse_tree', 'sdt_verification'),
+}
+
+def run_suite(repeat=3, seed=20):
+    """Throughput en tokens/s de cada etapa por carga: {'carga/etapa': tokens/s} (mejor de 'repeat')"""
+    session = PARSER_C.AnalysisSession()
+    results = {}
+    for name, (count, statements, depth, errors) in SUITE_WORKLOADS.items():
+        corpus = GEN_C.generate_corpus(count, statements, depth, seed, errors)
+        best = dict.fromkeys(list(SUITE_STAGES) + ['end_to_end'], float('inf'))
+        tokens = 0
+        for _ in range(repeat):
+            totals = dict.fromkeys(SUITE_STAGES, 0.0)
+            tokens = 0
+            for code in corpus:
+                result = session.run(code)
+                result.to_text()
+                tokens += result.token_count
+                phases = result.profiler.timings
+                for stage, names in SUITE_STAGES.items():
+                    totals[stage] += sum(phases.get(phase, 0.0) for phase in names)
+            start = time.perf_counter()
+            for code in corpus:
+                PARSER_C.parse_code(code)
+            totals['end_to_end'] = time.perf_counter() - start
+            for stage, seconds in totals.items():
+                best[stage] = min(best[stage], seconds)
+        for stage, seconds in best.items():
+            results[f"{name}/{stage}"] = tokens / seconds if seconds else 0.0
+    return results
+
+def load_baseline(path=BASELINE_FILE):
+    """Resultados guardados con save_baseline, o None si no hay línea base"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['results']
+
+def save_baseline(results, path=BASELINE_FILE):
+    data = {'python': platform.python_version(), 'machine': platform.machine(),
+            'saved': time.strftime('%Y-%m-%d %H:%M:%S'), 'results': results}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+def compare_baseline(results, baseline, tolerance=0.15):
+    """Imprime la comparación y retorna las llaves que bajaron más de 'tolerance' (fracción)"""
+    regressions = []
+    print(f"  {'workload/stage':<22}{'baseline':>14}{'current':>14}{'change':>9}")
+    for key, current in results.items():
+        previous = baseline.get(key) if baseline else None
+        if not previous:
+            print(f"  {key:<22}{'-':>14}{current:>14,.0f}")
+            continue
+        change = current / previous - 1
+        flag = ""
+        if change < -tolerance:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"  {key:<22}{previous:>14,.0f}{current:>14,.0f}{change:>+9.1%}{flag}")
+    return regressions
+
+def bench_suite(baseline_path=BASELINE_FILE, save=False, tolerance=0.15, repeat=3):
+    """Corre el suite (tokens/s), lo compara con la línea base y retorna las regresiones"""
+    print(f"=== BENCHMARK SUITE (tokens/s, best of {repeat}, tolerance {tolerance:.0%}) ===")
+    results = run_suite(repeat)
+    baseline = load_baseline(baseline_path)
+    regressions = compare_baseline(results, baseline, tolerance)
+    if baseline is None:
+        print(f"  no baseline in {baseline_path} (use --save-baseline)")
+    elif regressions:
+        print(f"  {len(regressions)} regressions: {', '.join(regressions)}")
+    else:
+        print("  no regressions")
+    if save:
+        save_baseline(results, baseline_path)
+        print(f"  baseline saved to {baseline_path}")
+    return regressions
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmarks del Lexer + Parser")
+    arg_parser.add_argument('statements', nargs='?', type=int, default=2000)
+    arg_parser.add_argument('--suite', action='store_true',
+                            help="solo el suite de throughput, comparado con la línea base")
+    arg_parser.add_argument('--baseline', default=BASELINE_FILE, help="archivo JSON de la línea base")
+    arg_parser.add_argument('--save-baseline', action='store_true', help="guardar los resultados como línea base")
+    arg_parser.add_argument('--tolerance', type=float, default=0.15,
+                            help="caída de throughput (fracción) que se reporta como regresión")
+    args = arg_parser.parse_args()
+    if args.suite:
+        sys.exit(1 if bench_suite(args.baseline, args.save_baseline, args.tolerance) else 0)
+    statements = args.statements
+    bench_single_pass(statements)
+    bench_token_buffer()
+    bench_lexer_backends()
+    bench_startup()
+    bench_parse_tree()
+    bench_ast()
+    bench_constant_folding()
+    bench_symbol_table()
+    bench_cache()
+    bench_result_objects()
+    bench_profiling()
+    bench_vm()
+    bench_ir_passes()
+    bench_native()
+    bench_incremental()
+    bench_background()
+    bench_streaming()
+    bench_legacy_stats()
+    bench_lexer_profiles()
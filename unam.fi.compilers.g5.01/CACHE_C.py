@@ -0,0 +1,152 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Caché de resultados por contenido para parse_code, analyze_code y BATCH_C.
+# La llave es un hash del código fuente, de las opciones del análisis y de la
+# versión del analizador (hash de LEX_C, PARSER_C y AST_C): si cambia la
+# gramática, el lexer o una acción SDT, los resultados anteriores dejan de usarse.
+#
+# Dos niveles:
+#   1. Memoria: LRU con un máximo de entradas.
+#   2. Disco (opcional): una base SQLite que pueden compartir varios procesos
+#      (p. ej. los workers de BATCH_C o varias ejecuciones del build).
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+ANALYZER_MODULES = ('LEX_C.py', 'SCANNER_C.py', 'PARSER_C.py', 'AST_C.py')
+
+@lru_cache(maxsize=None)
+def analyzer_version():
+    """Hash de los módulos que producen los resultados (gramática, lexer y SDT) y de PLY"""
+    import ply
+    digest = hashlib.sha1(ply.__version__.encode('utf-8'))
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ANALYZER_MODULES:
+        with open(os.path.join(here, name), 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+class ResultCache:
+    """
+    Caché LRU en memoria con un nivel opcional en disco (SQLite, en 'path').
+    Se puede usar desde varios hilos. Los valores se guardan tal cual en memoria
+    y con pickle en disco: deben ser inmutables o no modificarse al leerlos.
+    """
+    def __init__(self, max_entries=256, path=None, version=None):
+        self.max_entries = max_entries
+        self.version = version if version is not None else analyzer_version()
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0          # encontrados en memoria
+        self.disk_hits = 0     # encontrados en disco (y subidos a memoria)
+        self.misses = 0
+        self.evictions = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB)")
+
+    def key(self, kind, code, *options):
+        """Llave por contenido: versión del analizador, tipo de resultado, opciones y código"""
+        digest = hashlib.sha256(f"{self.version}\0{kind}\0{options!r}\0".encode('utf-8'))
+        digest.update(code.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, self)
+            if value is not self:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = pickle.loads(row[0])
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                                 (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+
+    def _remember(self, key, value):
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Valor guardado para 'key', o compute() (que se guarda); no usar None como valor"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Borra ambos niveles (el de disco también para los demás procesos) y los contadores"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+# Caché compartida por defecto (solo memoria) para parse_code(cache=True) y analyze_code(cache=True)
+_default_cache = None
+_default_lock = threading.Lock()
+
+def default_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
+
+def resolve(cache):
+    """cache=True usa default_cache(); un ResultCache se usa tal cual; None/False, sin caché"""
+    if cache is True:
+        return default_cache()
+    if cache is None or cache is False:
+        return None
+    return cache
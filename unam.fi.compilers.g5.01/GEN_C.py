@@ -0,0 +1,197 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Generador de programas sintéticos para la gramática de PARSER_C:
+# declaraciones, asignaciones, if/else anidados, printf y return, con tamaño y
+# profundidad configurables. Con la misma semilla genera siempre el mismo programa.
+#
+# Los programas válidos respetan el SDT (cada variable se declara antes de usarse,
+# sin re-declarar en el mismo scope). Con errors=N se insertan N errores léxicos,
+# de sintaxis o semánticos; ProgramGenerator.errors dice en qué línea quedó cada uno.
+#
+# Uso: python GEN_C.py [sentencias] [--depth N] [--seed N] [--errors N] [-o archivo]
+
+import argparse
+import random
+import sys
+
+TYPES = ('int', 'float', 'char')
+COMPARISONS = ('>', '<', '==')
+ERROR_KINDS = ('lexical', 'syntax', 'semantic')
+
+# Sentencias con un error de sintaxis (de las que la recuperación de PARSER_C se repone)
+SYNTAX_ERRORS = ("{name} = ;", "int = 3;", "if ({name} > ) {{ {name} = 1; }}", "printf(;",
+                 "{name} = ({name} + 1;", "return return;", "{name} {name};")
+
+class ProgramGenerator:
+    """Genera programas aleatorios pero reproducibles (misma semilla, mismo programa)"""
+    def __init__(self, seed=0, max_depth=3, max_expression_depth=3, early_returns=True):
+        self.rng = random.Random(seed)
+        self.max_depth = max_depth
+        self.max_expression_depth = max_expression_depth
+        # Sin early_returns solo hay un 'return' al final de main (al ejecutarlo, corren todas las sentencias)
+        self.early_returns = early_returns
+        self.errors = []    # [(línea, tipo)] del último programa generado
+
+    def program(self, statements=100, errors=0, error_kinds=ERROR_KINDS):
+        """Código fuente de un programa con aproximadamente 'statements' sentencias"""
+        self.errors = []
+        self._scopes = [set()]
+        self._visible = []      # nombres visibles, por scope (con repetidos si hay ocultamiento)
+        self._starts = [0]      # dónde empieza cada scope en _visible
+        self._declared = 0
+        self._budget = max(statements, 1)
+        self._lines = ["int main(){"]
+        self._block(1)
+        self._lines.append("    return 0;")
+        self._lines.append("}")
+        if errors:
+            self._insert_errors(errors, error_kinds)
+        return "\n".join(self._lines)
+
+    # ---------- sentencias ----------
+
+    def _block(self, depth):
+        """Sentencias de un bloque hasta agotar su parte del presupuesto (al menos una)"""
+        rng = self.rng
+        # Los bloques anidados se llevan solo una parte de las sentencias restantes
+        stop = 0 if depth == 1 else max(self._budget - rng.randint(1, 8), 0)
+        written = False
+        while self._budget > stop or not written:
+            self._budget -= 1
+            written = True
+            self._statement(depth)
+
+    def _statement(self, depth):
+        rng = self.rng
+        indent = "    " * depth
+        visible = self._visible
+        choice = rng.random()
+        if not visible or choice < 0.2:
+            self._declaration(indent)
+        elif choice < 0.55:
+            self._lines.append(f"{indent}{rng.choice(visible)} = {self._expression(visible)};")
+        elif choice < 0.75 and depth <= self.max_depth and self._budget > 0:
+            self._if(depth, indent, visible)
+        elif choice < 0.95 or not self.early_returns:
+            self._lines.append(f'{indent}printf("{rng.choice(("linea", "valor", "x es mayor", "fin"))}");')
+        else:
+            self._lines.append(f"{indent}return {self._expression(visible)};")
+
+    def _declaration(self, indent):
+        rng = self.rng
+        scope = self._scopes[-1]
+        outer = self._starts[-1]
+        name = None
+        if outer and rng.random() < 0.2:
+            name = self._visible[rng.randrange(outer)]  # Ocultar una variable de un scope exterior
+        if name is None or name in scope:
+            name = f"v{self._declared}"
+            self._declared += 1
+        scope.add(name)
+        self._visible.append(name)
+        self._lines.append(f"{indent}{rng.choice(TYPES)} {name};")
+
+    def _if(self, depth, indent, visible):
+        self._lines.append(f"{indent}if ({self._condition(visible)}){{")
+        self._scoped_block(depth + 1)
+        if self.rng.random() < 0.5:
+            self._lines.append(f"{indent}}}else{{")
+            self._scoped_block(depth + 1)
+        self._lines.append(f"{indent}}}")
+
+    def _scoped_block(self, depth):
+        self._scopes.append(set())
+        self._starts.append(len(self._visible))
+        self._block(depth)
+        del self._visible[self._starts.pop():]
+        self._scopes.pop()
+
+    # ---------- expresiones ----------
+
+    def _expression(self, visible):
+        """Expresión con a lo más una variable, para que sus valores no crezcan sin límite al plegarlos"""
+        rng = self.rng
+        expression = self._constant(rng.randint(0, self.max_expression_depth))
+        if visible and rng.random() < 0.7:
+            expression = f"{rng.choice(visible)} {rng.choice('+-/')} {expression}"
+            if rng.random() < 0.3:
+                expression = f"({expression}) / {rng.randint(1, 9)}"
+        return expression
+
+    def _constant(self, depth):
+        rng = self.rng
+        if depth == 0:
+            return str(rng.randint(0, 99))
+        left = self._constant(depth - 1)
+        right = str(rng.randint(0, 9))
+        expression = f"{left} {rng.choice('+-*/')} {right}"
+        return f"({expression})" if rng.random() < 0.3 else expression
+
+    def _condition(self, visible):
+        rng = self.rng
+        left = rng.choice(visible) if visible else str(rng.randint(0, 99))
+        return f"{left} {rng.choice(COMPARISONS)} {self._constant(1)}"
+
+    # ---------- programas inválidos ----------
+
+    def _insert_errors(self, count, error_kinds):
+        """Inserta errores separados entre sí (PLY no reporta un error a menos de 3 tokens del anterior)"""
+        rng = self.rng
+        lines = self._lines
+        # Posiciones después de una sentencia terminada en ';' (no dentro de 'if (...){' ni '}')
+        candidates = [index for index in range(1, len(lines) - 1) if lines[index].endswith(';')]
+        spaced = candidates[::3]
+        chosen = sorted(rng.sample(spaced, min(count, len(spaced))), reverse=True)
+        inserted = []
+        for index in chosen:
+            indent = lines[index][:len(lines[index]) - len(lines[index].lstrip())]
+            kind = rng.choice(error_kinds)
+            if kind == 'lexical':
+                # El carácter ilegal se descarta y la sentencia sigue siendo válida
+                lines[index] += f" {rng.choice('@$`')}"
+                inserted.append((index, kind))
+                continue
+            if kind == 'syntax':
+                name = f"v{rng.randrange(max(self._declared, 1))}"
+                statement = rng.choice(SYNTAX_ERRORS).format(name=name)
+            else:
+                statement = f"undeclared{rng.randrange(1000)} = {rng.randint(0, 99)};"
+            lines.insert(index + 1, indent + statement)
+            inserted = [(line + 1, previous) for line, previous in inserted]
+            inserted.append((index + 1, kind))
+        self.errors = sorted((index + 1, kind) for index, kind in inserted)
+
+def generate_program(statements=100, max_depth=3, seed=0, errors=0, error_kinds=ERROR_KINDS):
+    """Programa sintético (ver ProgramGenerator); con errors=0 es válido y pasa el SDT"""
+    return ProgramGenerator(seed, max_depth).program(statements, errors, error_kinds)
+
+def generate_corpus(count, statements=100, max_depth=3, seed=0, errors=0, error_kinds=ERROR_KINDS):
+    """Lista de 'count' programas distintos y reproducibles"""
+    generator = ProgramGenerator(seed, max_depth)
+    return [generator.program(statements, errors, error_kinds) for _ in range(count)]
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Generador de programas para PARSER_C")
+    arg_parser.add_argument('statements', nargs='?', type=int, default=100, help="número de sentencias")
+    arg_parser.add_argument('--depth', type=int, default=3, help="profundidad máxima de if/else anidados")
+    arg_parser.add_argument('--seed', type=int, default=0, help="semilla (mismo valor, mismo programa)")
+    arg_parser.add_argument('--errors', type=int, default=0, help="errores a insertar (programa inválido)")
+    arg_parser.add_argument('-o', '--output', default=None, help="archivo de salida (por defecto stdout)")
+    args = arg_parser.parse_args(argv)
+
+    code = generate_program(args.statements, args.depth, args.seed, args.errors)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(code + "\n")
+    else:
+        print(code)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,13 +8,22 @@
 
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, BooleanVar
 from PIL import Image, ImageTk
 import os
+import queue
+import threading
 
 # Required files (Updated Lexer and Parser)
 import LEX_C
 import PARSER_C
+import INCREMENTAL_C
+import PROFILE_C
+
+# Tiempo sin teclear (ms) antes de re-analizar en modo Live Analysis
+LIVE_ANALYSIS_DELAY = 150
+# Cada cuánto (ms) el hilo de Tk revisa el avance y los resultados del análisis en segundo plano
+POLL_INTERVAL = 50
 
 class CodeAnalyzerApp:
     def __init__(self, root):
@@ -49,6 +58,7 @@ class CodeAnalyzerApp:
 
         self.text_area_input = ttk.Text(self.code_frame, height=12, font=("Consolas", 12), relief="solid", borderwidth=1)
         self.text_area_input.pack(fill=BOTH, expand=True, padx=5, pady=5)
+        self.text_area_input.bind("<KeyRelease>", self.schedule_live_analysis)
 
         # Default code for SDT testing
         default_code = """int main(){
@@ -69,6 +79,13 @@ class CodeAnalyzerApp:
         self.text_area_output = ttk.Text(self.output_frame, height=12, font=("Consolas", 12), state="disabled", relief="solid", borderwidth=1)
         self.text_area_output.pack(fill=BOTH, expand=True, padx=5, pady=5)
 
+        # --- Performance box: tiempos por fase del último análisis (PROFILE_C) ---
+        self.performance_frame = ttk.LabelFrame(self.main_frame, text="Performance", bootstyle="info")
+        self.performance_frame.pack(fill=X, padx=5, pady=5)
+
+        self.text_area_performance = ttk.Text(self.performance_frame, height=6, font=("Consolas", 10), state="disabled", relief="solid", borderwidth=1)
+        self.text_area_performance.pack(fill=X, padx=5, pady=5)
+
         # --- Options box ---
         self.options_frame = ttk.LabelFrame(self.main_frame, text="Analysis Options", bootstyle="success")
         self.options_frame.pack(fill=X, padx=5, pady=5)
@@ -79,6 +96,30 @@ class CodeAnalyzerApp:
         ttk.Button(self.options_frame, text="Parser + SDT", bootstyle="warning-outline", width=20, command=self.analyze_parser_sdt).pack(side=LEFT, padx=5, pady=5)
         ttk.Button(self.options_frame, text="Clear Results", bootstyle="secondary-outline", width=20, command=self.clear_results).pack(side=LEFT, padx=5, pady=5)
 
+        # Live Analysis: re-analiza al escribir, solo lo que cambió (INCREMENTAL_C)
+        self.live_analysis = BooleanVar(value=False)
+        self.live_analyzer = None
+        self.live_job = None
+        # Cuando hace falta un análisis completo se hace en un hilo de trabajo (como Parser + SDT)
+        self.live_results = queue.Queue()
+        self.live_id = 0
+        self.live_session = None        # sesión del análisis completo en curso (para cancelarla)
+        ttk.Checkbutton(self.options_frame, text="Live Analysis", variable=self.live_analysis, bootstyle="success-round-toggle", command=self.schedule_live_analysis).pack(side=LEFT, padx=5, pady=5)
+
+        # Profile: Parser + SDT con cProfile y tracemalloc (más lento); el detalle va al panel Performance
+        self.capture_profile = BooleanVar(value=False)
+        ttk.Checkbutton(self.options_frame, text="Profile", variable=self.capture_profile, bootstyle="info-round-toggle").pack(side=LEFT, padx=5, pady=5)
+
+        # Parser + SDT en segundo plano: el hilo de trabajo deja su resultado en una cola
+        # y el hilo de Tk lo recoge con root.after (los widgets solo se tocan desde Tk)
+        self.progress_bar = ttk.Progressbar(self.options_frame, maximum=100, bootstyle="warning-striped", length=150)
+        self.progress_bar.pack(side=LEFT, fill=X, expand=True, padx=5, pady=5)
+        self.analysis_results = queue.Queue()
+        self.analysis_id = 0            # cada clic inicia un análisis nuevo; los anteriores quedan obsoletos
+        self.analysis_session = None    # sesión del análisis en curso (para cancelarla)
+        self.analysis_progress = (0, 0.0)
+        self.poll_job = None
+
         # Theme
         self.theme_frame = ttk.Frame(root, padding=10)
         self.theme_frame.pack(fill=X)
@@ -125,6 +166,7 @@ class CodeAnalyzerApp:
                 if content is not None:
                     self.text_area_input.delete("1.0", "end")
                     self.text_area_input.insert("end", content)
+                    self.schedule_live_analysis()
                     messagebox.showinfo("Success", f"File loaded: {os.path.basename(file_path)}")
                 else:
                     messagebox.showerror("Error", "Could not read the file content")
@@ -166,6 +208,7 @@ class CodeAnalyzerApp:
             self.root.configure(bg=bg_color)
             self.text_area_input.configure(bg=bg_color, fg=fg_color, highlightbackground=border_color)
             self.text_area_output.configure(bg=bg_color, fg=fg_color, highlightbackground=border_color)
+            self.text_area_performance.configure(bg=bg_color, fg=fg_color, highlightbackground=border_color)
 
     def analyze_lexical(self):
         """Lexical analysis only"""
@@ -174,7 +217,8 @@ class CodeAnalyzerApp:
             messagebox.showwarning("Warning", "No code to analyze")
             return
         
-        tokens = LEX_C.analyze_code(code_content)
+        profiler = PROFILE_C.Profiler()
+        tokens = LEX_C.analyze_code(code_content, profiler=profiler)
         errors = LEX_C.get_lexical_errors()
         
         self.text_area_output.config(state="normal")
@@ -192,17 +236,153 @@ class CodeAnalyzerApp:
             self.text_area_output.insert("end", f"{i+1}: {token['type']} = '{token['value']}'\n")
         
         self.text_area_output.config(state="disabled")
+        self.show_performance(profiler)
 
     def analyze_parser_sdt(self):
-        """Complete Parser + SDT analysis"""
+        """Complete Parser + SDT analysis (en un hilo de trabajo; un nuevo clic cancela el anterior)"""
         code_content = self.text_area_input.get("1.0", "end").strip()
         if not code_content:
             messagebox.showwarning("Warning", "No code to analyze")
             return
         
-        # Execute Parser + SDT
-        result = PARSER_C.parse_code(code_content)
+        self.cancel_analysis()
+        self.analysis_id += 1
+        profile = self.capture_profile.get()
+        self.analysis_session = PARSER_C.AnalysisSession(capture_profile=profile, trace_memory=profile)
+        self.analysis_progress = (self.analysis_id, 0.0)
+        self.progress_bar.configure(value=0)
+        
+        worker = threading.Thread(target=self.parser_worker,
+                                  args=(self.analysis_id, self.analysis_session, code_content),
+                                  daemon=True)
+        worker.start()
+        if self.poll_job is None:
+            self.poll_job = self.root.after(POLL_INTERVAL, self.poll_analysis)
+
+    def parser_worker(self, run_id, session, code_content):
+        """Hilo de trabajo: ejecuta Parser + SDT sin tocar los widgets"""
+        def progress(fraction):
+            self.analysis_progress = (run_id, fraction)
         
+        analysis = None
+        try:
+            # Execute Parser + SDT (AnalysisResult, todavía sin reporte)
+            analysis = session.run(code_content, progress=progress)
+            session.check_cancelled()
+            if run_id != self.analysis_id:
+                return  # Ya se pidió otro análisis: no se arma el reporte ni la imagen
+            report = analysis.to_text(render_tree=True)
+        except PARSER_C.AnalysisCancelled:
+            return  # Análisis obsoleto: nadie espera su resultado
+        except Exception as e:
+            report = f"Error during analysis: {str(e)}"
+        self.analysis_results.put((run_id, analysis, report))
+
+    def poll_analysis(self):
+        """Hilo de Tk: actualiza la barra de progreso y muestra el resultado del análisis vigente"""
+        self.poll_job = None
+        self.poll_live_analysis()
+        while True:
+            try:
+                run_id, analysis, result = self.analysis_results.get_nowait()
+            except queue.Empty:
+                break
+            if run_id != self.analysis_id:
+                continue  # Resultado de un análisis que ya se reemplazó
+            self.analysis_session = None
+            self.progress_bar.configure(value=100)
+            self.text_area_output.config(state="normal")
+            self.text_area_output.delete("1.0", "end")
+            self.text_area_output.insert("end", result)
+            self.text_area_output.config(state="disabled")
+            if analysis is not None:
+                self.show_performance(analysis.profiler)
+        
+        if self.analysis_session is not None:
+            run_id, fraction = self.analysis_progress
+            if run_id == self.analysis_id:
+                self.progress_bar.configure(value=fraction * 100)
+        if self.analysis_session is not None or self.live_session is not None:
+            self.poll_job = self.root.after(POLL_INTERVAL, self.poll_analysis)
+
+    def show_performance(self, profiler):
+        """Muestra en el panel Performance las mediciones por fase (y el perfil de cProfile, si se capturó)"""
+        text = profiler.summary()
+        if profiler.profile is not None:
+            text += "\n\n" + profiler.profile_text()
+        self.text_area_performance.config(state="normal")
+        self.text_area_performance.delete("1.0", "end")
+        self.text_area_performance.insert("end", text)
+        self.text_area_performance.config(state="disabled")
+
+    def cancel_analysis(self):
+        """Cancela el análisis en segundo plano que esté en curso"""
+        if self.analysis_session is not None:
+            self.analysis_session.cancel()
+            self.analysis_session = None
+            self.progress_bar.configure(value=0)
+
+    def schedule_live_analysis(self, event=None):
+        """Debounce: el análisis se ejecuta cuando se deja de teclear por LIVE_ANALYSIS_DELAY ms"""
+        if self.live_job is not None:
+            self.root.after_cancel(self.live_job)
+            self.live_job = None
+        if self.live_analysis.get():
+            self.live_job = self.root.after(LIVE_ANALYSIS_DELAY, self.run_live_analysis)
+
+    def run_live_analysis(self):
+        """Análisis incremental del código actual (re-usa líneas y sentencias sin cambios)
+
+        Si el camino incremental no alcanza, el análisis completo se hace en un hilo de
+        trabajo y su resultado se muestra desde poll_live_analysis.
+        """
+        self.live_job = None
+        code_content = self.text_area_input.get("1.0", "end").strip()
+        if not code_content:
+            return
+        if self.live_analyzer is None:
+            self.live_analyzer = INCREMENTAL_C.IncrementalAnalyzer()
+        self.live_id += 1
+        if self.live_session is not None:
+            self.live_session.cancel()  # el texto cambió: su resultado ya no sirve
+            self.live_session = None
+        if self.live_analyzer.update_incremental(code_content):
+            self.show_live_analysis(code_content)
+            return
+
+        self.live_session = PARSER_C.AnalysisSession()
+        worker = threading.Thread(target=self.live_worker,
+                                  args=(self.live_id, self.live_session, code_content), daemon=True)
+        worker.start()
+        if self.poll_job is None:
+            self.poll_job = self.root.after(POLL_INTERVAL, self.poll_analysis)
+
+    def live_worker(self, run_id, session, code_content):
+        """Hilo de trabajo: análisis completo para Live Analysis, sin tocar los widgets ni el analizador"""
+        try:
+            # Con progress el parse revisa cancel() mientras avanza
+            INCREMENTAL_C.IncrementalAnalyzer.parse_full(code_content, session, progress=lambda fraction: None)
+        except PARSER_C.AnalysisCancelled:
+            return
+        self.live_results.put((run_id, session, code_content))
+
+    def poll_live_analysis(self):
+        """Hilo de Tk: entrega al analizador el análisis completo vigente y lo muestra"""
+        while True:
+            try:
+                run_id, session, code_content = self.live_results.get_nowait()
+            except queue.Empty:
+                return
+            if run_id != self.live_id:
+                continue  # El texto cambió mientras se analizaba
+            self.live_session = None
+            self.live_analyzer.finish_full(code_content, session)
+            self.show_live_analysis(code_content)
+
+    def show_live_analysis(self, code_content):
+        """Muestra el resumen del último análisis de Live Analysis"""
+        result = self.live_analyzer.summary(code_content)
+
         self.text_area_output.config(state="normal")
         self.text_area_output.delete("1.0", "end")
         self.text_area_output.insert("end", result)
@@ -210,11 +390,15 @@ class CodeAnalyzerApp:
 
     def clear_results(self):
         """Clear results area"""
+        self.cancel_analysis()
         self.text_area_output.config(state="normal")
         self.text_area_output.delete("1.0", "end")
         self.text_area_output.config(state="disabled")
+        self.text_area_performance.config(state="normal")
+        self.text_area_performance.delete("1.0", "end")
+        self.text_area_performance.config(state="disabled")
 
 if __name__ == "__main__":
     root = ttk.Window()
     app = CodeAnalyzerApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
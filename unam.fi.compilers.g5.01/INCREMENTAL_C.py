@@ -0,0 +1,628 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Análisis incremental para el modo "Live Analysis" de la GUI.
+#
+# Entre dos versiones del código:
+#   1. Solo se re-lexean las líneas dañadas (las que cambiaron entre el prefijo
+#      y el sufijo comunes); los tokens de cada línea se guardan por su texto.
+#   2. Solo se vuelve a dividir en sentencias la zona dañada. Una sentencia con
+#      los mismos tokens (y posiciones relativas) que antes re-usa su subárbol
+#      compilado sin volver a pasar por el parser LALR.
+#   3. Las acciones SDT (p_*) se vuelven a ejecutar desde el último punto de
+#      control antes del cambio, en el mismo orden en que el parser las
+#      reduciría, hasta que el estado semántico vuelve a ser igual al del
+#      análisis anterior; desde ahí se re-usan los nodos (solo se desplazan sus
+#      posiciones). La tabla de símbolos, los errores y el reporte son idénticos
+#      a los de un análisis completo.
+# Cualquier caso que no sea el camino feliz (error de sintaxis, llaves sin
+# cerrar, encabezado distinto) se resuelve con un análisis completo.
+
+import copy
+import os
+import re
+from bisect import bisect_left, bisect_right
+
+import ply.yacc as yacc
+
+import PARSER_C
+from AST_C import (NODE_CLASSES, Tipo, Declaration, InvalidDeclaration, Assignment,
+                   InvalidAssignment, BinOp, Number, Id, InvalidId, If, Else, Printf, Return)
+from LEX_C import Diagnostics, TokenStream, table_output
+from ply.lex import LexToken
+
+# Parser de una sola sentencia: misma gramática y acciones, símbolo inicial 'statement'
+with table_output(os.path.dirname(os.path.abspath(__file__))) as _outputdir:
+    statement_parser = yacc.yacc(module=PARSER_C, start='statement', debug=False, write_tables=True,
+                                 tabmodule='parsetab_stmt', outputdir=_outputdir, errorlog=yacc.NullLogger())
+
+# Un #include partido en dos líneas es el único token que cruza un salto de línea
+SPLIT_HEADER = re.compile(r'#include\s*\n')
+
+# Cada cuántas sentencias se guarda el estado semántico (para re-usar prefijo y sufijo)
+CHECKPOINT_EVERY = 64
+
+# Las cachés de líneas y sentencias se podan cuando tienen más del doble de lo que
+# usa el documento actual (más este margen), para que no crezcan sin límite al escribir
+PRUNE_SLACK = 256
+
+# Marcas en las operaciones compiladas: las llaves de un bloque abren y cierran un scope
+SCOPE_OPEN = 'scope_open'
+SCOPE_CLOSE = 'scope_close'
+
+class StatementSyntaxError(Exception):
+    """Error de sintaxis al parsear una sentencia suelta; detiene el parser de sentencias"""
+    pass
+
+class ReplaySlice:
+    """Sustituto de YaccProduction para volver a ejecutar una acción p_* sobre un subárbol"""
+    __slots__ = ('values', 'parser', 'positions')
+
+    def __init__(self, values, parser, positions):
+        self.values = values
+        self.parser = parser
+        self.positions = positions  # {índice del símbolo: (lineno, lexpos)}
+
+    def __getitem__(self, n):
+        return self.values[n]
+
+    def __setitem__(self, n, value):
+        self.values[n] = value
+
+    def __len__(self):
+        return len(self.values)
+
+    def lineno(self, n):
+        return self.positions.get(n, (0, 0))[0]
+
+    def lexpos(self, n):
+        return self.positions.get(n, (0, 0))[1]
+
+class IncrementalAnalyzer:
+    """Mantiene el último análisis y lo actualiza re-usando todo lo que no cambió"""
+
+    def __init__(self):
+        self.session = PARSER_C.AnalysisSession()
+        # Parser de sentencias con una sesión auxiliar: sus errores semánticos se
+        # ignoran, la semántica real se calcula al re-ejecutar las acciones
+        self._stmt_parser = copy.copy(statement_parser)
+        self._stmt_parser.session = PARSER_C.AnalysisSession()
+        self._stmt_parser.errorfunc = self._statement_syntax_error
+        self._lines = []          # [(texto, tokens, errores)]
+        self._starts = []         # posición absoluta donde empieza cada línea
+        self._line_cache = {}     # texto -> tokens (solo líneas sin errores léxicos)
+        self._templates = {}      # firma de la sentencia -> operaciones de _replay
+        self._names = {}          # firma de la sentencia -> identificadores que usa
+        self._header = None       # tokens 'int main ( ) {' del último análisis incremental
+        self._entries = []        # [(sentencia, nodo, punto de control, nodos creados)]
+        self._final = None        # estado semántico al terminar el cuerpo de main
+        # Última versión analizada por el camino incremental: las sentencias se comparan
+        # contra ella, así los estados intermedios inválidos al escribir no la descartan
+        self._base_texts = []
+        self._base_length = 0
+        self.code = None
+        self.last_mode = None     # 'incremental' o 'full'
+        self.relexed_lines = 0
+        self.reparsed_statements = 0
+        self.replayed_statements = 0
+
+    # ---------- Paso 1: lexer por líneas ----------
+
+    def _lex_line(self, code, start, end):
+        lexer = self.session.lexer
+        lexer.input(code)
+        lexer.lexpos = start
+        lexer.lexlen = end
+        lexer.errors = Diagnostics()
+        found = []
+        while True:
+            tok = lexer.token()
+            if tok is None:
+                break
+            found.append((tok.type, tok.value, tok.lexpos - start))
+        return tuple(found), list(lexer.errors)
+
+    @staticmethod
+    def _damage(old, new):
+        """Líneas que cambiaron: (primera, fin en new, fin en old), sin el prefijo y sufijo comunes"""
+        prefix = 0
+        limit = min(len(old), len(new))
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]:
+            suffix += 1
+        return prefix, len(new) - suffix, len(old) - suffix
+
+    def _update_lines(self, texts, code):
+        """Re-lexea solo las líneas dañadas respecto a la versión anterior"""
+        old = self._lines
+        prefix, end_new, end_old = self._damage([line[0] for line in old], texts)
+        lines = old[:prefix] + [None] * (end_new - prefix) + old[end_old:]
+        starts = []
+        start = 0
+        relexed = 0
+        for index, text in enumerate(texts):
+            starts.append(start)
+            entry = lines[index]
+            # Las líneas con errores se re-lexean siempre: sus mensajes llevan la posición absoluta
+            if entry is None or entry[2]:
+                tokens = self._line_cache.get(text)
+                if tokens is not None:
+                    entry = (text, tokens, ())
+                else:
+                    tokens, errors = self._lex_line(code, start, start + len(text))
+                    relexed += 1
+                    if not errors:
+                        self._line_cache[text] = tokens
+                    entry = (text, tokens, tuple(errors))
+                lines[index] = entry
+            start += len(text) + 1
+        self._lines = lines
+        self._starts = starts
+        self.relexed_lines = relexed
+
+    # ---------- Paso 2: división en sentencias ----------
+
+    def _split(self, first_line=0, start_pos=0, stop_pos=None, header=None):
+        """
+        Divide los tokens desde (first_line, start_pos) hasta stop_pos en sentencias de primer
+        nivel: [(firma, línea, posición, línea final, posición final)]. Sin header se leen
+        primero los tokens 'int ID ( ) {'; sin stop_pos se exige la llave final de main.
+        Retorna (header, sentencias) o None si no es el camino feliz.
+        """
+        header = list(header) if header is not None else []
+        state = 'body' if header else 'header'
+        statements = []
+        current = []
+        depth = 0
+        base_line = base_pos = 0
+        pending_else = None
+        lines = self._lines
+        starts = self._starts
+        for index in range(first_line, len(lines)):
+            lineno = index + 1
+            start = starts[index]
+            for tok_type, value, col in lines[index][1]:
+                lexpos = start + col
+                if lexpos < start_pos:
+                    continue
+                if stop_pos is not None and lexpos >= stop_pos:
+                    break
+                if state == 'header':
+                    header.append((tok_type, value, lineno, lexpos))
+                    if len(header) == 5:
+                        if [t[0] for t in header] != ['INT', 'ID', 'LPAREN', 'RPAREN', 'LBRACE']:
+                            return None
+                        state = 'body'
+                    continue
+                if state == 'done':
+                    return None  # tokens después de la llave final
+                if pending_else is not None:
+                    # Después de un bloque if: ¿sigue un else o termina la sentencia?
+                    if tok_type != 'ELSE':
+                        statements.append(pending_else)
+                        current = []
+                    pending_else = None
+                if not current:
+                    if depth == 0 and tok_type == 'RBRACE':
+                        state = 'done'
+                        continue
+                    base_line, base_pos = lineno, lexpos
+                current.append((tok_type, value, lineno - base_line, lexpos - base_pos))
+                if tok_type == 'LBRACE':
+                    depth += 1
+                elif tok_type == 'RBRACE':
+                    depth -= 1
+                    if depth < 0:
+                        return None
+                    if depth == 0:
+                        pending_else = (tuple(current), base_line, base_pos, lineno, lexpos + 1)
+                elif tok_type == 'SEMICOLON' and depth == 0:
+                    statements.append((tuple(current), base_line, base_pos, lineno, lexpos + 1))
+                    current = []
+            else:
+                continue
+            break  # se llegó a stop_pos
+        if stop_pos is None:
+            if state != 'done':
+                return None  # falta la llave de main o el último bloque if no tiene nada después
+        elif pending_else is not None:
+            statements.append(pending_else)
+        elif current or state != 'body':
+            return None
+        return header, statements
+
+    def _split_incremental(self, damage, shift):
+        """
+        Re-divide solo entre la última sentencia anterior al daño y la primera posterior.
+        Retorna (prefijo, sentencias nuevas, inicio del sufijo) o None si hay que dividir todo.
+        """
+        first, _, end_old = damage
+        entries = self._entries
+        header = self._header
+        if not entries or header is None or first + 1 <= header[4][2]:
+            return None
+        # Prefijo: sentencias que terminan antes de la primera línea dañada
+        prefix = bisect_right(entries, first, key=lambda entry: entry[0][3])
+        # Sufijo: sentencias que empiezan después de las líneas dañadas
+        suffix = bisect_left(entries, end_old + 1, key=lambda entry: entry[0][1])
+        if prefix:
+            _, _, _, last_line, last_end = entries[prefix - 1][0]
+        else:
+            last_line, last_end = header[4][2], header[4][3] + 1
+        stop = entries[suffix][0][2] + shift if suffix < len(entries) else None
+        split = self._split(last_line - 1, last_end, stop, header)
+        if split is None:
+            return None
+        return prefix, split[1], suffix
+
+    def _compile_split(self, split, previous):
+        """Plantillas de las sentencias nuevas, o None si alguna no es una sentencia válida"""
+        if split is None:
+            return None
+        prefix, middle, suffix = split
+        if not (prefix or middle or suffix < previous):
+            return None  # main sin sentencias
+        compiled = []
+        for statement in middle:
+            ops = self._parse_template(statement[0])
+            if ops is None:
+                return None
+            compiled.append(ops)
+        return compiled
+
+    def _parse_template(self, signature):
+        """Parsea una sentencia suelta (posiciones relativas a la sentencia) y la compila para _replay"""
+        ops = self._templates.get(signature)
+        if ops is not None:
+            return ops
+        toks = []
+        for tok_type, value, line, pos in signature:
+            tok = LexToken()
+            tok.type, tok.value, tok.lineno, tok.lexpos = tok_type, value, line, pos
+            toks.append(tok)
+        self._stmt_parser.session.reset()
+        try:
+            template = self._stmt_parser.parse(lexer=TokenStream(toks), tracking=True)
+        except StatementSyntaxError:
+            return None
+        if template is None:
+            return None
+        self.reparsed_statements += 1
+        ops = self._templates[signature] = self._compile(template)
+        self._names[signature] = frozenset(tok[1] for tok in signature if tok[0] == 'ID')
+        return ops
+
+    def _statement_syntax_error(self, p):
+        # Sin recuperación: una sentencia con errores se resuelve con el análisis completo
+        # (además, la regla 'statement : error' sola podría repetirse sin fin con este parser)
+        raise StatementSyntaxError()
+
+    # ---------- Paso 3: re-ejecutar las acciones SDT ----------
+
+    @staticmethod
+    def _compile(template):
+        """Aplana el subárbol en post-orden: [(clase, nodo, número de hijos)]"""
+        ops = []
+        stack = [(template, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node is SCOPE_OPEN or node is SCOPE_CLOSE:
+                ops.append((node, None, 0))
+                continue
+            if expanded:
+                ops.append((type(node), node, len(node) if type(node) is list else 0))
+                continue
+            stack.append((node, True))
+            if type(node) is list:
+                children = node
+            elif type(node) is If:
+                children = [node.cond, SCOPE_OPEN, node.body, SCOPE_CLOSE]
+                if node.orelse is not None:
+                    children.append(node.orelse)
+            elif type(node) is Else:
+                children = [SCOPE_OPEN, node.body, SCOPE_CLOSE]
+            else:
+                children = [child for child in node.values()
+                            if type(child) is list or type(child) in NODE_CLASSES]
+            stack.extend((child, False) for child in reversed(children))
+        return ops
+
+    def _replay(self, ops, parser, dline, dpos):
+        """
+        Reconstruye el subárbol llamando a las mismas acciones p_* en el orden del parser.
+        Retorna (subárbol, nodos creados).
+        """
+        stack = []
+        created = []
+        push = stack.append
+        pop = stack.pop
+        for kind, node, size in ops:
+            if kind is list:
+                items = stack[len(stack) - size:]
+                del stack[len(stack) - size:]
+                push(items)
+                continue
+            if kind is SCOPE_OPEN:
+                PARSER_C.p_scope_open(ReplaySlice([None, '{'], parser, {}))
+                continue
+            if kind is SCOPE_CLOSE:
+                PARSER_C.p_scope_close(ReplaySlice([None, '}'], parser, {}))
+                continue
+            position = {1: (node.lineno + dline, node.lexpos + dpos)}
+            if kind is Number:
+                p = ReplaySlice([None, node.value], parser, position)
+                PARSER_C.p_expression_number(p)
+            elif kind is Id or kind is InvalidId:
+                p = ReplaySlice([None, node.name], parser, position)
+                PARSER_C.p_expression_id(p)
+            elif kind is BinOp:
+                right = pop()
+                p = ReplaySlice([None, pop(), node.op, right], parser, {2: position[1]})
+                PARSER_C.p_expression_binop(p)
+            elif kind is Tipo:
+                p = ReplaySlice([None, node.name], parser, position)
+                PARSER_C.p_tipo(p)
+            elif kind is Declaration or kind is InvalidDeclaration:
+                p = ReplaySlice([None, pop(), node.name, ';'], parser, position)
+                PARSER_C.p_declaration(p)
+            elif kind is Assignment or kind is InvalidAssignment:
+                p = ReplaySlice([None, node.name, '=', pop(), ';'], parser, position)
+                PARSER_C.p_assignment(p)
+            elif kind is Else:
+                # El else no tiene acción propia: su cuerpo y posición pasan a p_if_statement
+                push((pop(), position[1]))
+                continue
+            elif kind is If:
+                orelse = pop() if node.orelse is not None else None
+                body = pop()
+                values = [None, 'if', pop(), '{', body, '}']
+                if orelse is not None:
+                    values += ['else', '{', orelse[0], '}']
+                    position[6] = orelse[1]
+                p = ReplaySlice(values, parser, position)
+                PARSER_C.p_if_statement(p)
+                if p[0].orelse is not None:
+                    created.append(p[0].orelse)
+            elif kind is Printf:
+                p = ReplaySlice([None, 'printf', '(', node.text, ')', ';'], parser, position)
+                PARSER_C.p_printf_statement(p)
+            elif kind is Return:
+                if node.value is not None:
+                    p = ReplaySlice([None, 'return', pop(), ';'], parser, position)
+                else:
+                    p = ReplaySlice([None, 'return', ';'], parser, position)
+                PARSER_C.p_return_statement(p)
+            else:
+                raise TypeError(f"Nodo inesperado: {node!r}")
+            created.append(p[0])
+            push(p[0])
+        return stack[0], created
+
+    def _snapshot(self):
+        """Estado semántico después de una sentencia"""
+        session = self.session
+        table = session.symbol_table
+        symbols = {name: (symbol.type, symbol.value) for name, symbol in table.symbols.items()}
+        scoped = tuple((symbol.name, symbol.type, symbol.value, symbol.depth) for symbol in table.scoped)
+        return symbols, scoped, tuple(session.semantic_errors)
+
+    def _restore(self, checkpoint):
+        symbols, scoped, errors = checkpoint
+        table = PARSER_C.SymbolTable()
+        for name, (type_name, value) in symbols.items():
+            table.add_symbol(name, type_name, value)
+        table.scoped = [PARSER_C.Symbol(*record) for record in scoped]
+        self.session.symbol_table = table
+        self.session.semantic_errors[:] = errors
+
+    @staticmethod
+    def _merge(now, before, after):
+        """
+        Aplica a 'now' lo que las sentencias re-usadas hicieron entre los estados anteriores
+        'before' y 'after' (solo tocan símbolos que no cambiaron entre 'before' y 'now')
+        """
+        symbols = {name: after[0][name] if before[0].get(name) == info else info
+                   for name, info in now[0].items()}
+        for name, info in after[0].items():
+            if name not in before[0]:
+                symbols[name] = info
+        return (symbols, now[1] + after[1][len(before[1]):],
+                now[2] + after[2][len(before[2]):])
+
+    def _replay_body(self, split, compiled, dline, dpos):
+        session = self.session
+        prefix, middle, suffix = split
+        old = self._entries
+
+        session.reset()
+        for _, _, errors in self._lines:
+            for error in errors:
+                session.lexer.errors.add(error)
+        session.token_count = sum(len(line[1]) for line in self._lines)
+        parser = session.parser
+
+        # Las sentencias del prefijo no cambiaron: se re-usan hasta el último punto de control
+        resume = prefix
+        while resume and old[resume - 1][2] is None:
+            resume -= 1
+        entries = old[:resume]
+        if resume:
+            self._restore(entries[-1][2])
+        pending = [entry[0] for entry in old[resume:prefix]] + middle
+        templates = [self._templates[statement[0]] for statement in pending[:prefix - resume]]
+        for statement, ops in zip(pending, templates + compiled):
+            node, created = self._replay(ops, parser, statement[1], statement[2])
+            checkpoint = self._snapshot() if (len(entries) + 1) % CHECKPOINT_EVERY == 0 else None
+            entries.append((statement, node, checkpoint, created))
+        self.replayed_statements = len(pending)
+
+        # Sufijo: se re-ejecuta hasta llegar a un punto de control anterior donde los símbolos
+        # que cambiaron ya no se usan más adelante; desde ahí las sentencias hacen lo mismo
+        # que antes y solo se desplazan sus posiciones
+        converged = None
+        last_use = None
+        for index in range(suffix, len(old)):
+            statement, node, checkpoint, created = old[index]
+            signature, line, pos, end_line, end_pos = statement
+            statement = (signature, line + dline, pos + dpos, end_line + dline, end_pos + dpos)
+            if converged is not None:
+                if dline or dpos:
+                    for item in created:
+                        item.lineno += dline
+                        item.lexpos += dpos
+                if checkpoint is not None and converged[0] != converged[1]:
+                    checkpoint = self._merge(converged[0], converged[1], checkpoint)
+            else:
+                node, created = self._replay(self._templates[signature], parser,
+                                             statement[1], statement[2])
+                self.replayed_statements += 1
+                if checkpoint is not None:
+                    current = self._snapshot()
+                    if current == checkpoint:
+                        converged = (current, checkpoint)
+                    else:
+                        if last_use is None:
+                            last_use = {}
+                            for later in range(suffix, len(old)):
+                                for name in self._names[old[later][0][0]]:
+                                    last_use[name] = later
+                        changed = {name for name in current[0].keys() | checkpoint[0].keys()
+                                   if current[0].get(name) != checkpoint[0].get(name)}
+                        if all(last_use.get(name, -1) <= index for name in changed):
+                            converged = (current, checkpoint)
+                    checkpoint = current
+            entries.append((statement, node, checkpoint, created))
+        if converged is not None:
+            self._restore(self._merge(converged[0], converged[1], self._final))
+        self._final = self._snapshot()
+        self._entries = entries
+
+        header = self._header
+        first = header[0]
+        p = ReplaySlice([None, 'int', header[1][1], '(', ')', '{', [entry[1] for entry in entries],
+                         '}'], parser, {1: (first[2], first[3])})
+        PARSER_C.p_program(p)
+        session.result = p[0]
+
+    # ---------- Entrada principal ----------
+
+    def update(self, code):
+        """Analiza la nueva versión del código; retorna la AnalysisSession con el resultado"""
+        if not self.update_incremental(code):
+            self.finish_full(code, self.parse_full(code, self.session))
+        return self.session
+
+    def update_incremental(self, code):
+        """Camino rápido de update: True si el código quedó analizado (sin cambios o por el
+        camino incremental); False si hace falta un análisis completo.
+
+        Con False se hace parse_full (puede ser en otro hilo, con otra sesión) y su
+        resultado se entrega con finish_full; así la GUI no se bloquea mientras tanto.
+        """
+        if code == self.code:
+            return True
+        self.reparsed_statements = 0
+        self.replayed_statements = 0
+        texts = code.split('\n')
+        self._update_lines(texts, code)
+
+        split = compiled = None
+        if not SPLIT_HEADER.search(code):
+            damage = self._damage(self._base_texts, texts)
+            shift = len(code) - self._base_length
+            split = self._split_incremental(damage, shift)
+            compiled = self._compile_split(split, len(self._entries))
+            if compiled is None:
+                full = self._split()
+                split = (0, full[1], 0) if full is not None else None
+                compiled = self._compile_split(split, 0)
+                if compiled is not None:
+                    self._header = full[0]
+                    self._entries = []
+
+        if compiled is None:
+            # Camino lento: análisis completo (mismos errores que el botón Parser + SDT)
+            return False
+        try:
+            self._replay_body(split, compiled, damage[1] - damage[2], shift)
+        except Exception:
+            # Una acción SDT lanzó un error (p. ej. una variable 'main'): el análisis
+            # completo lo reporta; el siguiente cambio empieza sin versión base
+            self._header = None
+            self._entries = []
+            self._final = None
+            self._base_texts = []
+            self._base_length = 0
+            return False
+        self.last_mode = 'incremental'
+        self._base_texts = texts
+        self._base_length = len(code)
+        self.code = code
+        self._prune()
+        return True
+
+    @staticmethod
+    def parse_full(code, session, progress=None):
+        """Análisis completo en session, como AnalysisSession.analyze: un error que lanza
+        una acción SDT queda en semantic_errors en lugar de propagarse.
+
+        No usa el estado del analizador, así que puede correr en un hilo de trabajo
+        (con progress también se puede cancelar con session.cancel()).
+        """
+        try:
+            session.parse(code, progress=progress)
+        except PARSER_C.AnalysisCancelled:
+            raise
+        except Exception as e:
+            session.parsing_success = False
+            session.result = None
+            session.token_count = len(session.tokens) if session.tokens is not None else 0
+            session.semantic_errors.append(f"Error during analysis: {str(e)}")
+        return session
+
+    def finish_full(self, code, session):
+        """Toma el análisis completo de 'code' (hecho con parse_full) como el resultado actual"""
+        self.session = session
+        self.last_mode = 'full'
+        self.code = code
+        self._prune()
+
+    def _prune(self):
+        """Descarta las líneas y sentencias en caché que el documento ya no usa"""
+        if len(self._line_cache) > 2 * len(self._lines) + PRUNE_SLACK:
+            live = {line[0] for line in self._lines}
+            self._line_cache = {text: tokens for text, tokens in self._line_cache.items() if text in live}
+        if len(self._templates) > 2 * len(self._entries) + PRUNE_SLACK:
+            # _replay_body necesita la plantilla de cada sentencia de la última versión incremental
+            live = {entry[0][0] for entry in self._entries}
+            self._templates = {signature: ops for signature, ops in self._templates.items() if signature in live}
+            self._names = {signature: names for signature, names in self._names.items() if signature in live}
+
+    def report(self, code):
+        """Actualiza y retorna el reporte de texto (igual al de parse_code)"""
+        return self.update(code).report()
+
+    def summary(self, code):
+        """Actualiza y retorna un resumen corto (sin el árbol) para mostrar mientras se escribe"""
+        session = self.update(code)
+        lexical_errors = session.lexical_errors
+        semantic_errors = session.semantic_errors
+        output = "=== LIVE ANALYSIS ===\n"
+        output += (f"Mode: {self.last_mode} (relexed lines: {self.relexed_lines}, "
+                   f"reparsed statements: {self.reparsed_statements}, "
+                   f"replayed statements: {self.replayed_statements})\n")
+        output += (f"Tokens: {session.token_count} | Lexical errors: {len(lexical_errors)} | "
+                   f"Syntax/semantic errors: {len(semantic_errors)}\n\n")
+        output += " Parsing Success!\n" if session.parsing_success else " Parsing Failed!\n"
+        if semantic_errors:
+            output += "\nSyntax/Semantic Errors:\n" + "\n".join(f"  • {error}" for error in semantic_errors) + "\n"
+        if lexical_errors:
+            output += "\nLexical Errors:\n" + "\n".join(f"  • {error}" for error in lexical_errors) + "\n"
+        return output
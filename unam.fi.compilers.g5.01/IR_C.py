@@ -0,0 +1,645 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Representación intermedia: código de tres direcciones en bloques básicos con su
+# CFG (if/else), generado desde el AST de PARSER_C, y pases de optimización:
+#   - constant_propagation: propagación de constantes por flujo de datos (respeta
+#     el flujo de control, a diferencia de los valores de la tabla de símbolos)
+#   - dead_branch_elimination: if con condición constante, bloques inalcanzables
+#     y bloques en línea recta que se pueden unir
+#   - common_subexpression_elimination: expresiones repetidas dentro de un bloque
+#     (numeración de valores local) y propagación de copias
+#   - dead_store_elimination: asignaciones cuyo valor ya no se lee (liveness)
+#
+# Operandos: int (constante) o str (variable o temporal). Las variables ocultas
+# por un bloque se renombran ('x', 'x.1', ...) y los temporales son '%1', '%2', ...
+# La semántica es la de VM_C: enteros, '/' entera con x / 0 = 0, una variable
+# declarada vale 0; lo observable es el return, la salida de printf y las
+# variables globales de main.
+
+from AST_C import BinOp, Number, Id, Declaration, Assignment, If, Printf, Return
+from PARSER_C import FOLD_OPERATORS
+
+COMMUTATIVE = frozenset(('+', '*', '=='))
+
+class IRError(Exception):
+    """El AST no se puede traducir (tiene nodos inválidos)"""
+    pass
+
+class Instr:
+    """Instrucción de tres direcciones: dest = a op b, dest = a ('copy') o print a"""
+    __slots__ = ('op', 'dest', 'a', 'b')
+
+    def __init__(self, op, dest=None, a=None, b=None):
+        self.op = op
+        self.dest = dest
+        self.a = a
+        self.b = b
+
+    def __repr__(self):
+        if self.op == 'copy':
+            return f"{self.dest} = {self.a}"
+        if self.op == 'print':
+            return f"print {self.a!r}"
+        return f"{self.dest} = {self.a} {self.op} {self.b}"
+
+class Block:
+    """Bloque básico: instrucciones y un terminador ('jump', 'branch' o 'return')"""
+    __slots__ = ('label', 'instrs', 'kind', 'value', 'targets')
+
+    def __init__(self, label):
+        self.label = label
+        self.instrs = []
+        self.kind = None        # None mientras el bloque no termina
+        self.value = None       # condición de 'branch' u operando de 'return' (None: 'return;')
+        self.targets = []       # sucesores: [destino] o [verdadero, falso]
+
+    def terminator(self):
+        if self.kind == 'jump':
+            return f"goto {self.targets[0].label}"
+        if self.kind == 'branch':
+            return f"if {self.value} goto {self.targets[0].label} else {self.targets[1].label}"
+        return "return" if self.value is None else f"return {self.value}"
+
+class Function:
+    """IR de main: bloques (el primero es la entrada) y las variables globales"""
+    def __init__(self, blocks, globals):
+        self.blocks = blocks
+        self.globals = globals      # {nombre en el IR: nombre en el código} del scope de main
+
+    @property
+    def entry(self):
+        return self.blocks[0]
+
+    def size(self):
+        """Instrucciones más terminadores"""
+        return sum(len(block.instrs) + 1 for block in self.blocks)
+
+    def predecessors(self):
+        preds = {id(block): [] for block in self.blocks}
+        for block in self.blocks:
+            for target in block.targets:
+                preds[id(target)].append(block)
+        return preds
+
+    def reverse_postorder(self):
+        """Bloques alcanzables desde la entrada en orden topológico (postorden inverso)"""
+        order = []
+        seen = {id(self.entry)}
+        stack = [(self.entry, iter(self.entry.targets))]
+        while stack:
+            block, successors = stack[-1]
+            for target in successors:
+                if id(target) not in seen:
+                    seen.add(id(target))
+                    stack.append((target, iter(target.targets)))
+                    break
+            else:
+                stack.pop()
+                order.append(block)
+        order.reverse()
+        return order
+
+    def format(self):
+        """Listado legible del IR"""
+        lines = []
+        for block in self.blocks:
+            lines.append(f"{block.label}:")
+            lines.extend(f"    {instr!r}" for instr in block.instrs)
+            lines.append(f"    {block.terminator()}")
+        return "\n".join(lines)
+
+# ==================== LOWERING (AST -> IR) ====================
+
+class Lowering:
+    """Traduce un Program (sin errores semánticos) a una Function"""
+    def __init__(self):
+        self.blocks = []
+        self.temps = 0
+        self.versions = {}      # nombre -> declaraciones vistas (para renombrar las ocultas)
+        self.scopes = [{}]      # nombre -> nombre en el IR, por scope
+        self.block = self._new_block()
+
+    def _new_block(self):
+        block = Block(f"B{len(self.blocks)}")
+        self.blocks.append(block)
+        return block
+
+    def _terminate(self, kind, value=None, targets=()):
+        block = self.block
+        if block.kind is None:
+            block.kind = kind
+            block.value = value
+            block.targets = list(targets)
+
+    def _temp(self):
+        self.temps += 1
+        return f"%{self.temps}"
+
+    def _lookup(self, node):
+        for scope in reversed(self.scopes):
+            name = scope.get(node.name)
+            if name is not None:
+                return name
+        raise IRError(f"Variable '{node.name}' no declarada en línea {node.lineno}")
+
+    def lower(self, program):
+        if program is None or program[0] != 'program':
+            raise IRError("No hay un programa que traducir")
+        pending = [(program.statements, 0, None)]
+        while pending:
+            body, index, on_exit = pending.pop()
+            if index == len(body):
+                if on_exit is not None:
+                    on_exit()
+                continue
+            pending.append((body, index + 1, on_exit))
+            self._statement(body[index], pending)
+        # Fin de main sin return: retorna 0
+        self._terminate('return', 0)
+        globals = {name: source for source, name in self.scopes[0].items()}
+        return Function(self.blocks, globals)
+
+    def _statement(self, node, pending):
+        cls = type(node)
+        instrs = self.block.instrs
+        if cls is Declaration:
+            version = self.versions.get(node.name, 0)
+            self.versions[node.name] = version + 1
+            name = node.name if version == 0 else f"{node.name}.{version}"
+            self.scopes[-1][node.name] = name
+            instrs.append(Instr('copy', name, 0))
+        elif cls is Assignment:
+            value = self._expression(node.expr)
+            target = self._lookup(node)
+            last = instrs[-1] if instrs else None
+            if type(value) is str and value.startswith('%') and last is not None and last.dest == value:
+                last.dest = target  # x = a + b directamente, sin el temporal
+            else:
+                instrs.append(Instr('copy', target, value))
+        elif cls is Printf:
+            instrs.append(Instr('print', None, node.text))
+        elif cls is Return:
+            value = self._expression(node.value) if node.value is not None else None
+            self._terminate('return', value)
+            self.block = self._new_block()  # Lo que sigue es inalcanzable
+        elif cls is If:
+            self._if(node, pending)
+        else:
+            raise IRError(f"Sentencia inválida en línea {node.lineno}: {node[0]}")
+
+    def _if(self, node, pending):
+        cond = self._expression(node.cond)
+        then_block = self._new_block()
+        else_block = self._new_block() if node.orelse is not None else None
+        join = self._new_block()
+        self._terminate('branch', cond, (then_block, else_block or join))
+
+        def end_else():
+            self.scopes.pop()
+            self._terminate('jump', None, (join,))
+            self.block = join
+
+        def end_then():
+            self.scopes.pop()
+            self._terminate('jump', None, (join,))
+            if else_block is None:
+                self.block = join
+                return
+            self.block = else_block
+            self.scopes.append({})
+            pending.append((node.orelse.body, 0, end_else))
+
+        self.block = then_block
+        self.scopes.append({})
+        pending.append((node.body, 0, end_then))
+
+    def _expression(self, expr):
+        """Operando con el valor de la expresión (emite las instrucciones; iterativo)"""
+        instrs = self.block.instrs
+        values = []
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            cls = type(node)
+            if cls is str:
+                right = values.pop()
+                left = values.pop()
+                dest = self._temp()
+                instrs.append(Instr(node, dest, left, right))
+                values.append(dest)
+            elif cls is BinOp:
+                stack += (node.op, node.right, node.left)
+            elif cls is Number:
+                values.append(node.value)
+            elif cls is Id:
+                values.append(self._lookup(node))
+            else:
+                raise IRError(f"Expresión inválida en línea {node.lineno}: {node[0]}")
+        return values[0]
+
+def lower(program):
+    """IR (Function) de un Program de PARSER_C sin errores semánticos"""
+    return Lowering().lower(program)
+
+# ==================== DOMINATORS ====================
+
+def dominator_tree(function):
+    """Orden RPO, idom de cada bloque alcanzable y sus hijos en el árbol de dominadores (en RPO)
+
+    Algoritmo iterativo de Cooper, Harvey y Kennedy; como el CFG no tiene ciclos
+    (el lenguaje no tiene ciclos), converge en una pasada.
+    """
+    order = function.reverse_postorder()
+    number = {id(block): index for index, block in enumerate(order)}
+    preds = function.predecessors()
+    entry = order[0]
+    idom = {id(entry): entry}
+
+    def intersect(a, b):
+        while a is not b:
+            while number[id(a)] > number[id(b)]:
+                a = idom[id(a)]
+            while number[id(b)] > number[id(a)]:
+                b = idom[id(b)]
+        return a
+
+    changed = True
+    while changed:
+        changed = False
+        for block in order[1:]:
+            new = None
+            for pred in preds[id(block)]:
+                if id(pred) in idom:
+                    new = pred if new is None else intersect(pred, new)
+            if idom.get(id(block)) is not new:
+                idom[id(block)] = new
+                changed = True
+    children = {id(block): [] for block in order}
+    for block in order[1:]:
+        children[id(idom[id(block)])].append(block)
+    return order, idom, children, preds
+
+# ==================== CONSTANT PROPAGATION ====================
+
+_NAC = object()     # valor no constante
+
+def _phi_variables(order, idom, preds):
+    """{id(bloque): variables que llegan con valores distintos por cada predecesor}
+
+    Frontera de dominancia iterada de los bloques que definen cada variable
+    (la misma colocación que las funciones phi de SSA).
+    """
+    reachable = {id(block) for block in order}
+    frontier = {id(block): set() for block in order}
+    for block in order:
+        incoming = [pred for pred in preds[id(block)] if id(pred) in reachable]
+        if len(incoming) < 2:
+            continue
+        stop = idom[id(block)]
+        for pred in incoming:
+            runner = pred
+            while runner is not stop:
+                frontier[id(runner)].add(block)
+                runner = idom[id(runner)]
+    definitions = {}
+    for block in order:
+        for instr in block.instrs:
+            if instr.op != 'print':
+                definitions.setdefault(instr.dest, {})[id(block)] = block
+    phis = {id(block): [] for block in order}
+    for name, blocks in definitions.items():
+        placed = set()
+        work = list(blocks.values())
+        while work:
+            for target in frontier[id(work.pop())]:
+                if id(target) not in placed:
+                    placed.add(id(target))
+                    phis[id(target)].append(name)
+                    if id(target) not in blocks:
+                        work.append(target)
+    return phis
+
+def _propagate(function, rewrite, on_return=None):
+    """
+    Propagación de constantes recorriendo el árbol de dominadores con una pila de
+    valores por variable (sin copiar un estado por bloque). Los hijos se visitan en
+    RPO, así que al llegar a una unión ya se registraron los valores de sus predecesores.
+    on_return(bloque, valor_de) se llama en cada bloque 'return'.
+    """
+    order, idom, children, preds = dominator_tree(function)
+    phis = _phi_variables(order, idom, preds)
+    incoming = {id(block): {} for block in order}
+    values = {}     # variable -> pila de valores (constante o _NAC) en el camino actual
+    changes = 0
+
+    def value_of(operand):
+        if type(operand) is not str:
+            return operand
+        stack = values.get(operand)
+        return stack[-1] if stack else _NAC
+
+    def define(name, value, pushed):
+        stack = values.get(name)
+        if stack is None:
+            stack = values[name] = []
+        stack.append(value)
+        pushed.append(name)
+
+    pending = [(order[0], None)]
+    while pending:
+        block, pushed = pending.pop()
+        if pushed is not None:
+            for name in pushed:
+                values[name].pop()
+            continue
+        pushed = []
+        arrived = incoming[id(block)]
+        for name in phis[id(block)]:
+            inputs = arrived.get(name)
+            if not inputs:
+                continue    # no definida en ningún camino que llega aquí
+            first = inputs[0]
+            constant = first is not _NAC and all(value == first and value is not _NAC for value in inputs)
+            define(name, first if constant else _NAC, pushed)
+        for instr in block.instrs:
+            op = instr.op
+            if op == 'print':
+                continue
+            a = value_of(instr.a)
+            if rewrite and a is not _NAC and a != instr.a:
+                instr.a = a
+                changes += 1
+            if op == 'copy':
+                define(instr.dest, a, pushed)
+                continue
+            b = value_of(instr.b)
+            if rewrite and b is not _NAC and b != instr.b:
+                instr.b = b
+                changes += 1
+            if a is _NAC or b is _NAC:
+                define(instr.dest, _NAC, pushed)
+                continue
+            folded = FOLD_OPERATORS[op](a, b)
+            define(instr.dest, folded, pushed)
+            if rewrite:
+                instr.op, instr.a, instr.b = 'copy', folded, None
+                changes += 1
+        value = value_of(block.value)
+        if rewrite and value is not _NAC and type(block.value) is str:
+            block.value = value
+            changes += 1
+        if block.kind == 'return' and on_return is not None:
+            on_return(block, values)
+        for target in block.targets:
+            names = phis.get(id(target))
+            if names:
+                inputs = incoming[id(target)]
+                for name in names:
+                    stack = values.get(name)
+                    if stack:
+                        inputs.setdefault(name, []).append(stack[-1])
+        pending.append((block, pushed))
+        pending.extend((child, None) for child in reversed(children[id(block)]))
+    return changes
+
+def constant_propagation(function):
+    """Reemplaza variables con valor constante conocido y pliega las operaciones; retorna los cambios"""
+    return _propagate(function, rewrite=True)
+
+def exit_constants(function):
+    """{variable global: valor} al terminar main, con None si el valor no es constante en todos los return"""
+    result = {}
+
+    def collect(block, values):
+        for name, source in function.globals.items():
+            stack = values.get(name)
+            if not stack:
+                continue    # declarada después de este return
+            value = None if stack[-1] is _NAC else stack[-1]
+            result[source] = value if result.get(source, value) == value else None
+
+    _propagate(function, rewrite=False, on_return=collect)
+    return result
+
+# ==================== DEAD BRANCH ELIMINATION ====================
+
+def dead_branch_elimination(function):
+    """if con condición constante -> salto; quita bloques inalcanzables y une bloques en línea recta"""
+    changes = 0
+    for block in function.blocks:
+        if block.kind == 'branch' and type(block.value) is int:
+            target = block.targets[0] if block.value else block.targets[1]
+            block.kind, block.value, block.targets = 'jump', None, [target]
+            changes += 1
+    reachable = function.reverse_postorder()
+    changes += len(function.blocks) - len(reachable)
+    # Bloques en el orden original (el de la entrada primero)
+    alive = {id(block) for block in reachable}
+    function.blocks = [block for block in function.blocks if id(block) in alive]
+    preds = function.predecessors()
+    merged = set()
+    for block in function.blocks:
+        if id(block) in merged:
+            continue
+        # Absorbe sucesores únicos cuyo único predecesor es este bloque
+        while block.kind == 'jump':
+            target = block.targets[0]
+            if target is function.entry or len(preds[id(target)]) != 1:
+                break
+            block.instrs += target.instrs
+            block.kind, block.value, block.targets = target.kind, target.value, target.targets
+            for successor in block.targets:
+                preds[id(successor)] = [block if pred is target else pred for pred in preds[id(successor)]]
+            merged.add(id(target))
+            changes += 1
+    function.blocks = [block for block in function.blocks if id(block) not in merged]
+    return changes
+
+# ==================== COMMON SUBEXPRESSION ELIMINATION ====================
+
+def common_subexpression_elimination(function):
+    """Numeración de valores local: a op b ya calculado en el bloque -> copia; propaga copias"""
+    changes = 0
+    for block in function.blocks:
+        available = {}  # (op, a, b) -> variable que tiene ese valor
+        copies = {}     # variable -> operando que tiene su mismo valor
+        uses = {}       # variable -> llaves de available y de copies que dependen de ella
+
+        def kill(name):
+            for key in uses.pop(name, ()):
+                if type(key) is tuple:
+                    available.pop(key, None)
+                else:
+                    copies.pop(key, None)
+            copies.pop(name, None)
+
+        def depends(key, *names):
+            for name in names:
+                if type(name) is str:
+                    uses.setdefault(name, []).append(key)
+
+        for instr in block.instrs:
+            op = instr.op
+            if op == 'print':
+                continue
+            a = copies.get(instr.a, instr.a) if type(instr.a) is str else instr.a
+            if a != instr.a:
+                instr.a = a
+                changes += 1
+            dest = instr.dest
+            if op == 'copy':
+                kill(dest)
+                if a != dest:
+                    copies[dest] = a
+                    depends(dest, a)
+                continue
+            b = copies.get(instr.b, instr.b) if type(instr.b) is str else instr.b
+            if b != instr.b:
+                instr.b = b
+                changes += 1
+            key = (op, a, b)
+            if op in COMMUTATIVE and repr(b) < repr(a):
+                key = (op, b, a)
+            holder = available.get(key)
+            kill(dest)
+            if holder is not None and holder != dest:
+                instr.op, instr.a, instr.b = 'copy', holder, None
+                copies[dest] = holder
+                depends(dest, holder)
+                changes += 1
+            elif dest not in (a, b):
+                available[key] = dest
+                depends(key, a, b, dest)
+        if type(block.value) is str and block.value in copies:
+            block.value = copies[block.value]
+            changes += 1
+    return changes
+
+# ==================== DEAD STORE ELIMINATION ====================
+
+def dead_store_elimination(function):
+    """Quita asignaciones cuyo valor no se lee después (las globales están vivas al terminar main)
+
+    Los conjuntos de variables vivas son bits de un int (un bit por variable), para
+    que programas con miles de bloques no guarden un set por bloque.
+    """
+    order = function.reverse_postorder()
+    bit = {}
+    for block in order:
+        for instr in block.instrs:
+            if instr.op != 'print':
+                for name in (instr.dest, instr.a, instr.b):
+                    if type(name) is str and name not in bit:
+                        bit[name] = 1 << len(bit)
+        if type(block.value) is str and block.value not in bit:
+            bit[block.value] = 1 << len(bit)
+    exit_live = 0
+    for name in function.globals:
+        exit_live |= bit.get(name, 0)
+    # Sin ciclos en el CFG basta una pasada en postorden
+    live_in = {}
+    for block in reversed(order):
+        live = _live_out(block, live_in, exit_live, bit)
+        for instr in reversed(block.instrs):
+            if instr.op != 'print':
+                live = _transfer_live(instr, live, bit)
+        live_in[id(block)] = live
+    changes = 0
+    for block in order:
+        live = _live_out(block, live_in, exit_live, bit)
+        kept = []
+        for instr in reversed(block.instrs):
+            if instr.op != 'print':
+                if not live & bit[instr.dest]:
+                    changes += 1
+                    continue
+                live = _transfer_live(instr, live, bit)
+            kept.append(instr)
+        kept.reverse()
+        block.instrs = kept
+    return changes
+
+def _transfer_live(instr, live, bit):
+    live &= ~bit[instr.dest]
+    if type(instr.a) is str:
+        live |= bit[instr.a]
+    if type(instr.b) is str:
+        live |= bit[instr.b]
+    return live
+
+def _live_out(block, live_in, exit_live, bit):
+    if block.kind == 'return':
+        live = exit_live
+    else:
+        live = 0
+        for target in block.targets:
+            live |= live_in[id(target)]
+    if type(block.value) is str:
+        live |= bit[block.value]
+    return live
+
+# ==================== PIPELINE ====================
+
+PASSES = (
+    ('constant_propagation', constant_propagation),
+    ('dead_branch_elimination', dead_branch_elimination),
+    ('common_subexpression_elimination', common_subexpression_elimination),
+    ('dead_store_elimination', dead_store_elimination),
+)
+
+def optimize(function, passes=PASSES, profiler=None, rounds=4):
+    """Aplica los pases en orden hasta que ninguno cambie nada (a lo más 'rounds' veces)
+
+    Con profiler (PROFILE_C.Profiler) cada pase se mide como la fase 'ir:<pase>'.
+    Retorna {pase: cambios hechos}.
+    """
+    totals = {name: 0 for name, _ in passes}
+    for _ in range(rounds):
+        round_changes = 0
+        for name, run in passes:
+            if profiler is not None:
+                with profiler.phase(f"ir:{name}"):
+                    changes = run(function)
+            else:
+                changes = run(function)
+            totals[name] += changes
+            round_changes += changes
+        if not round_changes:
+            break
+    return totals
+
+# ==================== IR INTERPRETER ====================
+
+def execute(function):
+    """Ejecuta el IR (para comprobar que los pases no cambian el resultado); VM_C.ExecutionResult"""
+    from VM_C import ExecutionResult
+    env = {}
+    output = []
+    block = function.entry
+    while True:
+        for instr in block.instrs:
+            op = instr.op
+            if op == 'print':
+                output.append(instr.a)
+                continue
+            a = env[instr.a] if type(instr.a) is str else instr.a
+            if op == 'copy':
+                env[instr.dest] = a
+            else:
+                b = env[instr.b] if type(instr.b) is str else instr.b
+                env[instr.dest] = FOLD_OPERATORS[op](a, b)
+        value = env[block.value] if type(block.value) is str else block.value
+        if block.kind == 'return':
+            break
+        if block.kind == 'jump':
+            block = block.targets[0]
+        else:
+            block = block.targets[0] if value else block.targets[1]
+    variables = {source: env[name] for name, source in function.globals.items() if name in env}
+    return ExecutionResult(value, output, variables)
@@ -7,109 +7,664 @@
 # 5. Urbano Meza Joseph Gael
 
 import ply.lex as lex
+from ply.lex import LexToken
+import codecs
+import glob
+import io
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+from array import array
+from contextlib import contextmanager
+from itertools import repeat
 
-erroresLEX = []
-
-# Tokens
-tokens = (
-    'INT', 'FLOAT', 'CHAR','DOUBLE', 'LONG', 'SHORT',   # Tipos de datos
-    'RETURN','IF', 'ELSE',  # KEYWORDS
-    'ID', 'NUMBER',
-    'PLUS', 'MINUS', 'TIMES', 'DIVIDE',
-    'GT', 'LT', 'EQUALS', 'IGUALS',
-    'LPAREN', 'RPAREN', 'LBRACE', 'RBRACE',
-    'SEMICOLON',
-    'PRINTF', 'STRING'
-)
-
-# KEYWORDS
-KEYWORDS = {}
-
-# Tipo
-def t_tipo(t):
-    r'int|float|char|double|long|short'
-    t.type = t.value.upper()  # Convertir a mayúsculas para tokens
-    return t
-
-t_PLUS    = r'\+'
-t_MINUS   = r'-'
-t_TIMES   = r'\*'
-t_DIVIDE  = r'/'
-t_EQUALS  = r'=='
-t_IGUALS  = r'='
-t_GT      = r'>'
-t_LT      = r'<'
-t_LPAREN  = r'\('
-t_RPAREN  = r'\)'
-t_LBRACE  = r'\{'
-t_RBRACE  = r'\}'
-t_SEMICOLON = r';'
-
-t_ignore = ' \t'
-
-def t_INT(t):
-    r'int|float|char'
-    return t
-
-def t_IF(t):
-    r'if'
-    return t
-
-def t_ELSE(t):
-    r'else'
-    return t
-
-def t_PRINTF(t):
-    r'printf'
-    return t
-
-def t_RETURN(t):
-    r'return'
-    return t
-
-def t_STRING(t):
-    r'"[^"\n]*"'
-    t.value = t.value[1:-1]  # Quita comillas
-    return t
-
-def t_ID(t):
-    r'[a-zA-Z_][a-zA-Z0-9_]*'
-    return t
-
-def t_NUMBER(t):
-    r'\d+'
-    t.value = int(t.value)
-    return t
-
-def t_newline(t):
-    r'\n+'
-    t.lexer.lineno += len(t.value)
-
-def t_HEADER(t):
-    r'\#include\s*(<[^>]+>|"[^"]+")'
-    pass
+import CACHE_C
+import SCANNER_C
 
-def t_error(t):
-    erroresLEX.append(f"Carácter ilegal '{t.value[0]}' en posición {t.lexpos}")
-    t.lexer.skip(1)
+# Tokens: los del perfil 'parser' de la tabla de reglas de SCANNER_C
+tokens = SCANNER_C.PARSER_TOKENS
+
+# KEYWORDS: se reconocen en t_ID buscando la palabra completa (así 'iffy' o
+# 'interval' son identificadores y no IF/INT seguidos de otro ID)
+KEYWORDS = SCANNER_C.PARSER_KEYWORDS
+
+# Reglas de PLY: se generan de los patrones del perfil 'parser' de SCANNER_C.RULES
+# (t_newline, t_word, t_number, t_string, t_header, t_symbol), los mismos de FastLexer
+globals().update(SCANNER_C.ply_rules('parser'))
+
+t_ignore = SCANNER_C.BLANKS
+
+# Caracteres que no pueden iniciar ningún token; una racha de ellos es un solo error
+ILLEGAL_RUN = SCANNER_C.ILLEGAL_RUN
 
-lexer = lex.lex()
+def t_error(t):
+    data = t.lexer.lexdata
+    # En modo streaming lexdata es solo un bloque: 'offset' es la posición de su inicio
+    length, message = SCANNER_C.illegal_run(data, t.lexpos, t.lexer.offset)
+    if t.lexer.errors.add(message):
+        t.lexer.skip(length)
+    else:
+        # Límite alcanzado: saltar al final para terminar el análisis
+        t.lexer.skip(len(data) - t.lexpos)
 
-def analyze_code(code):
-    """Analiza código y retorna tokens para el parser"""
-    lexer.input(code)
-    tokens_list = []
+class Diagnostics:
+    """Errores léxicos de un solo análisis, con un límite opcional de errores"""
+    def __init__(self, max_errors=None):
+        self.max_errors = max_errors
+        self.messages = []
+        self.aborted = False
+    
+    def add(self, message):
+        """Registra un error; retorna False si se alcanzó el límite y hay que detenerse"""
+        self.messages.append(message)
+        if self.max_errors is not None and len(self.messages) >= self.max_errors:
+            self.aborted = True
+        return not self.aborted
+    
+    def __len__(self):
+        return len(self.messages)
     
-    for tok in lexer:
-        tokens_list.append({
-            'type': tok.type,
-            'value': tok.value,
-            'lineno': tok.lineno,
-            'lexpos': tok.lexpos
-        })
+    def __iter__(self):
+        return iter(self.messages)
     
-    return tokens_list
+    def __getitem__(self, index):
+        return self.messages[index]
+
+# ==================== LEXER TABLE CACHE ====================
+
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def rules_signature():
+    """Hash de las reglas del lexer (tokens, expresiones regulares y su orden)"""
+    return SCANNER_C.rules_signature(globals())
+
+@contextmanager
+def table_output(directory=TABLE_DIR):
+    """Carpeta temporal donde PLY escribe sus tablas; al salir se mueven a 'directory' con os.replace
+
+    Varios procesos (p. ej. los workers de BATCH_C) importan los módulos al mismo
+    tiempo: ninguno lee una tabla a medio escribir. Si 'directory' no se puede
+    escribir, las tablas no se guardan.
+    """
+    try:
+        staging = tempfile.mkdtemp(prefix='.tables_', dir=directory)
+    except OSError:
+        staging = tempfile.mkdtemp(prefix='tables_')
+    try:
+        yield staging
+        for name in os.listdir(staging):
+            if name.endswith('.py'):
+                try:
+                    os.replace(os.path.join(staging, name), os.path.join(directory, name))
+                except OSError:
+                    pass
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+def build_lexer():
+    """Construye el lexer usando la tabla guardada (lextab_<hash>.py) si las reglas no cambiaron"""
+    lextab = f"lextab_{rules_signature()}"
+    table_file = os.path.join(TABLE_DIR, lextab + ".py")
+    if not os.path.exists(table_file):
+        # Las reglas cambiaron: borrar tablas viejas (no la nueva, que otro proceso
+        # pudo haber escrito mientras tanto); PLY genera la nueva
+        for stale in glob.glob(os.path.join(TABLE_DIR, "lextab_*.py")):
+            if stale != table_file:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+    with table_output() as outputdir:
+        return lex.lex(optimize=True, lextab=lextab, outputdir=outputdir)
+
+lexer = build_lexer()
+lexer.errors = Diagnostics()
+lexer.offset = 0
+
+# ==================== FAST BACKEND ====================
+
+# Las mismas reglas en una sola expresión regular: la del perfil 'parser' de la
+# tabla de SCANNER_C (un grupo por regla, con su acción en FAST_ACTIONS). Cada
+# alternativa empieza con un carácter distinto (solo '==' y '=' comparten, y '=='
+# va primero), así que el orden de las reglas de PLY no importa; los espacios se
+# saltan en el mismo match.
+FAST_PATTERN = SCANNER_C.ENGINE.patterns['parser']
+FAST_ACTIONS = SCANNER_C.ENGINE.actions['parser']
+IGNORED = SCANNER_C.IGNORED
+OPERATORS = SCANNER_C.PARSER_SYMBOLS
+
+class FastLexer:
+    """
+    Lexer alternativo a PLY con la misma interfaz (input, token, clone, skip,
+    lineno, lexpos, errors) y exactamente los mismos tokens y errores. Usa
+    FAST_PATTERN: un solo match por token y la palabra reservada se busca en
+    KEYWORDS después de reconocer el ID.
+    """
+    def __init__(self):
+        self.lexdata = ""
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+        self.errors = Diagnostics()
+        self.offset = 0
+        self._tokens = iter(())
+
+    def clone(self):
+        clone = FastLexer()
+        clone.errors = self.errors
+        clone.offset = self.offset
+        return clone
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self.lexlen = len(data)
+        self._tokens = self._scan()
+
+    def skip(self, n):
+        self.lexpos += n
+
+    def token(self):
+        return next(self._tokens, None)
+
+    def _scan(self):
+        # lexpos y lexlen se leen aquí (al pedir el primer token) para permitir ajustarlos
+        # después de input(), como hace INCREMENTAL_C con el lexer de PLY
+        data = self.lexdata
+        pos = self.lexpos
+        match = FAST_PATTERN.match
+        actions = FAST_ACTIONS
+        number = _NUMBER
+        newline, skip, word, symbol = SCANNER_C.NEWLINE, SCANNER_C.SKIP, SCANNER_C.WORD, SCANNER_C.SYMBOL
+        keywords = KEYWORDS
+        operators = OPERATORS
+        while pos < self.lexlen:
+            m = match(data, pos)
+            if m is None:
+                start = IGNORED.match(data, pos).end()
+                if start >= self.lexlen:
+                    self.lexpos = start
+                    return
+                # Mismo manejo de errores que PLY: t_error decide cuánto saltar
+                tok = LexToken()
+                tok.type, tok.value, tok.lineno, tok.lexpos = 'error', data[start], self.lineno, start
+                tok.lexer = self
+                self.lexpos = start
+                t_error(tok)
+                pos = self.lexpos
+                continue
+            group = m.lastindex
+            start = m.start(group)
+            if start >= self.lexlen:
+                self.lexpos = start
+                return
+            pos = self.lexpos = m.end()
+            action = actions[group]
+            if action is newline:
+                self.lineno += pos - start
+                continue
+            if action is skip:
+                continue  # HEADER
+            tok = LexToken()
+            tok.lineno = self.lineno
+            tok.lexpos = start
+            value = m.group(group)
+            if action is word:
+                tok.type = keywords.get(value, 'ID')
+                tok.value = value
+            elif action is symbol:
+                tok.type = operators[value]
+                tok.value = value
+            elif action == number:
+                tok.type = 'NUMBER'
+                tok.value = int(value)
+            else:
+                tok.type = 'STRING'
+                tok.value = value[1:-1]  # Quita comillas
+            yield tok
+
+LEXER_BACKENDS = ('ply', 'fast')
+
+def new_lexer(backend='ply'):
+    """Crea un lexer independiente (clone) con su propia lista de errores, para usar en otro hilo
+
+    backend: 'ply' (lexer generado por PLY) o 'fast' (FastLexer); producen los mismos tokens.
+    """
+    if backend not in LEXER_BACKENDS:
+        raise ValueError(f"Lexer desconocido: {backend!r} (opciones: {', '.join(LEXER_BACKENDS)})")
+    clone = lexer.clone() if backend == 'ply' else FastLexer()
+    clone.errors = Diagnostics()
+    clone.lineno = 1
+    clone.offset = 0
+    return clone
+
+def iter_tokens(code, lexer_obj=None, max_errors=None, chunk_size=None, encoding='utf-8'):
+    """Genera los LexToken de PLY uno a uno, sin materializar la lista.
+
+    'code' puede ser el código (str), un archivo abierto (texto o binario,
+    también un mmap) o bytes; los archivos y bytes se leen por bloques de
+    chunk_size caracteres (ver iter_chunks), así que la memoria no depende
+    del tamaño de la entrada.
+
+    Los errores de cada análisis se guardan en un Diagnostics nuevo
+    (lexer_obj.errors); con max_errors el análisis se detiene al llegar a N errores.
+    """
+    if lexer_obj is None:
+        lexer_obj = lexer
+    lexer_obj.errors = Diagnostics(max_errors)
+    lexer_obj.lineno = 1
+    lexer_obj.offset = 0
+    if not isinstance(code, str):
+        yield from _iter_stream_tokens(code, lexer_obj, chunk_size or CHUNK_SIZE, encoding)
+        return
+    lexer_obj.input(code)
+    while True:
+        tok = lexer_obj.token()
+        if tok is None:
+            return
+        yield tok
+
+def iter_file_tokens(path, lexer_obj=None, max_errors=None, chunk_size=None, encoding='utf-8'):
+    """iter_tokens sobre un archivo en disco, leído con mmap (sin cargarlo completo)"""
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return  # mmap no acepta archivos vacíos
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from iter_tokens(MappedReader(data), lexer_obj, max_errors, chunk_size, encoding)
+
+# ==================== STREAMING INPUT ====================
+
+# Caracteres por bloque al leer de un archivo
+CHUNK_SIZE = 1 << 20
+
+# Un '#include' sin terminar al final de un bloque (t_HEADER puede cruzar saltos de línea)
+OPEN_HEADER = re.compile(r'\#include\s*(<[^>]*|"[^"]*)?\Z')
+
+# Los segmentos se cortan después del último salto de línea que no esté dentro de un
+# #include. Una línea de más de MAX_LINE caracteres (código minificado, un binario)
+# se corta sin esperar el salto de línea: después de ';', '{', '}', '(' o ')', de
+# espacios o de una racha de caracteres ilegales. Nunca dentro de un STRING o un
+# #include: _safe_cut recorre el texto una sola vez, siguiendo desde donde terminó.
+MAX_LINE = 4 * CHUNK_SIZE
+CUTS = re.compile(r'[;{}()]|[ \t]+|' + ILLEGAL_RUN.pattern)
+QUOTE_OR_HEADER = re.compile(r'"|\#include')
+STRING = re.compile(r'"[^"\n]*"')
+OPEN_STRING = re.compile(r'"[^"\n]*\Z')
+HEADER = re.compile(SCANNER_C.HEADER)
+INCLUDE_PREFIX = len('#include') - 1
+
+def _safe_cut(text, start=0, line_end=0, forced=False):
+    """(corte, reanudar): dónde cortar text sin cambiar sus tokens (0 si no hay dónde)
+    y desde dónde seguir la revisión cuando llegue más texto.
+
+    text[:start] ya se revisó y start está fuera de un STRING o un #include. line_end
+    es la posición después del último salto de línea (0 si no hay); con forced
+    también se corta después de los caracteres de CUTS.
+    """
+    cut = 0
+    position = start
+    while True:
+        stop = QUOTE_OR_HEADER.search(text, position)
+        end = stop.start() if stop else len(text)
+        if position <= line_end <= end:
+            cut = line_end
+        if forced:
+            for m in CUTS.finditer(text, position, end):
+                # Un espacio o una racha ilegal al final del texto puede seguir en el siguiente bloque
+                if m.end() < len(text) or len(m.group()) == 1 and m.group() in ';{}()':
+                    cut = max(cut, m.end())
+        if stop is None:
+            # Un '#includ' partido al final se vuelve a revisar con el siguiente bloque
+            return cut, max(position, cut, len(text) - INCLUDE_PREFIX)
+        if stop.group() == '"':
+            closed = STRING.match(text, end)
+            undecided = closed is None and OPEN_STRING.match(text, end)
+        else:
+            closed = HEADER.match(text, end)
+            undecided = closed is None and OPEN_HEADER.match(text, end)
+        if undecided or closed and line_end > end and closed.end() > line_end:
+            # El token puede seguir en el siguiente bloque o cruza el salto de línea:
+            # se corta justo antes de él
+            if line_end > end:
+                cut = max(cut, end)
+            if undecided:
+                return cut, end
+        # Un STRING o #include completo se salta; si no lo es, el '"' o '#' es un error de un carácter
+        position = closed.end() if closed else end + 1
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    """
+    Genera el texto de un archivo (o bytes) por bloques.
+    Los bytes se decodifican de forma incremental (un carácter multibyte puede
+    quedar partido entre dos bloques) y los saltos '\r\n' se convierten a '\n',
+    igual que al leer un archivo en modo texto.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    read = source.read
+    decoder = None
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        if not isinstance(chunk, str):
+            if decoder is None:
+                decoder = io.IncrementalNewlineDecoder(
+                    codecs.getincrementaldecoder(encoding)(errors='replace'), translate=True)
+            chunk = decoder.decode(chunk)
+            if not chunk:
+                continue
+        yield chunk
+    if decoder is not None:
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+class MappedReader:
+    """Lectura secuencial de un mmap de solo lectura que libera las páginas ya leídas.
+
+    Sin esto las páginas del archivo quedan mapeadas y la RSS crece con el
+    tamaño del archivo aunque el lexer no guarde nada.
+    """
+    def __init__(self, data):
+        self.data = data
+        self.released = 0
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            data.madvise(mmap.MADV_SEQUENTIAL)
+
+    def read(self, size):
+        chunk = self.data.read(size)
+        done = self.data.tell() // mmap.PAGESIZE * mmap.PAGESIZE
+        if done > self.released and hasattr(mmap, 'MADV_DONTNEED'):
+            self.data.madvise(mmap.MADV_DONTNEED, self.released, done - self.released)
+            self.released = done
+        return chunk
+
+def _iter_stream_tokens(source, lexer_obj, chunk_size, encoding):
+    """
+    Lexea la entrada por segmentos que terminan en un salto de línea: ningún
+    token cruza un salto de línea (excepto un #include partido, que se deja
+    completo para el siguiente segmento). Una línea de más de MAX_LINE
+    caracteres se corta antes (_safe_cut). lexpos se corrige con la posición del
+    segmento y lineno sigue contando entre segmentos.
+    """
+    parts = []          # bloques leídos que aún no se lexean
+    size = 0            # caracteres en parts
+    scanned = 0         # hasta dónde revisó _safe_cut el texto de parts
+    retry = MAX_LINE    # tamaño a partir del cual se busca un corte forzado
+    offset = 0
+    errors = lexer_obj.errors
+    try:
+        chunks = iter_chunks(source, chunk_size, encoding)
+        while True:
+            chunk = next(chunks, None)
+            if chunk is None:
+                segment = "".join(parts)
+                parts = []
+            else:
+                parts.append(chunk)
+                size += len(chunk)
+                newline = chunk.rfind('\n')
+                if newline == -1 and size <= retry:
+                    continue  # línea incompleta: leer más
+                pending = "".join(parts)
+                line_end = size - len(chunk) + newline + 1 if newline != -1 else 0
+                cut, scanned = _safe_cut(pending, scanned, line_end, size > MAX_LINE)
+                scanned -= cut
+                # Sin dónde cortar (un token enorme) se vuelve a buscar cuando el texto se duplique
+                retry = MAX_LINE if cut or size <= MAX_LINE else 2 * size
+                parts = [pending[cut:]]
+                size -= cut
+                if not cut:
+                    continue
+                segment = pending[:cut]
+                del pending
+            if segment:
+                lexer_obj.offset = offset
+                lexer_obj.input(segment)
+                token = lexer_obj.token
+                while True:
+                    tok = token()
+                    if tok is None:
+                        break
+                    tok.lexpos += offset
+                    yield tok
+                offset += len(segment)
+            if chunk is None or errors.aborted:
+                return
+    finally:
+        lexer_obj.offset = 0
+
+def lex_tokens(code, lexer_obj=None, max_errors=None):
+    """Analiza código y retorna la lista de LexToken (se puede re-usar en el parser)"""
+    return list(iter_tokens(code, lexer_obj, max_errors))
+
+# Errores del último analyze_code / analyze_profiles de cada hilo (get_lexical_errors)
+_last_analysis = threading.local()
+
+def analyze_code(code, max_errors=None, cache=None, profiler=None):
+    """Analiza código y retorna los tokens en un TokenBuffer (token['type'], token['value'], ...)
+
+    Cada llamada lexea con su propio lexer (new_lexer), así que se puede llamar
+    desde varios hilos; sus errores quedan en get_lexical_errors() de ese hilo.
+    Con cache (un CACHE_C.ResultCache, o True para la caché compartida) un código
+    ya analizado no se vuelve a lexear: se recuperan sus columnas y sus errores.
+    Con profiler (PROFILE_C.Profiler) el análisis se mide como la fase 'lex'.
+    """
+    if profiler is not None:
+        with profiler.phase('lex'):
+            return analyze_code(code, max_errors, cache)
+    cache = CACHE_C.resolve(cache)
+    if cache is not None:
+        key = cache.key('analyze_code', code, max_errors)
+        found = cache.get(key)
+        if found is not None:
+            columns, messages, aborted = found
+            errors = _last_analysis.errors = Diagnostics(max_errors)
+            errors.messages = list(messages)
+            errors.aborted = aborted
+            return TokenBuffer.from_columns(code, columns)
+    lexer_obj = new_lexer()
+    buffer = TokenBuffer.from_code(code, lexer_obj, max_errors)
+    errors = _last_analysis.errors = lexer_obj.errors
+    if cache is not None:
+        cache.put(key, (buffer.columns(), tuple(errors), errors.aborted))
+    return buffer
+
+def analyze_profiles(code, max_errors=None):
+    """Un solo recorrido del código con los dos perfiles de SCANNER_C
+
+    Retorna (TokenBuffer, SCANNER_C.CategoryTokens): los tokens del parser (los
+    mismos que analyze_code, con sus errores en get_lexical_errors) y las
+    categorías del lexer de Lexer/LEX_C (category.report() es su reporte).
+    """
+    errors = _last_analysis.errors = Diagnostics(max_errors)
+    scanned = SCANNER_C.scan(code, errors=errors)
+    return TokenBuffer.from_scan(code, scanned['parser']), scanned['category']
 
 def get_lexical_errors():
-    """Retorna errores léxicos para reporte"""
-    return erroresLEX.copy()
\ No newline at end of file
+    """Copia de los errores léxicos del último analyze_code (o analyze_profiles) de este hilo"""
+    errors = getattr(_last_analysis, 'errors', None)
+    return list(errors) if errors is not None else []
+
+# ==================== TOKEN BUFFER ====================
+
+# Código numérico de cada tipo de token (índice en 'tokens')
+TOKEN_CODES = {name: code for code, name in enumerate(tokens)}
+_STRING = TOKEN_CODES['STRING']
+_NUMBER = TOKEN_CODES['NUMBER']
+
+class TokenBuffer:
+    """
+    Tokens en columnas en lugar de un dict por token: el tipo en un array('B')
+    y línea, posición y longitud en array('I'). El valor no se guarda: se
+    obtiene del código fuente (source[lexpos:lexpos + length]) al pedirlo.
+    buffer[i] retorna un TokenView que se usa igual que el dict anterior.
+    """
+    __slots__ = ('source', 'types', 'lineno', 'lexpos', 'length')
+
+    def __init__(self, source):
+        self.source = source
+        self.types = array('B')
+        self.lineno = array('I')
+        self.lexpos = array('I')
+        self.length = array('I')
+
+    @classmethod
+    def from_code(cls, code, lexer_obj=None, max_errors=None):
+        """Lexea el código (str) y guarda sus tokens"""
+        if lexer_obj is None:
+            lexer_obj = lexer
+        buffer = cls(code)
+        codes = TOKEN_CODES
+        add_type = buffer.types.append
+        add_line = buffer.lineno.append
+        add_pos = buffer.lexpos.append
+        add_length = buffer.length.append
+        for tok in iter_tokens(code, lexer_obj, max_errors):
+            # Mientras el generador está detenido en el token, lexer_obj.lexpos es su final
+            add_type(codes[tok.type])
+            add_line(tok.lineno)
+            add_pos(tok.lexpos)
+            add_length(lexer_obj.lexpos - tok.lexpos)
+        return buffer
+
+    @classmethod
+    def from_scan(cls, source, scanned):
+        """Usa las columnas de un SCANNER_C.ParserTokens (tienen el mismo formato)"""
+        buffer = cls(source)
+        buffer.types, buffer.lineno, buffer.lexpos, buffer.length = (
+            scanned.types, scanned.lineno, scanned.lexpos, scanned.length)
+        return buffer
+
+    def columns(self):
+        """Columnas como bytes (para guardarlas en una caché sin el código fuente)"""
+        return (self.types.tobytes(), self.lineno.tobytes(), self.lexpos.tobytes(), self.length.tobytes())
+
+    @classmethod
+    def from_columns(cls, source, columns):
+        """Reconstruye el buffer a partir de columns() y el mismo código fuente"""
+        buffer = cls(source)
+        for column, data in zip((buffer.types, buffer.lineno, buffer.lexpos, buffer.length), columns):
+            column.frombytes(data)
+        return buffer
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TokenView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        return TokenView(self, index)
+
+    def __iter__(self):
+        return map(TokenView, repeat(self), range(len(self.types)))
+
+    def type(self, index):
+        return tokens[self.types[index]]
+
+    def value(self, index):
+        """Valor del token como lo genera el lexer (sin comillas en STRING, int en NUMBER)"""
+        start = self.lexpos[index]
+        text = self.source[start:start + self.length[index]]
+        code = self.types[index]
+        if code == _STRING:
+            return text[1:-1]
+        if code == _NUMBER:
+            return int(text)
+        return text
+
+    def as_dicts(self):
+        """Lista de dicts {'type', 'value', 'lineno', 'lexpos'} (formato anterior de analyze_code)"""
+        return [view.as_dict() for view in self]
+
+class TokenView:
+    """Un token de un TokenBuffer; se lee como el dict anterior (token['type']) o como atributo"""
+    __slots__ = ('buffer', 'index')
+    FIELDS = ('type', 'value', 'lineno', 'lexpos')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self):
+        return tokens[self.buffer.types[self.index]]
+
+    @property
+    def value(self):
+        return self.buffer.value(self.index)
+
+    @property
+    def lineno(self):
+        return self.buffer.lineno[self.index]
+
+    @property
+    def lexpos(self):
+        return self.buffer.lexpos[self.index]
+
+    def __getitem__(self, key):
+        buffer = self.buffer
+        if key == 'type':
+            return tokens[buffer.types[self.index]]
+        if key == 'value':
+            return buffer.value(self.index)
+        if key == 'lineno':
+            return buffer.lineno[self.index]
+        if key == 'lexpos':
+            return buffer.lexpos[self.index]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, TokenView):
+            other = other.as_dict()
+        return self.as_dict() == other
+
+    def __repr__(self):
+        return f"TokenView({self.as_dict()!r})"
+
+# ==================== TOKEN STREAM ADAPTER ====================
+
+class TokenStream:
+    """Adaptador con la interfaz de lexer de PLY (token()) sobre tokens ya generados.
+
+    Acepta una lista (re-uso del primer análisis) o un generador como
+    iter_tokens(code) (modo perezoso: se lexea mientras el parser consume).
+    """
+    def __init__(self, tokens):
+        self._tokens = iter(tokens)
+        self.count = 0
+
+    def input(self, data):
+        raise TypeError("TokenStream ya contiene sus tokens; use parser.parse(lexer=stream)")
+
+    def token(self):
+        tok = next(self._tokens, None)
+        if tok is not None:
+            self.count += 1
+        return tok
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
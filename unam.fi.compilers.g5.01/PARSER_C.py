@@ -7,8 +7,19 @@
 # 5. Urbano Meza Joseph Gael
 
 import ply.yacc as yacc
-from LEX_C import tokens, analyze_code, get_lexical_errors
+from ply.lex import LexToken
+import CACHE_C
+from PROFILE_C import Profiler
+from LEX_C import tokens, iter_tokens, new_lexer, table_output, Diagnostics, TokenStream
+from AST_C import (Node, NODE_CLASSES, to_rows, from_rows, Program, Tipo, Declaration, InvalidDeclaration, Assignment,
+                   InvalidAssignment, BinOp, Number, Id, InvalidId, If, Else, Printf, Return)
+import copy
+import io
+import json
+import operator
 import os
+import threading
+from itertools import chain, islice
 try:
     from graphviz import Digraph
     GRAPHVIZ_AVAILABLE = True
@@ -17,38 +28,115 @@ except ImportError:
 
 # ==================== SDT - SEMANTIC ANALYSIS ====================
 
+class Symbol:
+    """Registro de un símbolo (con __slots__: sin un dict por entrada)"""
+    __slots__ = ('name', 'type', 'value', 'depth', 'shadowed')
+    
+    def __init__(self, name, type, value=None, depth=0, shadowed=None):
+        self.name = name
+        self.type = type
+        self.value = value
+        self.depth = depth          # nivel del scope donde se declaró (0 = global)
+        self.shadowed = shadowed    # símbolo del mismo nombre que este oculta, o None
+    
+    def __repr__(self):
+        return f"Symbol({self.name!r}, {self.type!r}, {self.value!r}, depth={self.depth})"
+
 class SymbolTable:
-    """Tabla de símbolos para análisis semántico"""
+    """Tabla de símbolos con scopes anidados para análisis semántico
+
+    Cada identificador se interna a un entero; _bindings[id] es el símbolo
+    visible con ese nombre (el del scope más interno) y su campo 'shadowed'
+    apunta al que oculta. Cada scope abierto solo guarda los ids que declaró:
+    entrar a un scope es O(1) y salir cuesta lo que se declaró en él.
+    """
     def __init__(self):
-        self.symbols = {}
+        self._ids = {}          # nombre -> id
+        self._names = []        # id -> nombre
+        self._bindings = []     # id -> Symbol visible o None
+        self._frames = [[]]     # ids declarados en cada scope abierto (el primero es el global)
+        self.scoped = []        # símbolos de los scopes que ya se cerraron, para el reporte
+    
+    def intern(self, name):
+        """Id entero del identificador (el mismo nombre siempre da el mismo id)"""
+        ident = self._ids.get(name)
+        if ident is None:
+            ident = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._bindings.append(None)
+        return ident
+    
+    @property
+    def depth(self):
+        """Nivel del scope actual (0 = global)"""
+        return len(self._frames) - 1
+    
+    def enter_scope(self):
+        """Abre un scope anidado (bloque { })"""
+        self._frames.append([])
+    
+    def exit_scope(self):
+        """Cierra el scope actual; sus símbolos dejan de ser visibles"""
+        if len(self._frames) == 1:
+            raise SemanticError("No hay un scope abierto para cerrar")
+        bindings = self._bindings
+        for ident in self._frames.pop():
+            symbol = bindings[ident]
+            bindings[ident] = symbol.shadowed
+            symbol.shadowed = None
+            self.scoped.append(symbol)
     
     def add_symbol(self, name, type, value=None):
-        """Añade símbolo a la tabla"""
-        if name in self.symbols:
+        """Añade símbolo al scope actual; puede ocultar uno de un scope exterior"""
+        bindings = self._bindings
+        ident = self._ids.get(name)
+        if ident is None:
+            ident = self.intern(name)
+        visible = bindings[ident]
+        frames = self._frames
+        depth = len(frames) - 1
+        if visible is not None and visible.depth == depth:
             raise SemanticError(f"Variable '{name}' ya está declarada")
-        self.symbols[name] = {'type': type, 'value': value}
+        symbol = bindings[ident] = Symbol(name, type, value, depth, visible)
+        frames[-1].append(ident)
+        return symbol
+    
+    def lookup(self, name):
+        """Símbolo visible con ese nombre, o None"""
+        ident = self._ids.get(name)
+        return self._bindings[ident] if ident is not None else None
     
     def get_symbol(self, name):
-        """Obtiene símbolo de la tabla"""
-        if name not in self.symbols:
+        """Obtiene el símbolo visible con ese nombre"""
+        ident = self._ids.get(name)
+        symbol = self._bindings[ident] if ident is not None else None
+        if symbol is None:
             raise SemanticError(f"Variable '{name}' no declarada")
-        return self.symbols[name]
+        return symbol
     
     def update_symbol(self, name, value):
         """Actualiza valor de símbolo"""
-        if name not in self.symbols:
-            raise SemanticError(f"Variable '{name}' no declarada")
-        self.symbols[name]['value'] = value
+        self.get_symbol(name).value = value
+    
+    @property
+    def symbols(self):
+        """Símbolos visibles en orden de declaración: {nombre: Symbol}"""
+        names = self._names
+        bindings = self._bindings
+        return {names[ident]: bindings[ident] for frame in self._frames for ident in frame}
 
 class SemanticError(Exception):
     """Excepción para errores semánticos"""
     pass
 
+class AnalysisCancelled(Exception):
+    """El análisis se canceló con AnalysisSession.cancel() antes de terminar"""
+    pass
+
 # ==================== GRAMMAR + SDT RULES ====================
 
-symbol_table = SymbolTable()
-semantic_errors = []
-parsing_success = False
+# Las acciones semánticas trabajan sobre la sesión del parser que las ejecuta
+# (p.parser.session), nunca sobre estado global del módulo.
 
 # Precedence rules para resolver ambigüedades
 precedence = (
@@ -59,24 +147,28 @@ precedence = (
 
 def p_program(p):
     'program : INT ID LPAREN RPAREN LBRACE statements RBRACE'
+    session = p.parser.session
     # SDT: Verificar que sea función main
     if p[2] != 'main':
-        semantic_errors.append("Error semántico: El programa debe contener una función 'main'")
+        session.semantic_errors.append("Error semántico: El programa debe contener una función 'main'")
     else:
         # SDT: Añadir main a la tabla de símbolos
-        symbol_table.add_symbol('main', 'function')
+        session.symbol_table.add_symbol('main', 'function')
     
-    p[0] = ('program', p[6])
-    global parsing_success
-    parsing_success = True
+    p[0] = Program(p[6], p.lineno(1), p.lexpos(1))
+    # Con recuperación de errores el programa puede reducirse aunque hubo errores de sintaxis
+    session.parsing_success = not session.syntax_errors
 
 def p_statements(p):
     '''statements : statements statement
                   | statement'''
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        # Se agrega sobre la misma lista (copiarla en cada sentencia era O(n²))
+        if p[2] is not None:
+            p[1].append(p[2])
+        p[0] = p[1]
     else:
-        p[0] = [p[1]]
+        p[0] = [p[1]] if p[1] is not None else []
 
 def p_statement_declaration(p):
     'statement : declaration'
@@ -98,41 +190,53 @@ def p_statement_return(p):
     'statement : return_statement'
     p[0] = p[1]
 
+def p_statement_error(p):
+    '''statement : error SEMICOLON
+                 | error scope_open statements scope_close
+                 | error'''
+    # Recuperación en modo pánico: se descartan tokens hasta ';', hasta un bloque { }
+    # (p. ej. un 'else' sin if; el bloque se analiza con su propio scope) o hasta algo
+    # que pueda seguir a una sentencia (otra sentencia o la '}' del bloque actual).
+    # El error ya quedó registrado en AnalysisSession.syntax_error; no entra al árbol.
+    p[0] = None
+
 # ==================== DECLARATIONS WITH SDT ====================
 
 def p_declaration(p):
     'declaration : tipo ID SEMICOLON'
+    session = p.parser.session
     # SDT: Añadir variable a tabla de símbolos
     try:
-        symbol_table.add_symbol(p[2], p[1])
-        p[0] = ('declaration', p[1], p[2])
+        session.symbol_table.add_symbol(p[2], p[1].name)
+        p[0] = Declaration(p[1], p[2], p.lineno(1), p.lexpos(1))
     except SemanticError as e:
-        semantic_errors.append(str(e))
-        p[0] = ('declaration_error', p[1], p[2])
+        session.semantic_errors.append(str(e))
+        p[0] = InvalidDeclaration(p[1], p[2], p.lineno(1), p.lexpos(1))
 
 def p_tipo(p):
     '''tipo : INT
             | FLOAT
             | CHAR'''
-    p[0] = ('tipo', p[1])
+    p[0] = Tipo(p[1], p.lineno(1), p.lexpos(1))
 
 # ==================== ASSIGNMENTS WITH SDT ====================
 
 def p_assignment(p):
     'assignment : ID IGUALS expression SEMICOLON'
+    session = p.parser.session
     # SDT: Verificar que variable esté declarada
     try:
-        var_info = symbol_table.get_symbol(p[1])
+        var_info = session.symbol_table.get_symbol(p[1])
         
-        # Evaluar expresión para SDT
-        expr_result = evaluate_expression(p[3])
+        # SDT: el valor de la expresión ya se calculó al reducirla (constant folding)
+        expr_result = p[3].folded
         if expr_result is not None:
-            symbol_table.update_symbol(p[1], expr_result)
+            session.symbol_table.update_symbol(p[1], expr_result)
         
-        p[0] = ('assignment', p[1], p[3])
+        p[0] = Assignment(p[1], p[3], p.lineno(1), p.lexpos(1))
     except SemanticError as e:
-        semantic_errors.append(str(e))
-        p[0] = ('assignment_error', p[1], p[3])
+        session.semantic_errors.append(str(e))
+        p[0] = InvalidAssignment(p[1], p[3], p.lineno(1), p.lexpos(1))
 
 def p_expression_binop(p):
     '''expression : expression PLUS expression
@@ -142,7 +246,14 @@ def p_expression_binop(p):
                   | expression GT expression
                   | expression LT expression
                   | expression EQUALS expression'''
-    p[0] = ('binop', p[2], p[1], p[3])
+    # Constant folding: los operandos ya traen su valor, cada nodo se evalúa una vez
+    left, right = p[1].folded, p[3].folded
+    if left is None or right is None:
+        folded = None
+    else:
+        fold = FOLD_OPERATORS.get(p[2])
+        folded = fold(left, right) if fold is not None else None
+    p[0] = BinOp(p[2], p[1], p[3], p.lineno(2), p.lexpos(2), folded)
 
 def p_expression_group(p):
     'expression : LPAREN expression RPAREN'
@@ -150,51 +261,262 @@ def p_expression_group(p):
 
 def p_expression_number(p):
     'expression : NUMBER'
-    p[0] = ('number', p[1])
+    p[0] = Number(p[1], p.lineno(1), p.lexpos(1))
 
 def p_expression_id(p):
     'expression : ID'
+    session = p.parser.session
     # SDT: Verificar que variable exista
     try:
-        var_info = symbol_table.get_symbol(p[1])
-        p[0] = ('id', p[1])
+        var_info = session.symbol_table.get_symbol(p[1])
+        # Propagación de constantes: el valor actual de la variable (None si no tiene)
+        p[0] = Id(p[1], p.lineno(1), p.lexpos(1), var_info.value)
     except SemanticError as e:
-        semantic_errors.append(str(e))
-        p[0] = ('id_error', p[1])
+        session.semantic_errors.append(str(e))
+        p[0] = InvalidId(p[1], p.lineno(1), p.lexpos(1))
 
 # ==================== CONTROL STRUCTURES ====================
 
 def p_if_statement(p):
-    '''if_statement : IF LPAREN expression RPAREN LBRACE statements RBRACE
-                    | IF LPAREN expression RPAREN LBRACE statements RBRACE ELSE LBRACE statements RBRACE'''
-    if len(p) == 8:  # Sin else
-        p[0] = ('if', p[3], p[6], None)
-    else:  # Con else (11 elementos)
-        p[0] = ('if', p[3], p[6], ('else', p[10]))
+    '''if_statement : IF condition scope_open statements scope_close
+                    | IF condition scope_open statements scope_close ELSE scope_open statements scope_close'''
+    if len(p) == 6:  # Sin else
+        p[0] = If(p[2], p[4], None, p.lineno(1), p.lexpos(1))
+    else:  # Con else (9 elementos)
+        p[0] = If(p[2], p[4], Else(p[8], p.lineno(6), p.lexpos(6)), p.lineno(1), p.lexpos(1))
+
+def p_condition(p):
+    'condition : LPAREN expression RPAREN'
+    p[0] = p[2]
+
+def p_condition_error(p):
+    'condition : LPAREN error RPAREN'
+    # Condición inválida: se re-sincroniza en ')' y el bloque del if se analiza normalmente
+    p[0] = None
+
+def p_scope_open(p):
+    'scope_open : LBRACE'
+    # SDT: cada bloque { } abre un scope; sus declaraciones no salen del bloque
+    p.parser.session.symbol_table.enter_scope()
+
+def p_scope_close(p):
+    'scope_close : RBRACE'
+    p.parser.session.symbol_table.exit_scope()
 
 def p_printf_statement(p):
     'printf_statement : PRINTF LPAREN STRING RPAREN SEMICOLON'
-    p[0] = ('printf', p[3])
+    p[0] = Printf(p[3], p.lineno(1), p.lexpos(1))
 
 def p_return_statement(p):
     '''return_statement : RETURN expression SEMICOLON
                         | RETURN SEMICOLON'''
     if len(p) == 4:
-        p[0] = ('return', p[2])
+        p[0] = Return(p[2], p.lineno(1), p.lexpos(1))
     else:
-        p[0] = ('return', None)
+        p[0] = Return(None, p.lineno(1), p.lexpos(1))
 
 def p_error(p):
-    global parsing_success
-    parsing_success = False
-    if p:
-        error_msg = f"Error de sintaxis cerca de '{p.value}' (tipo: {p.type}) en línea {p.lineno}"
-    else:
-        error_msg = "Error de sintaxis: código incompleto o final inesperado"
-    semantic_errors.append(error_msg)
+    # Cada AnalysisSession instala su propio manejador (AnalysisSession.syntax_error),
+    # porque con p = None (fin de archivo) no hay forma de llegar a la sesión desde aquí.
+    pass
 
 # ==================== PARSE TREE VISUALIZATION ====================
 
+def tree_graph(result):
+    """Convierte el árbol en nodos (id, etiqueta, forma, color) y aristas (padre, hijo)
+
+    Usa una pila explícita (como write_parse_tree), así que una expresión larga
+    no llega al límite de recursión. Los ids siguen el orden del recorrido en preorden.
+    """
+    nodes = []
+    edges = []
+    # Acciones pendientes: (nodo del árbol, padre) o (etiqueta, forma, color, padre, hijos) para
+    # los nodos que solo existen en el dibujo ('condición', 'cuerpo if', 'id: x', ...)
+    stack = [(result, None)]
+    
+    def add_node(label, shape, fillcolor, parent):
+        node_id = str(len(nodes))
+        nodes.append((node_id, label, shape, fillcolor))
+        if parent:
+            edges.append((parent, node_id))
+        return node_id
+    
+    while stack:
+        action = stack.pop()
+        if len(action) == 5:
+            label, shape, fillcolor, parent, children = action
+            current_id = add_node(label, shape, fillcolor, parent)
+            stack.extend((child, current_id) for child in reversed(children))
+            continue
+        node, parent = action
+        if node is None:
+            continue
+        if isinstance(node, list):
+            stack.extend((item, parent) for item in reversed(node))
+            continue
+        if not isinstance(node, (tuple, Node)):
+            add_node(str(node), 'oval', 'white', parent)
+            continue
+        
+        # TRADUCCIÓN A ESPAÑOL Y FORMATEO MEJORADO
+        node_type = node[0]
+        if node_type == 'program':
+            current_id = add_node('programa', 'ellipse', 'lightgreen', parent)
+            follow = [(stmt, current_id) for stmt in node[1]]
+        elif node_type == 'declaration':
+            current_id = add_node('declaracion', 'box', 'lightyellow', parent)
+            follow = [(node[1], current_id), (f'id: {node[2]}', 'oval', 'lightcoral', current_id, ())]
+        elif node_type == 'assignment':
+            current_id = add_node('asignacion', 'box', 'lightyellow', parent)
+            follow = [(f'id: {node[1]}', 'oval', 'lightcoral', current_id, ()), (node[2], current_id)]
+        elif node_type == 'if':
+            current_id = add_node('if', 'diamond', 'orange', parent)
+            follow = [('condición', 'ellipse', 'lightpink', current_id, (node[1],)),
+                      ('cuerpo if', 'ellipse', 'lightcyan', current_id, node[2])]
+            if node[3] is not None:  # node[3] es ('else', statements)
+                follow.append(('cuerpo else', 'ellipse', 'lightcyan', current_id, node[3][1]))
+        elif node_type == 'binop':
+            current_id = add_node(node[1], 'circle', 'lightgray', parent)
+            follow = [(node[2], current_id), (node[3], current_id)]  # izquierda, derecha
+        elif node_type == 'tipo':
+            add_node(f'tipo: {node[1]}', 'oval', 'lightgreen', parent)
+            continue
+        elif node_type == 'number':
+            add_node(f'num: {node[1]}', 'oval', 'white', parent)
+            continue
+        elif node_type == 'id':
+            add_node(f'id: {node[1]}', 'oval', 'lightcoral', parent)
+            continue
+        elif node_type == 'printf':
+            current_id = add_node('printf', 'box', 'lightyellow', parent)
+            follow = [(f'"{node[1]}"', 'note', 'white', current_id, ())]
+        elif node_type == 'return':
+            current_id = add_node('return', 'box', 'lightyellow', parent)
+            follow = [(node[1], current_id)]
+        else:
+            # Nodo genérico
+            current_id = add_node(str(node_type), 'ellipse', 'lightblue', parent)
+            follow = [(child, current_id) for child in node[1:]]
+        stack.extend(reversed(follow))
+    return nodes, edges
+
+class SyntaxTreeImage:
+    """Árbol sintáctico listo para dibujarse; no se genera nada hasta que se pide.
+
+    to_dot() y to_svg() producen texto sin ejecutar el programa 'dot' de Graphviz.
+    render() usa Graphviz: con filename escribe el archivo, sin él retorna los bytes.
+    """
+    def __init__(self, result):
+        self.result = result
+        self._graph = None
+    
+    @property
+    def graph(self):
+        if self._graph is None:
+            self._graph = tree_graph(self.result)
+        return self._graph
+    
+    def to_dot(self):
+        """Código DOT del árbol (mismos estilos que la imagen)"""
+        nodes, edges = self.graph
+        
+        def quote(text):
+            return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"') + '"'
+        
+        lines = ["// Árbol Sintáctico", "digraph {",
+                 '\trankdir=TB size="10,8"',
+                 '\tnode [fillcolor=lightblue fontname=Arial fontsize=12 shape=ellipse style=filled]',
+                 '\tedge [arrowsize=0.8]']
+        for node_id, label, shape, fillcolor in nodes:
+            lines.append(f"\t{node_id} [label={quote(label)} fillcolor={fillcolor} shape={shape}]")
+        for parent, child in edges:
+            lines.append(f"\t{parent} -> {child}")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+    
+    def to_svg(self):
+        """SVG del árbol con un acomodo propio por niveles (no requiere Graphviz)"""
+        nodes, edges = self.graph
+        if not nodes:
+            return '<svg xmlns="http://www.w3.org/2000/svg" width="0" height="0"></svg>\n'
+        children = {node_id: [] for node_id, _, _, _ in nodes}
+        has_parent = set()
+        for parent, child in edges:
+            children[parent].append(child)
+            has_parent.add(child)
+        info = {node_id: (label, shape, fillcolor) for node_id, label, shape, fillcolor in nodes}
+        
+        # Hojas de izquierda a derecha; cada padre queda centrado sobre sus hijos
+        node_h, level_h, gap = 36, 70, 12
+        width = {node_id: max(44, 8 * len(label) + 20) for node_id, (label, _, _) in info.items()}
+        x, y = {}, {}
+        cursor = 0
+        roots = [node_id for node_id, _, _, _ in nodes if node_id not in has_parent]
+        stack = [(root, 0, False) for root in reversed(roots)]
+        while stack:
+            node_id, depth, done = stack.pop()
+            y[node_id] = 20 + depth * level_h
+            kids = children[node_id]
+            if not kids:
+                x[node_id] = cursor + width[node_id] / 2
+                cursor += width[node_id] + gap
+            elif done:
+                x[node_id] = (x[kids[0]] + x[kids[-1]]) / 2
+            else:
+                stack.append((node_id, depth, True))
+                stack.extend((kid, depth + 1, False) for kid in reversed(kids))
+        
+        def escape(text):
+            return str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+        
+        total_w = max(cursor - gap, 1) + 20
+        total_h = max(y.values()) + node_h + 20
+        out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{total_w:.0f}" height="{total_h}" '
+               f'font-family="Arial" font-size="12">']
+        for parent, child in edges:
+            out.append(f'<line x1="{x[parent] + 10:.1f}" y1="{y[parent] + node_h}" '
+                       f'x2="{x[child] + 10:.1f}" y2="{y[child]}" stroke="black"/>')
+        for node_id, (label, shape, fillcolor) in info.items():
+            cx, top, w = x[node_id] + 10, y[node_id], width[node_id]
+            cy = top + node_h / 2
+            if shape in ('box', 'note'):
+                out.append(f'<rect x="{cx - w / 2:.1f}" y="{top}" width="{w}" height="{node_h}" '
+                           f'fill="{fillcolor}" stroke="black"/>')
+            elif shape == 'diamond':
+                out.append(f'<polygon points="{cx:.1f},{top} {cx + w / 2:.1f},{cy} {cx:.1f},{top + node_h} '
+                           f'{cx - w / 2:.1f},{cy}" fill="{fillcolor}" stroke="black"/>')
+            elif shape == 'circle':
+                out.append(f'<circle cx="{cx:.1f}" cy="{cy}" r="{node_h / 2}" fill="{fillcolor}" stroke="black"/>')
+            else:
+                out.append(f'<ellipse cx="{cx:.1f}" cy="{cy}" rx="{w / 2}" ry="{node_h / 2}" '
+                           f'fill="{fillcolor}" stroke="black"/>')
+            out.append(f'<text x="{cx:.1f}" y="{cy + 4}" text-anchor="middle">{escape(label)}</text>')
+        out.append('</svg>')
+        return "\n".join(out) + "\n"
+    
+    def to_digraph(self):
+        """Objeto Digraph de Graphviz con el árbol"""
+        if not GRAPHVIZ_AVAILABLE:
+            raise RuntimeError("Graphviz no está instalado")
+        dot = Digraph(comment='Árbol Sintáctico')
+        dot.attr(rankdir='TB', size='10,8')  # Top to Bottom, tamaño más grande
+        dot.attr('node', shape='ellipse', style='filled', fillcolor='lightblue', 
+                fontname='Arial', fontsize='12')
+        dot.attr('edge', arrowsize='0.8')
+        nodes, edges = self.graph
+        for node_id, label, shape, fillcolor in nodes:
+            dot.node(node_id, label, shape=shape, fillcolor=fillcolor)
+        for parent, child in edges:
+            dot.edge(parent, child)
+        return dot
+    
+    def render(self, filename=None, format='jpg'):
+        """Dibuja con Graphviz: escribe filename.<format> y retorna su ruta, o retorna los bytes si no hay filename"""
+        dot = self.to_digraph()
+        if filename is None:
+            return dot.pipe(format=format)
+        return dot.render(filename, format=format, cleanup=True)
+
 def generate_syntax_tree_image(result, filename="arbol_sintactico"):
     """Genera una imagen JPG del árbol sintáctico usando Graphviz - VERSIÓN MEJORADA"""
     if not GRAPHVIZ_AVAILABLE:
@@ -204,179 +526,81 @@ def generate_syntax_tree_image(result, filename="arbol_sintactico"):
         return "No se pudo generar el árbol sintáctico (resultado vacío)"
     
     try:
-        # Crear el gráfico
-        dot = Digraph(comment='Árbol Sintáctico')
-        dot.attr(rankdir='TB', size='10,8')  # Top to Bottom, tamaño más grande
-        dot.attr('node', shape='ellipse', style='filled', fillcolor='lightblue', 
-                fontname='Arial', fontsize='12')
-        dot.attr('edge', arrowsize='0.8')
-        
-        node_counter = [0]
-        
-        def add_node(label, shape='ellipse', fillcolor='lightblue'):
-            node_id = str(node_counter[0])
-            node_counter[0] += 1
-            dot.node(node_id, label, shape=shape, fillcolor=fillcolor)
-            return node_id
-        
-        def add_nodes_edges(node, parent=None):
-            if node is None:
-                return None
-                
-            if isinstance(node, tuple):
-                node_type = node[0]
-                
-                # TRADUCCIÓN A ESPAÑOL Y FORMATEO MEJORADO
-                if node_type == 'program':
-                    current_id = add_node('programa', 'ellipse', 'lightgreen')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    # Procesar statements
-                    for stmt in node[1]:
-                        add_nodes_edges(stmt, current_id)
-                    return current_id
-                    
-                elif node_type == 'declaration':
-                    current_id = add_node('declaracion', 'box', 'lightyellow')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    # tipo
-                    tipo_id = add_nodes_edges(node[1], current_id)
-                    # ID
-                    id_id = add_node(f'id: {node[2]}', 'oval', 'lightcoral')
-                    dot.edge(current_id, id_id)
-                    return current_id
-                    
-                elif node_type == 'assignment':
-                    current_id = add_node('asignacion', 'box', 'lightyellow')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    # ID
-                    id_id = add_node(f'id: {node[1]}', 'oval', 'lightcoral')
-                    dot.edge(current_id, id_id)
-                    # expresión
-                    add_nodes_edges(node[2], current_id)
-                    return current_id
-                    
-                elif node_type == 'if':
-                    current_id = add_node('if', 'diamond', 'orange')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    # condición
-                    cond_id = add_node('condición', 'ellipse', 'lightpink')
-                    dot.edge(current_id, cond_id)
-                    add_nodes_edges(node[1], cond_id)
-                    # statements if
-                    if_body_id = add_node('cuerpo if', 'ellipse', 'lightcyan')
-                    dot.edge(current_id, if_body_id)
-                    for stmt in node[2]:
-                        add_nodes_edges(stmt, if_body_id)
-                    # else si existe
-                    if node[3] is not None:
-                        else_body_id = add_node('cuerpo else', 'ellipse', 'lightcyan')
-                        dot.edge(current_id, else_body_id)
-                        for stmt in node[3][1]:  # node[3] es ('else', statements)
-                            add_nodes_edges(stmt, else_body_id)
-                    return current_id
-                    
-                elif node_type == 'binop':
-                    operator = node[1]
-                    current_id = add_node(operator, 'circle', 'lightgray')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    add_nodes_edges(node[2], current_id)  # izquierda
-                    add_nodes_edges(node[3], current_id)  # derecha
-                    return current_id
-                    
-                elif node_type == 'tipo':
-                    current_id = add_node(f'tipo: {node[1]}', 'oval', 'lightgreen')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    return current_id
-                    
-                elif node_type == 'number':
-                    current_id = add_node(f'num: {node[1]}', 'oval', 'white')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    return current_id
-                    
-                elif node_type == 'id':
-                    current_id = add_node(f'id: {node[1]}', 'oval', 'lightcoral')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    return current_id
-                    
-                elif node_type == 'printf':
-                    current_id = add_node('printf', 'box', 'lightyellow')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    string_id = add_node(f'"{node[1]}"', 'note', 'white')
-                    dot.edge(current_id, string_id)
-                    return current_id
-                    
-                elif node_type == 'return':
-                    current_id = add_node('return', 'box', 'lightyellow')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    if node[1] is not None:
-                        add_nodes_edges(node[1], current_id)
-                    return current_id
-                    
-                else:
-                    # Nodo genérico
-                    current_id = add_node(str(node_type), 'ellipse', 'lightblue')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    for child in node[1:]:
-                        add_nodes_edges(child, current_id)
-                    return current_id
-                    
-            elif isinstance(node, list):
-                for item in node:
-                    add_nodes_edges(item, parent)
-                return None
-                
-            else:
-                if node is not None:
-                    current_id = add_node(str(node), 'oval', 'white')
-                    if parent:
-                        dot.edge(parent, current_id)
-                    return current_id
-            return None
-        
-        # Construir el árbol
-        add_nodes_edges(result)
-        
-        # Guardar como JPG
-        dot.render(filename, format='jpg', cleanup=True)
+        SyntaxTreeImage(result).render(filename, format='jpg')
         return f"Imagen del árbol sintáctico generada: {filename}.jpg"
         
     except Exception as e:
         return f"Error generando la imagen del árbol: {str(e)}"
 
+def write_parse_tree(result, out, chunk_lines=8192):
+    """Escribe el parse tree en out (cualquier objeto con write, p. ej. un archivo o io.StringIO).
+
+    Usa una pila explícita en lugar de recursión: no depende del límite de
+    recursión de Python, el tiempo es lineal en el tamaño de la salida y las
+    listas de sentencias se recorren con un iterador, así que la memoria no
+    crece con el número de sentencias. Las líneas se escriben por bloques.
+    """
+    write = out.write
+    lines = []
+    add = lines.append
+    indents = ["  " * i for i in range(64)]
+    stack = [(result, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, level = pop()
+        kind = type(node)
+        if kind is _LIST_ITERATOR:
+            child = next(node, _END)
+            if child is _END:
+                continue
+            push((node, level))
+            node = child
+            kind = type(node)
+        if level + 1 >= len(indents):
+            indents.extend("  " * i for i in range(len(indents), level + 64))
+        if kind is list:
+            push((iter(node), level))
+            continue
+        if kind is tuple:
+            add(f"{indents[level]}{node[0]}\n")
+            children = node[1:]
+        elif kind in NODE_CLASSES:
+            add(f"{indents[level]}{node.kind}\n")
+            children = node.values()
+        else:
+            add(f"{indents[level]}{node}\n")
+            continue
+        # Las hojas se escriben directo; solo los hijos compuestos van a la pila
+        level += 1
+        pending = None
+        for child in children:
+            if pending is None and type(child) not in _COMPOUND:
+                add(f"{indents[level]}{child}\n")
+            else:
+                if pending is None:
+                    pending = []
+                pending.append(child)
+        if pending:
+            for child in reversed(pending):
+                push((child, level))
+        if len(lines) >= chunk_lines:
+            write("".join(lines))
+            lines.clear()
+    write("".join(lines))
+
+_END = object()
+_LIST_ITERATOR = type(iter([]))
+_COMPOUND = frozenset({tuple, list}) | NODE_CLASSES
+
 def build_parse_tree(result):
     """Construye y retorna una representación explícita del parse tree"""
     if not result:
         return "No se pudo construir el parse tree"
     
-    def tree_to_string(node, level=0):
-        indent = "  " * level
-        if isinstance(node, tuple):
-            node_type = node[0]
-            children = node[1:]
-            result = f"{indent}{node_type}\n"
-            for child in children:
-                result += tree_to_string(child, level + 1)
-            return result
-        elif isinstance(node, list):
-            result = ""
-            for item in node:
-                result += tree_to_string(item, level)
-            return result
-        else:
-            return f"{indent}{node}\n"
-    
-    return tree_to_string(result)
+    out = io.StringIO()
+    write_parse_tree(result, out)
+    return out.getvalue()
 
 # ==================== SDT VERIFICATION ====================
 
@@ -397,99 +621,231 @@ def verify_sdt_rules():
 
 # ==================== SDT HELPER FUNCTIONS ====================
 
-def evaluate_expression(expr):
-    """Evalúa una expresión para SDT - Versión simplificada"""
-    if isinstance(expr, tuple):
-        if expr[0] == 'number':
-            return expr[1]
-        elif expr[0] == 'id':
-            try:
-                var_info = symbol_table.get_symbol(expr[1])
-                return var_info.get('value', 0)
-            except SemanticError:
-                return None
-        elif expr[0] == 'binop':
-            left_val = evaluate_expression(expr[2])
-            right_val = evaluate_expression(expr[3])
-            
-            if left_val is None or right_val is None:
-                return None
-                
-            op = expr[1]
-            if op == '+':
-                return left_val + right_val
-            elif op == '-':
-                return left_val - right_val
-            elif op == '*':
-                return left_val * right_val
-            elif op == '/':
-                return left_val // right_val if right_val != 0 else 0
-            elif op == '>':
-                return 1 if left_val > right_val else 0
-            elif op == '<':
-                return 1 if left_val < right_val else 0
-            elif op == '==':
-                return 1 if left_val == right_val else 0
-    
-    return None
+def _divide(left, right):
+    return left // right if right != 0 else 0
 
-# ==================== PARSER + SDT ENTRY POINT ====================
+# Operadores de expresión -> función que los evalúa (comparaciones dan 1 o 0)
+FOLD_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': _divide,
+    '>': lambda left, right: 1 if left > right else 0,
+    '<': lambda left, right: 1 if left < right else 0,
+    '==': lambda left, right: 1 if left == right else 0,
+}
 
-# Construir el parser
-try:
-    parser = yacc.yacc(debug=False, write_tables=False)
-except Exception as e:
-    print(f"Error construyendo parser: {e}")
-    parser = None
+def evaluate_expression(expr, symbol_table=None):
+    """Evalúa una expresión (nodos o tuplas) con los valores actuales de la tabla de símbolos
+
+    Sin symbol_table solo se pliegan las constantes: una expresión con
+    variables da None (la forma evaluate_expression(expr) de antes).
+
+    Iterativa, así que no tiene límite de profundidad; cada variable se busca
+    una sola vez por llamada. El parser no la necesita: cada expresión ya trae
+    su valor en node.folded.
+    """
+    if not isinstance(expr, (tuple, Node)):
+        return None
+    looked_up = {}
+    results = []
+    push = results.append
+    pop = results.pop
+    # La pila tiene expresiones por evaluar y, después de los operandos de cada
+    # binop, su operador (str) para aplicarlo cuando ambos valores estén listos
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        cls = type(node)
+        if cls is str:
+            right = pop()
+            left = pop()
+            fold = FOLD_OPERATORS.get(node)
+            push(None if left is None or right is None or fold is None else fold(left, right))
+            continue
+        if cls is BinOp:
+            stack += (node.op, node.right, node.left)
+            continue
+        if cls is Number:
+            push(node.value)
+            continue
+        if cls is Id:
+            name = node.name
+        elif cls is tuple and node and node[0] in ('binop', 'number', 'id'):
+            if node[0] == 'binop':
+                stack += (node[1], node[3], node[2])
+                continue
+            if node[0] == 'number':
+                push(node[1])
+                continue
+            name = node[1]
+        else:
+            push(None)  # id_error u otra cosa que no es una expresión válida
+            continue
+        if name not in looked_up:
+            symbol = symbol_table.lookup(name) if symbol_table is not None else None
+            looked_up[name] = symbol.value if symbol is not None else None
+        push(looked_up[name])
+    return results[0]
 
-def parse_code(code):
-    """Función principal que integra Parser + SDT - VERSIÓN MEJORADA"""
-    global symbol_table, semantic_errors, parsing_success
+# ==================== ANALYSIS RESULT ====================
+
+def _make_token(type, value, lineno, lexpos):
+    token = LexToken()
+    token.type = type
+    token.value = value
+    token.lineno = lineno
+    token.lexpos = lexpos
+    return token
+
+class AnalysisResult:
+    """Resultado estructurado de un análisis Parser + SDT.
+
+    Guarda los datos (tokens, AST, símbolos, diagnósticos y tiempos) y solo arma
+    el reporte de texto o el JSON cuando se pide con to_text() / to_json().
+    Es independiente de la sesión que lo produjo: otro análisis no lo modifica.
+    """
+    def __init__(self, source, ast, parsing_success, token_count, tokens, lexical_errors,
+                 syntax_errors, semantic_errors, symbols, scoped, profiler):
+        self.source = source
+        self.ast = ast                          # Program, o None si no se pudo construir
+        self.parsing_success = parsing_success
+        self.token_count = token_count
+        self.tokens = tokens                    # lista de LexToken, o None con lazy_tokens
+        self.lexical_errors = lexical_errors    # Diagnostics
+        self.syntax_errors = syntax_errors      # [(línea, columna, mensaje)]
+        self.semantic_errors = semantic_errors  # semánticos y de sintaxis, en orden
+        self.symbols = symbols                  # {nombre: Symbol} visibles al final (scope global)
+        self.scoped = scoped                    # [Symbol] declarados dentro de bloques
+        self.profiler = profiler                # PROFILE_C.Profiler: mediciones por fase
+        self.cached = False                     # True si se armó desde una caché (sin tiempos)
+        self._text = None
     
-    if parser is None:
-        return "Error: Parser no pudo ser construido"
+    def __getstate__(self):
+        # Los LexToken de las reglas con función guardan el lexer (no se puede serializar)
+        state = self.__dict__.copy()
+        if self.tokens is not None:
+            state['tokens'] = [(token.type, token.value, token.lineno, token.lexpos) for token in self.tokens]
+        return state
     
-    # Reset estado
-    symbol_table = SymbolTable()
-    semantic_errors = []
-    parsing_success = False
+    def __setstate__(self, state):
+        tokens = state['tokens']
+        if tokens is not None:
+            state['tokens'] = [_make_token(*fields) for fields in tokens]
+        self.__dict__.update(state)
     
-    # PASO 1: Análisis léxico
-    tokens_list = analyze_code(code)
-    lexical_errors = get_lexical_errors()
+    def snapshot(self):
+        """Datos del resultado para una caché: solo tuplas, cadenas, números y la tabla del AST
+
+        No comparte nada que se modifique con este objeto. Los tiempos no se guardan:
+        serían los del análisis original, no los de quien lee la caché.
+        """
+        lexical_errors = self.lexical_errors
+        tokens = self.tokens
+        if tokens is not None:
+            tokens = tuple((token.type, token.value, token.lineno, token.lexpos) for token in tokens)
+        return (self.source, to_rows(self.ast), self.parsing_success, self.token_count, tokens,
+                (tuple(lexical_errors), lexical_errors.max_errors, lexical_errors.aborted),
+                tuple(self.syntax_errors), tuple(self.semantic_errors),
+                tuple((symbol.name, symbol.type, symbol.value, symbol.depth) for symbol in self.symbols.values()),
+                tuple((symbol.name, symbol.type, symbol.value, symbol.depth) for symbol in self.scoped))
     
-   # STEP 2: Syntactic analysis and parse tree construction
-    output = "=== ANALYSIS PROCEDURE ===\n\n"
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """AnalysisResult nuevo a partir de snapshot(), con un profiler vacío y cached=True"""
+        (source, rows, parsing_success, token_count, tokens, (messages, max_errors, aborted),
+         syntax_errors, semantic_errors, symbols, scoped) = snapshot
+        lexical_errors = Diagnostics(max_errors)
+        lexical_errors.messages = list(messages)
+        lexical_errors.aborted = aborted
+        if tokens is not None:
+            tokens = [_make_token(*fields) for fields in tokens]
+        result = cls(source, from_rows(rows), parsing_success, token_count, tokens, lexical_errors,
+                     list(syntax_errors), list(semantic_errors),
+                     {fields[0]: Symbol(*fields) for fields in symbols},
+                     [Symbol(*fields) for fields in scoped], Profiler())
+        result.cached = True
+        return result
     
-    try:
-        result = parser.parse(code, tracking=True)
+    @property
+    def timings(self):
+        """{fase: segundos}; las fases del reporte aparecen después de to_text()"""
+        return self.profiler.timings
+    
+    @property
+    def sdt_verified(self):
+        """True si el parse terminó bien y no hubo errores semánticos ni léxicos"""
+        return self.parsing_success and not self.semantic_errors and not self.lexical_errors
+    
+    def ir(self, optimize=True):
+        """IR de tres direcciones de main (IR_C.Function), optimizado con los pases de IR_C
+
+        None si el programa tiene errores de sintaxis o semánticos. Cada llamada genera
+        un IR nuevo; el tiempo queda en las fases 'ir' e 'ir:<pase>' del profiler.
+        """
+        if not self.parsing_success or self.semantic_errors:
+            return None
+        import IR_C
+        with self.profiler.phase('ir'):
+            function = IR_C.lower(self.ast)
+        if optimize:
+            IR_C.optimize(function, profiler=self.profiler)
+        return function
+    
+    def to_text(self, render_tree=False, tree_filename="arbol_sintactico"):
+        """Reporte legible (el mismo que AnalysisSession.report)
+
+        Se arma la primera vez que se pide y se guarda; con render_tree=True la
+        imagen se vuelve a generar en cada llamada.
+        """
+        if render_tree:
+            return self._format(render_tree, tree_filename)
+        if self._text is None:
+            self._text = self._format(False, tree_filename)
+        return self._text
+    
+    def _format(self, render_tree, tree_filename):
+        result = self.ast
+        lexical_errors = self.lexical_errors
+        semantic_errors = self.semantic_errors
         
-        # GENERATE SYNTAX TREE IMAGE
-        tree_image_message = generate_syntax_tree_image(result)
+        output = "=== ANALYSIS PROCEDURE ===\n\n"
+        
+        # GENERATE SYNTAX TREE IMAGE (opcional: ejecuta Graphviz)
+        if render_tree:
+            with self.profiler.phase('tree_image'):
+                tree_image_message = generate_syntax_tree_image(result, tree_filename)
+        else:
+            tree_image_message = "Image not rendered (use render_tree=True or AnalysisSession.tree_image())"
         
         # STEP 3: Build parse tree explicitly
-        parse_tree_output = build_parse_tree(result)
+        with self.profiler.phase('parse_tree'):
+            parse_tree_output = build_parse_tree(result)
         
         # STEP 4: SDT verification
-        sdt_verification = verify_sdt_rules()
+        with self.profiler.phase('sdt_verification'):
+            sdt_verification = verify_sdt_rules()
         
         # FINAL RESULT
         output += "1.  LEXICAL ANALYSIS COMPLETED\n"
-        output += f"   - Tokens recognized: {len(tokens_list)}\n"
-        output += f"   - Lexical errors: {len(lexical_errors)}\n\n"
+        output += f"   - Tokens recognized: {self.token_count}\n"
+        output += f"   - Lexical errors: {len(lexical_errors)}\n"
+        if lexical_errors.aborted:
+            output += f"   - Lexical analysis stopped after {lexical_errors.max_errors} errors\n"
+        output += "\n"
         
-        if parsing_success:
+        if self.parsing_success:
             output += "2.  PARSE TREE CONSTRUCTION COMPLETED\n"
             output += "=== PARSE TREE ===\n"
             output += parse_tree_output + "\n"
-            
+        
             output += "3.  SDT RULES VERIFICATION\n"
             output += sdt_verification + "\n\n"
-            
+        
             # Add tree image message
             output += f"4.  TREE VISUALIZATION\n"
             output += f"   {tree_image_message}\n\n"
-            
+        
             # Final result according to requirements
             if not semantic_errors and not lexical_errors:
                 output += "=== FINAL RESULT ===\n"
@@ -501,27 +857,281 @@ def parse_code(code):
                 output += " Parsing Success!\n"
                 output += " SDT error...\n"
                 output += "\nThe input ended in a syntactically valid state BUT SDT validation failed.\n"
-                
+            
                 if semantic_errors:
                     output += "\nSemantic Errors (SDT):\n" + "\n".join(f"  • {error}" for error in semantic_errors) + "\n"
                 if lexical_errors:
                     output += "\nLexical Errors:\n" + "\n".join(f"  • {error}" for error in lexical_errors) + "\n"
-                
+            
         else:
             output += "2.  PARSE TREE CONSTRUCTION FAILED\n\n"
             output += "=== FINAL RESULT ===\n"
             output += " Parsing error...\n"
             output += " SDT error...\n"
             output += "\nThe input did NOT end in a syntactically valid state.\n"
-        
+            if semantic_errors:
+                output += "\nSyntax/Semantic Errors:\n" + "\n".join(f"  • {error}" for error in semantic_errors) + "\n"
+            if lexical_errors:
+                output += "\nLexical Errors:\n" + "\n".join(f"  • {error}" for error in lexical_errors) + "\n"
+    
         # Additional SDT information
         output += f"\n=== SDT INFORMATION ===\n"
-        output += f"Variables in symbol table: {len(symbol_table.symbols)}\n"
-        for var_name, var_info in symbol_table.symbols.items():
+        symbols = self.symbols
+        output += f"Variables in symbol table: {len(symbols)}\n"
+        for var_name, symbol in symbols.items():
             if var_name != 'main':
-                output += f"  - {var_name}: {var_info['type']} = {var_info.get('value', 'Not assigned')}\n"
-        
+                output += f"  - {var_name}: {symbol.type} = {symbol.value}\n"
+        if self.scoped:
+            output += f"Block-scoped variables: {len(self.scoped)}\n"
+            for symbol in self.scoped:
+                output += f"  - {symbol.name}: {symbol.type} = {symbol.value} (scope {symbol.depth})\n"
+    
         return output
-        
-    except Exception as e:
-        return f"Error during analysis: {str(e)}"
\ No newline at end of file
+    
+    def to_dict(self, include_ast=True, include_tokens=False):
+        """Resultado como tipos básicos de Python (listas, dicts, str, int), listo para JSON
+
+        El AST va como la tabla plana de AST_C.to_rows (una fila por nodo), así que
+        una expresión muy larga no llega al límite de recursión de json.
+        """
+        data = {
+            'parsing_success': self.parsing_success,
+            'sdt_verified': self.sdt_verified,
+            'tokens': self.token_count,
+            'lexical_errors': list(self.lexical_errors),
+            'lexical_aborted': self.lexical_errors.aborted,
+            'semantic_errors': list(self.semantic_errors),
+            'syntax_errors': [{'line': line, 'column': column, 'message': message}
+                              for line, column, message in self.syntax_errors],
+            'symbols': [{'name': symbol.name, 'type': symbol.type, 'value': symbol.value, 'depth': symbol.depth}
+                        for name, symbol in self.symbols.items() if name != 'main'],
+            'scoped_symbols': [{'name': symbol.name, 'type': symbol.type, 'value': symbol.value,
+                                'depth': symbol.depth} for symbol in self.scoped],
+            'timings': self.profiler.as_dict(),
+            'cached': self.cached,
+        }
+        if include_tokens and self.tokens is not None:
+            data['token_list'] = [{'type': token.type, 'value': token.value, 'line': token.lineno,
+                                   'position': token.lexpos} for token in self.tokens]
+        if include_ast:
+            data['ast'] = to_rows(self.ast)
+        return data
+    
+    def to_json(self, include_ast=True, include_tokens=False, **json_options):
+        """Resultado en JSON (json_options se pasan a json.dumps, p. ej. indent=2)"""
+        return json.dumps(self.to_dict(include_ast, include_tokens), ensure_ascii=False, **json_options)
+
+# ==================== PARSER + SDT ENTRY POINT ====================
+
+# Construir el parser. Las tablas LALR se guardan en parsetab_c.py; PLY compara
+# su firma (hash de la gramática: reglas p_*, precedencia y tokens) y las
+# regenera automáticamente cuando la gramática cambia (escritas con table_output).
+try:
+    with table_output(os.path.dirname(os.path.abspath(__file__))) as outputdir:
+        parser = yacc.yacc(debug=False, write_tables=True, tabmodule='parsetab_c', outputdir=outputdir)
+except Exception as e:
+    print(f"Error construyendo parser: {e}")
+    parser = None
+
+# Cada cuántos tokens se revisa la cancelación y se reporta el progreso
+PROGRESS_EVERY = 1024
+
+class AnalysisSession:
+    """Estado de un análisis Parser + SDT: lexer, parser, tabla de símbolos y errores propios.
+
+    Cada sesión es independiente, por lo que varias sesiones pueden analizar
+    código al mismo tiempo en distintos hilos. Una sesión no debe compartirse
+    entre hilos; se puede re-usar para varios análisis consecutivos.
+    """
+    def __init__(self, max_lex_errors=None, lexer_backend='ply', capture_profile=False, trace_memory=False):
+        if parser is None:
+            raise RuntimeError("Parser no pudo ser construido")
+        self.lexer = new_lexer(lexer_backend)
+        self.max_lex_errors = max_lex_errors
+        # Modos de medición opcionales (PROFILE_C): cProfile y tracemalloc en cada fase
+        self.capture_profile = capture_profile
+        self.trace_memory = trace_memory
+        # Copia superficial: comparte las tablas LALR pero no el estado del parse
+        self.parser = copy.copy(parser)
+        self.parser.session = self
+        self.parser.errorfunc = self.syntax_error
+        self._cancelled = threading.Event()
+        self.reset()
+    
+    def reset(self):
+        """Limpia el estado del análisis anterior"""
+        self.symbol_table = SymbolTable()
+        self.semantic_errors = []
+        self.syntax_errors = []
+        self.source = ""
+        self.parsing_success = False
+        self.lexer.errors = Diagnostics(self.max_lex_errors)
+        self.token_count = 0
+        self.tokens = None
+        self.result = None
+        self.profiler = Profiler(self.capture_profile, self.trace_memory)
+    
+    @property
+    def lexical_errors(self):
+        return self.lexer.errors
+    
+    def syntax_error(self, p):
+        """Manejador de errores de sintaxis del parser de esta sesión
+
+        El parser se recupera (reglas con 'error') y sigue, así que se registran
+        todos los errores de sintaxis del código en un solo análisis, en
+        syntax_errors como (línea, columna, mensaje).
+        """
+        self.parsing_success = False
+        code = self.source
+        if p:
+            line = p.lineno
+            column = p.lexpos - code.rfind('\n', 0, p.lexpos)
+            error_msg = (f"Error de sintaxis cerca de '{p.value}' (tipo: {p.type}) "
+                         f"en línea {line}, columna {column}")
+        else:
+            line = code.count('\n') + 1
+            column = len(code) - code.rfind('\n')
+            error_msg = f"Error de sintaxis: código incompleto o final inesperado en línea {line}, columna {column}"
+        self.syntax_errors.append((line, column, error_msg))
+        self.semantic_errors.append(error_msg)
+    
+    def cancel(self):
+        """Pide detener el análisis en curso (o el siguiente, si aún no empieza); se puede llamar desde otro hilo"""
+        self._cancelled.set()
+    
+    def check_cancelled(self):
+        """Lanza AnalysisCancelled si se llamó a cancel(); la petición se consume"""
+        if self._cancelled.is_set():
+            self._cancelled.clear()
+            raise AnalysisCancelled("Análisis cancelado")
+    
+    def _watch(self, tokens, length, progress, start, span):
+        """Pasa los tokens en bloques de PROGRESS_EVERY; entre bloques revisa cancel() y reporta el avance"""
+        tokens = iter(tokens)
+        while True:
+            chunk = list(islice(tokens, PROGRESS_EVERY))
+            if not chunk:
+                return
+            self.check_cancelled()
+            if progress is not None:
+                progress(start + span * chunk[0].lexpos / length)
+            yield chunk
+    
+    def parse(self, code, lazy_tokens=False, progress=None):
+        """Lexea y parsea el código; retorna el árbol (o None si hubo error de sintaxis)
+
+        progress(fracción) se llama de vez en cuando con el avance (0.0 a 1.0); con
+        progress también se revisa cancel() durante el análisis.
+        """
+        self.reset()
+        self.source = code
+        length = max(len(code), 1)
+        profiler = self.profiler
+        # PASO 1: Análisis léxico (con lazy_tokens ocurre durante el parse y se mide junto con él)
+        tokens = iter_tokens(code, self.lexer, self.max_lex_errors)
+        if lazy_tokens:
+            if progress is not None:
+                tokens = chain.from_iterable(self._watch(tokens, length, progress, 0.0, 1.0))
+            token_stream = TokenStream(tokens)
+        else:
+            if progress is not None:
+                tokens = chain.from_iterable(self._watch(tokens, length, progress, 0.0, 0.5))
+            with profiler.phase('lex'):
+                tokens = self.tokens = list(tokens)
+            if progress is not None:
+                tokens = chain.from_iterable(self._watch(tokens, length, progress, 0.5, 0.5))
+            token_stream = TokenStream(tokens)
+        # PASO 2: Análisis sintáctico con los mismos tokens
+        with profiler.phase('parse'):
+            self.result = self.parser.parse(lexer=token_stream, tracking=True)
+        # En modo perezoso el conteo y los errores léxicos se conocen al terminar el parse
+        self.token_count = token_stream.count
+        # Un error de sintaxis dentro de un bloque (p. ej. fin de archivo) puede dejar scopes abiertos
+        while self.symbol_table.depth:
+            self.symbol_table.exit_scope()
+        if progress is not None:
+            progress(1.0)
+        return self.result
+    
+    def run(self, code, lazy_tokens=False, progress=None):
+        """Parsea el código y retorna su AnalysisResult, sin generar el reporte"""
+        self.parse(code, lazy_tokens, progress)
+        return self.result_object()
+    
+    def analyze(self, code, lazy_tokens=False, render_tree=False, tree_filename="arbol_sintactico",
+                progress=None):
+        """Parsea el código y retorna el reporte completo del análisis"""
+        try:
+            analysis = self.run(code, lazy_tokens, progress)
+            # No vale la pena generar el reporte (ni la imagen) de un análisis cancelado
+            self.check_cancelled()
+            return analysis.to_text(render_tree, tree_filename)
+        except AnalysisCancelled:
+            raise
+        except Exception as e:
+            return f"Error during analysis: {str(e)}"
+    
+    def tree_image(self):
+        """Árbol del último análisis para dibujarlo bajo demanda (SyntaxTreeImage)"""
+        return SyntaxTreeImage(self.result)
+    
+    def result_object(self):
+        """AnalysisResult del último análisis (sin armar el reporte)"""
+        symbol_table = self.symbol_table
+        return AnalysisResult(self.source, self.result, self.parsing_success, self.token_count,
+                              self.tokens, self.lexical_errors, self.syntax_errors,
+                              self.semantic_errors, symbol_table.symbols, list(symbol_table.scoped),
+                              self.profiler)
+    
+    def report(self, render_tree=False, tree_filename="arbol_sintactico"):
+        """Reporte legible del último análisis; la imagen del árbol solo se genera con render_tree=True"""
+        return self.result_object().to_text(render_tree, tree_filename)
+
+def parse_code(code, lazy_tokens=False, max_lex_errors=None, render_tree=False,
+               tree_filename="arbol_sintactico", cache=None):
+    """Función principal que integra Parser + SDT - VERSIÓN MEJORADA
+
+    El código se lexea una sola vez: los tokens del análisis léxico se
+    re-usan en el parser. Con lazy_tokens=True los tokens se generan bajo
+    demanda mientras el parser los consume, sin guardar la lista.
+    Cada llamada usa su propia AnalysisSession, así que es segura entre hilos.
+    max_lex_errors detiene el análisis léxico después de N errores.
+    La imagen del árbol (Graphviz) solo se genera con render_tree=True, en tree_filename.jpg.
+    Con cache (un CACHE_C.ResultCache, o True para la caché compartida) el reporte de
+    un código ya analizado se recupera sin volver a analizarlo (no con render_tree).
+    """
+    if parser is None:
+        return "Error: Parser no pudo ser construido"
+    
+    cache = CACHE_C.resolve(cache)
+    if cache is None or render_tree:
+        return AnalysisSession(max_lex_errors).analyze(code, lazy_tokens, render_tree, tree_filename)
+    # lazy_tokens no cambia el reporte, así que no es parte de la llave
+    return cache.get_or_compute(cache.key('parse_code', code, max_lex_errors),
+                                lambda: AnalysisSession(max_lex_errors).analyze(code, lazy_tokens))
+
+def parse_result(code, lazy_tokens=False, max_lex_errors=None, cache=None,
+                 capture_profile=False, trace_memory=False):
+    """Como parse_code, pero retorna un AnalysisResult en lugar del reporte de texto
+
+    Útil cuando solo se necesitan los datos (éxito del parse, errores, símbolos):
+    el reporte se arma únicamente si se llama a to_text(). Con capture_profile y
+    trace_memory se activan cProfile y tracemalloc (result.profiler); esos
+    análisis no usan la caché. La caché guarda AnalysisResult.snapshot() y cada
+    acierto retorna un AnalysisResult nuevo (cached=True, sin tiempos del análisis).
+    """
+    if parser is None:
+        raise RuntimeError("Parser no pudo ser construido")
+    
+    cache = CACHE_C.resolve(cache)
+    if cache is None or capture_profile or trace_memory:
+        return AnalysisSession(max_lex_errors, capture_profile=capture_profile,
+                               trace_memory=trace_memory).run(code, lazy_tokens)
+    key = cache.key('parse_result', code, max_lex_errors, lazy_tokens)
+    found = cache.get(key)
+    if found is not None:
+        return AnalysisResult.from_snapshot(found)
+    result = AnalysisSession(max_lex_errors).run(code, lazy_tokens)
+    cache.put(key, result.snapshot())
+    return result
@@ -0,0 +1,137 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Medición por fase del análisis (lexer, parser, imagen del árbol, parse tree y SDT).
+# Siempre se mide el tiempo real, el tiempo de CPU del hilo y los bloques de memoria
+# que quedan asignados (sys.getallocatedblocks; cuenta los de todo el proceso).
+# Modos opcionales, más lentos:
+#   - capture=True: cProfile de todas las fases (profile_text()).
+#   - trace_memory=True: tracemalloc; bytes asignados y pico de memoria por fase.
+# tracemalloc y cProfile son de todo el proceso (desde Python 3.12 solo puede haber un
+# cProfile activo), así que solo una fase a la vez los usa: las de otros hilos esperan
+# y una fase anidada dentro de otra que ya captura solo mide tiempo y bloques.
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_capture_lock = threading.Lock()
+_capture_thread = None      # hilo cuya fase tiene _capture_lock (cProfile / tracemalloc)
+
+class PhaseStats:
+    """Medición de una fase; si la fase se repite, los valores se acumulan"""
+    __slots__ = ('wall', 'cpu', 'blocks', 'allocated', 'peak', 'calls')
+
+    def __init__(self):
+        self.wall = 0.0       # segundos (perf_counter)
+        self.cpu = 0.0        # segundos de CPU del hilo que ejecutó la fase
+        self.blocks = 0       # bloques de memoria asignados y no liberados durante la fase
+        self.allocated = None # bytes asignados y no liberados (solo con trace_memory)
+        self.peak = None      # pico de bytes sobre el inicio de la fase (solo con trace_memory)
+        self.calls = 0
+
+    def as_dict(self):
+        data = {'wall': self.wall, 'cpu': self.cpu, 'blocks': self.blocks, 'calls': self.calls}
+        if self.allocated is not None:
+            data['allocated'] = self.allocated
+            data['peak'] = self.peak
+        return data
+
+class Profiler:
+    """Mide las fases de un análisis: with profiler.phase('parse'): ..."""
+    def __init__(self, capture=False, trace_memory=False):
+        self.phases = {}
+        self.trace_memory = trace_memory
+        self.profile = cProfile.Profile() if capture else None
+
+    def __getstate__(self):
+        # cProfile.Profile no se puede serializar: el perfil capturado no se guarda
+        state = {name: getattr(self, name) for name in ('phases', 'trace_memory')}
+        state['profile'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    @contextmanager
+    def phase(self, name):
+        global _capture_thread
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        capture = (self.trace_memory or self.profile is not None) and _capture_thread != threading.get_ident()
+        if capture:
+            _capture_lock.acquire()
+            _capture_thread = threading.get_ident()
+        started_tracing = False
+        try:
+            if capture and self.trace_memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    started_tracing = True
+                tracemalloc.reset_peak()
+                memory_before = tracemalloc.get_traced_memory()[0]
+            if capture and self.profile is not None:
+                self.profile.enable()
+            blocks_before = sys.getallocatedblocks()
+            cpu_before = time.thread_time()
+            wall_before = time.perf_counter()
+            try:
+                yield stats
+            finally:
+                stats.wall += time.perf_counter() - wall_before
+                stats.cpu += time.thread_time() - cpu_before
+                stats.blocks += sys.getallocatedblocks() - blocks_before
+                stats.calls += 1
+                if capture and self.profile is not None:
+                    self.profile.disable()
+                if capture and self.trace_memory:
+                    current, peak = tracemalloc.get_traced_memory()
+                    stats.allocated = (stats.allocated or 0) + current - memory_before
+                    stats.peak = max(stats.peak or 0, peak - memory_before)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            if capture:
+                _capture_thread = None
+                _capture_lock.release()
+
+    @property
+    def timings(self):
+        """{fase: segundos (tiempo real)}"""
+        return {name: stats.wall for name, stats in self.phases.items()}
+
+    def as_dict(self):
+        return {name: stats.as_dict() for name, stats in self.phases.items()}
+
+    def summary(self):
+        """Tabla de texto con las mediciones de cada fase"""
+        width = max([18] + [len(name) + 2 for name in self.phases])
+        lines = [f"{'Phase':<{width}}{'Wall (ms)':>11}{'CPU (ms)':>11}{'Blocks':>10}"
+                 + (f"{'Alloc (KiB)':>13}{'Peak (KiB)':>12}" if self.trace_memory else "")]
+        for name, stats in self.phases.items():
+            line = f"{name:<{width}}{stats.wall * 1000:>11.2f}{stats.cpu * 1000:>11.2f}{stats.blocks:>10}"
+            if stats.allocated is not None:
+                line += f"{stats.allocated / 1024:>13.1f}{stats.peak / 1024:>12.1f}"
+            lines.append(line)
+        total = sum(stats.wall for stats in self.phases.values())
+        lines.append(f"{'total':<{width}}{total * 1000:>11.2f}")
+        return "\n".join(lines)
+
+    def profile_text(self, limit=25, sort='cumulative'):
+        """Las funciones con más tiempo según cProfile (solo con capture=True)"""
+        if self.profile is None:
+            return "cProfile capture not enabled"
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
@@ -0,0 +1,499 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Motor léxico dirigido por una tabla de reglas compartida, con dos perfiles de tokens:
+#   - 'parser': los tokens de LEX_C que consume PARSER_C (INT, ID, NUMBER, PLUS, ...)
+#   - 'category': las seis categorías del lexer de Lexer/LEX_C (KEYWORDS, IDENTIFIER,
+#     OPERATOR, CONSTANT, PUNCTUATION, LITERAL) y su reporte
+# Las expresiones regulares se compilan una sola vez al importar: una por perfil y
+# una combinada con la que un solo recorrido del código produce los dos perfiles.
+#
+# Los perfiles no cortan el texto igual en todos los casos ('3.14' es un CONSTANT
+# para 'category' y NUMBER '.' NUMBER para 'parser'; '<=' es un OPERATOR o LT IGUALS).
+# Cada regla dice cómo se traduce su lexema en cada perfil. Donde el corte depende
+# de lo que sigue (comillas sin cerrar o con escapes, '<==') la regla 'diverge' hace
+# que cada perfil avance con su propia expresión hasta que los dos coinciden otra vez.
+
+import hashlib
+import re
+from array import array
+
+PROFILES = ('parser', 'category')
+
+# ---------- perfil 'parser' ----------
+
+PARSER_TOKENS = (
+    'INT', 'FLOAT', 'CHAR','DOUBLE', 'LONG', 'SHORT',   # Tipos de datos
+    'RETURN','IF', 'ELSE',  # KEYWORDS
+    'ID', 'NUMBER',
+    'PLUS', 'MINUS', 'TIMES', 'DIVIDE',
+    'GT', 'LT', 'EQUALS', 'IGUALS',
+    'LPAREN', 'RPAREN', 'LBRACE', 'RBRACE',
+    'SEMICOLON',
+    'PRINTF', 'STRING'
+)
+
+# Palabras reservadas: se buscan después de reconocer la palabra completa
+PARSER_KEYWORDS = {
+    'int': 'INT', 'float': 'FLOAT', 'char': 'CHAR',         # Tipos de datos
+    'double': 'DOUBLE', 'long': 'LONG', 'short': 'SHORT',
+    'if': 'IF', 'else': 'ELSE', 'return': 'RETURN', 'printf': 'PRINTF',
+}
+
+PARSER_SYMBOLS = {'==': 'EQUALS', '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE',
+                  '=': 'IGUALS', '>': 'GT', '<': 'LT', '(': 'LPAREN', ')': 'RPAREN',
+                  '{': 'LBRACE', '}': 'RBRACE', ';': 'SEMICOLON'}
+
+# Caracteres que no pueden iniciar ningún token del parser; una racha de ellos es un solo error
+ILLEGAL_RUN = re.compile(r'[^A-Za-z0-9_\s+\-*/=<>(){};"#]+')
+
+def illegal_run(data, pos, offset=0):
+    """(longitud, mensaje) del error léxico del perfil 'parser' que empieza en pos
+
+    offset es la posición en el archivo del inicio de 'data' (lectura por bloques).
+    """
+    run = ILLEGAL_RUN.match(data, pos)
+    length = run.end() - pos if run else 1
+    position = pos + offset
+    if length == 1:
+        return length, f"Carácter ilegal '{data[pos]}' en posición {position}"
+    illegal = "".join(c if c.isprintable() else f"\\x{ord(c):02x}" for c in data[pos:pos + min(length, 10)])
+    if length > 10:
+        illegal += "..."
+    return length, f"Caracteres ilegales '{illegal}' en posiciones {position}-{position + length - 1}"
+
+# ---------- perfil 'category' ----------
+
+CATEGORY_TOKENS = ('KEYWORDS', 'IDENTIFIER', 'OPERATOR', 'CONSTANT', 'PUNCTUATION', 'LITERAL')
+CATEGORY_NAMES = ("Keywords", "Identifiers", "Operators", "Constants", "Punctuation", "Literals")
+
+# Se reconocen con \b a los dos lados de la palabra: pegadas a un dígito ('9int') o a
+# una letra que no es ASCII ('intñ') son identificadores
+CATEGORY_KEYWORDS = frozenset((
+    'const', 'double', 'float', 'int', 'short', 'char', 'long', 'struct', 'break', 'for', 'if',
+    'else', 'switch', 'case', 'do', 'while', 'default', 'goto', 'void', 'return'))
+
+CATEGORY_SYMBOLS = {symbol: 'OPERATOR' for symbol in ('==', '!=', '<=', '>=', '<', '>', '=', '+', '-', '*', '/')}
+CATEGORY_SYMBOLS.update((symbol, 'PUNCTUATION') for symbol in '():[]{};,.')
+
+WORD_CHAR = re.compile(r'\w')
+
+def category_word(data, text, start):
+    """Código de categoría (KEYWORDS o IDENTIFIER) de la palabra 'text' en data[start:]"""
+    if text in CATEGORY_KEYWORDS and not (start and WORD_CHAR.match(data, start - 1)
+                                           or WORD_CHAR.match(data, start + len(text))):
+        return 0    # KEYWORDS
+    return 1        # IDENTIFIER
+
+# ==================== RULE TABLE ====================
+
+# Acciones de una regla en un perfil
+SKIP = 'skip'           # se ignora (encabezados #include; saltos de línea en 'category')
+NEWLINE = 'newline'     # se ignora y cuenta líneas
+WORD = 'word'           # identificador o palabra reservada
+SYMBOL = 'symbol'       # el tipo depende del texto (PARSER_SYMBOLS / CATEGORY_SYMBOLS)
+SPLIT = 'split'         # 'parser': el lexema es varios tokens y errores ('3.14', '<=', '!=')
+ILLEGAL = 'illegal'     # 'parser': error léxico
+DIVERGE = 'diverge'     # los perfiles cortan distinto: cada uno sigue con su propia expresión
+
+HEADER = r'\#include\s*(?:<[^>]+>|"[^"]+")'
+WORD_PATTERN = r'[a-zA-Z_][a-zA-Z0-9_]*'
+SYMBOL_PATTERN = r'==|[+\-*/=<>(){};]'
+
+# (regla, patrón en el recorrido combinado,
+#  (patrón propio, acción) en 'parser', (patrón propio, acción) en 'category')
+# Un patrón propio None: la regla no existe en ese perfil por sí solo (su lexema lo
+# cubre otra regla) y la acción solo se usa en el recorrido combinado. En 'category'
+# una acción que es un nombre de CATEGORY_TOKENS emite ese tipo. Las reglas empiezan
+# con caracteres distintos salvo las que se prueban en orden: decimal/number y
+# compare/diverge/symbol.
+RULES = (
+    ('newline', r'\n+',               (r'\n+', NEWLINE),         (r'\n+', SKIP)),
+    ('word',    WORD_PATTERN,         (WORD_PATTERN, WORD),      (WORD_PATTERN, WORD)),
+    ('decimal', r'\d+\.\d+',          (None, SPLIT),             (r'\d+(?:\.\d+)?', 'CONSTANT')),
+    ('number',  r'\d+',               (r'\d+', 'NUMBER'),        (None, 'CONSTANT')),
+    ('string',  r'"[^"\n\\]*"',       (r'"[^"\n]*"', 'STRING'),  (r'"(?:[^"\\]|\\.)*"', 'LITERAL')),
+    ('header',  HEADER,               (HEADER, SKIP),            (HEADER, SKIP)),
+    ('compare', r'(?:!=|<=|>=)(?!=)', (None, SPLIT),             (r'!=|<=|>=', SYMBOL)),
+    ('diverge', r'"|[<>!]==',         (None, DIVERGE),           (None, DIVERGE)),
+    ('symbol',  SYMBOL_PATTERN,       (SYMBOL_PATTERN, SYMBOL),  (SYMBOL_PATTERN, SYMBOL)),
+    ('punct',   r'[\[\]:,.]',         (None, ILLEGAL),           (r'[\[\]:,.]', 'PUNCTUATION')),
+)
+
+BLANKS = ' \t'     # se ignoran en los dos perfiles (t_ignore de PLY)
+IGNORED = re.compile(f"[{BLANKS}]*")
+
+def _master(patterns):
+    """Una expresión con un grupo por regla; los espacios y tabuladores se saltan en el mismo match"""
+    return re.compile(IGNORED.pattern + "(?:" + "|".join(f"({pattern})" for pattern in patterns) + ")")
+
+# ==================== PLY RULES ====================
+
+# Valor del token en el perfil 'parser' (el texto tal cual en los demás tipos)
+PARSER_VALUES = {'NUMBER': int, 'STRING': lambda text: text[1:-1]}     # STRING: quita comillas
+
+def ply_rules(profile):
+    """{t_<regla>: función} de PLY para los patrones propios de un perfil, en el orden de la tabla
+
+    La expresión va en .regex (como el decorador @TOKEN de PLY). Todas las
+    funciones salen de la misma línea, así que PLY (que ordena las funciones por
+    número de línea) conserva el orden de la tabla. Si cada símbolo es de un tipo
+    distinto (perfil 'parser'), la regla de símbolos se vuelve una regla de texto
+    t_<TIPO> por símbolo, que PLY resuelve sin llamar a una función. LEX_C y
+    Lexer/LEX_C las agregan a sus globales para que lex.lex() las encuentre.
+    """
+    index = PROFILES.index(profile) + 2
+    symbols = PARSER_SYMBOLS if profile == 'parser' else CATEGORY_SYMBOLS
+    rules = {}
+    for rule in RULES:
+        pattern, action = rule[index]
+        if pattern is None:
+            continue
+        if action == SYMBOL and len(set(symbols.values())) == len(symbols):
+            rules.update((f"t_{token}", re.escape(symbol)) for symbol, token in symbols.items())
+        else:
+            rules[f"t_{rule[0]}"] = _ply_rule(profile, f"t_{rule[0]}", pattern, action)
+    return rules
+
+def _ply_rule(profile, name, pattern, action):
+    parser = profile == 'parser'
+    symbols = PARSER_SYMBOLS if parser else CATEGORY_SYMBOLS
+    convert = PARSER_VALUES.get(action) if parser else None
+    def rule(t):
+        if action == NEWLINE:
+            t.lexer.lineno += len(t.value)
+            return None
+        if action == SKIP:
+            return None
+        if action == WORD:
+            if parser:
+                t.type = PARSER_KEYWORDS.get(t.value, 'ID')
+            else:
+                t.type = CATEGORY_TOKENS[category_word(t.lexer.lexdata, t.value, t.lexpos)]
+        elif action == SYMBOL:
+            t.type = symbols[t.value]
+        else:
+            t.type = action
+            if convert is not None:
+                t.value = convert(t.value)
+        return t
+    rule.__name__ = rule.__qualname__ = name
+    rule.regex = pattern
+    return rule
+
+def rules_signature(namespace):
+    """Hash de las reglas de un lexer de PLY (tokens, expresiones regulares y su orden)
+
+    namespace es el diccionario del módulo con las reglas (globals()); el hash
+    nombra su tabla lextab_<hash>.py, así que cambia cuando cambia cualquier regla.
+    """
+    parts = [repr(namespace['tokens']), repr(namespace['t_ignore'])]
+    for name, value in list(namespace.items()):
+        if name.startswith('t_') and name != 't_ignore':
+            rule = getattr(value, 'regex', value.__doc__) if callable(value) else value
+            parts.append(f"{name}={rule}")
+    return hashlib.sha1("\n".join(parts).encode('utf-8')).hexdigest()[:12]
+
+# ==================== SCAN RESULTS ====================
+
+class ParserTokens:
+    """Tokens del perfil 'parser' en columnas (las mismas que LEX_C.TokenBuffer)"""
+    __slots__ = ('types', 'lineno', 'lexpos', 'length', 'errors')
+
+    def __init__(self, errors):
+        self.types = array('B')     # índice en PARSER_TOKENS
+        self.lineno = array('I')
+        self.lexpos = array('I')
+        self.length = array('I')
+        self.errors = errors        # objeto con add(mensaje) -> False si hay que detenerse
+
+    def __len__(self):
+        return len(self.types)
+
+class CategoryTokens:
+    """Tokens del perfil 'category': código de categoría (un byte) y texto de cada token"""
+    __slots__ = ('codes', 'values', 'errors', '_report')
+
+    def __init__(self):
+        self.codes = array('b')     # índice en CATEGORY_TOKENS
+        self.values = []
+        self.errors = []
+        self._report = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def by_category(self):
+        """{nombre de categoría: [textos]} en el orden del reporte"""
+        groups = [[] for _ in CATEGORY_NAMES]
+        for code, value in zip(self.codes, self.values):
+            groups[code].append(value)
+        return dict(zip(CATEGORY_NAMES, groups))
+
+    def report(self):
+        """El reporte de analyze_code de Lexer/LEX_C; se arma la primera vez que se pide"""
+        if self._report is None:
+            lines = [""]
+            lines += self.errors
+            lines.append("\n=== Tokens ===")
+            lines += [f"{key}: {values}" for key, values in self.by_category().items()]
+            lines.append(f"\nTotal de tokens = {len(self.codes)}")
+            self._report = "\n".join(lines)
+        return self._report
+
+class _Errors(list):
+    """Errores del perfil 'parser' sin límite (si no se pasa un LEX_C.Diagnostics)"""
+    def add(self, message):
+        self.append(message)
+        return True
+
+# ==================== ENGINE ====================
+
+class LexerEngine:
+    """Compila la tabla de reglas una vez y recorre código con uno o los dos perfiles"""
+    def __init__(self, rules=RULES):
+        self.rules = rules
+        self.combined = _master(rule[1] for rule in rules)
+        parser_codes = {name: code for code, name in enumerate(PARSER_TOKENS)}
+        category_codes = {name: code for code, name in enumerate(CATEGORY_TOKENS)}
+        # Acciones por grupo (el grupo 0 no se usa); los tipos fijos ya como código
+        self.parser_actions = (None,) + tuple(parser_codes.get(rule[2][1], rule[2][1]) for rule in rules)
+        self.category_actions = (None,) + tuple(category_codes.get(rule[3][1], rule[3][1]) for rule in rules)
+        self.patterns = {}
+        self.actions = {}
+        for profile, index, codes in (('parser', 2, parser_codes), ('category', 3, category_codes)):
+            own = [rule for rule in rules if rule[index][0] is not None]
+            self.patterns[profile] = _master(rule[index][0] for rule in own)
+            self.actions[profile] = (None,) + tuple(codes.get(rule[index][1], rule[index][1]) for rule in own)
+        self.parser_codes = parser_codes
+        self.category_codes = category_codes
+
+    def scan(self, data, profiles=PROFILES, errors=None):
+        """Recorre 'data' y retorna {perfil: ParserTokens / CategoryTokens}
+
+        errors: dónde se registran los errores del perfil 'parser' (por ejemplo un
+        LEX_C.Diagnostics con límite); si add() retorna False ese perfil se detiene.
+        """
+        unknown = set(profiles) - set(PROFILES)
+        if unknown:
+            raise ValueError(f"Perfil desconocido: {sorted(unknown)} (opciones: {', '.join(PROFILES)})")
+        scan = _Scan(self, data, errors if errors is not None else _Errors())
+        if 'parser' in profiles and 'category' in profiles:
+            scan.run_combined()
+            return {'parser': scan.parser, 'category': scan.category}
+        if 'parser' in profiles:
+            step = scan.parser_step
+            result = {'parser': scan.parser}
+        else:
+            step = scan.category_step
+            result = {'category': scan.category}
+        pos = 0
+        while pos < scan.size:
+            pos = step(pos)
+        return result
+
+class _Scan:
+    """Estado de un recorrido: posición de cada perfil, línea, rachas de errores del parser"""
+    def __init__(self, engine, data, errors):
+        self.engine = engine
+        self.data = data
+        self.size = len(data)
+        self.parser = ParserTokens(errors)
+        self.category = CategoryTokens()
+        self.lineno = 1
+        self.skip_until = 0     # fin de la última racha de caracteres ilegales del parser
+        self.stopped = False    # el perfil 'parser' llegó a su límite de errores
+
+    # ---------- perfil 'parser' ----------
+
+    def parser_token(self, code, start, length):
+        parser = self.parser
+        parser.types.append(code)
+        parser.lineno.append(self.lineno)
+        parser.lexpos.append(start)
+        parser.length.append(length)
+
+    def parser_illegal(self, pos):
+        """Error en pos, salvo que pos esté dentro de una racha ya reportada"""
+        if pos < self.skip_until or self.stopped:
+            return
+        length, message = illegal_run(self.data, pos)
+        self.skip_until = pos + length
+        if not self.parser.errors.add(message):
+            self.stopped = True
+
+    def parser_split(self, text, start):
+        """Tokens y errores del parser para un lexema que 'category' ve como uno solo"""
+        codes = self.engine.parser_codes
+        if text[0].isdigit():
+            dot = text.index('.')
+            self.parser_token(codes['NUMBER'], start, dot)
+            self.parser_illegal(start + dot)
+            if not self.stopped:
+                self.parser_token(codes['NUMBER'], start + dot + 1, len(text) - dot - 1)
+            return
+        if text[0] == '!':
+            self.parser_illegal(start)
+        else:
+            self.parser_token(codes[PARSER_SYMBOLS[text[0]]], start, 1)
+        if not self.stopped:
+            self.parser_token(codes['IGUALS'], start + 1, 1)
+
+    def parser_step(self, pos):
+        """Un token (o error) del perfil 'parser' con su propia expresión; retorna la nueva posición"""
+        if self.stopped:
+            return self.size
+        if pos < self.skip_until:
+            return self.skip_until
+        data = self.data
+        m = self.engine.patterns['parser'].match(data, pos)
+        if m is None:
+            start = IGNORED.match(data, pos).end()
+            if start >= self.size:
+                return self.size
+            self.parser_illegal(start)
+            return self.size if self.stopped else self.skip_until
+        group = m.lastindex
+        start = m.start(group)
+        end = m.end()
+        action = self.engine.actions['parser'][group]
+        if action == NEWLINE:
+            self.lineno += end - start
+        elif action == WORD:
+            self.parser_token(self.engine.parser_codes[PARSER_KEYWORDS.get(m.group(group), 'ID')], start, end - start)
+        elif action == SYMBOL:
+            self.parser_token(self.engine.parser_codes[PARSER_SYMBOLS[m.group(group)]], start, end - start)
+        elif action != SKIP:
+            self.parser_token(action, start, end - start)
+        return end
+
+    # ---------- perfil 'category' ----------
+
+    def category_error(self, pos):
+        self.category.errors.append(f"Carácter ilegal '{self.data[pos]}' en la posición {pos}")
+
+    def category_step(self, pos):
+        """Un token (o error) del perfil 'category' con su propia expresión; retorna la nueva posición"""
+        data = self.data
+        m = self.engine.patterns['category'].match(data, pos)
+        if m is None:
+            start = IGNORED.match(data, pos).end()
+            if start >= self.size:
+                return self.size
+            self.category_error(start)
+            return start + 1
+        group = m.lastindex
+        start = m.start(group)
+        end = m.end()
+        action = self.engine.actions['category'][group]
+        if action != SKIP:
+            text = m.group(group)
+            if action == WORD:
+                action = category_word(self.data, text, start)
+            elif action == SYMBOL:
+                action = self.engine.category_codes[CATEGORY_SYMBOLS[text]]
+            self.category.codes.append(action)
+            self.category.values.append(text)
+        return end
+
+    # ---------- los dos perfiles en un recorrido ----------
+
+    def resync(self, pos):
+        """Avanza cada perfil con su propia expresión (el que va atrás) hasta que coinciden"""
+        parser_pos = self.parser_step(pos)
+        category_pos = pos
+        while parser_pos != category_pos:
+            if parser_pos < category_pos:
+                parser_pos = self.parser_step(parser_pos)
+            else:
+                category_pos = self.category_step(category_pos)
+        return parser_pos
+
+    def run_combined(self):
+        engine = self.engine
+        data = self.data
+        size = self.size
+        match = engine.combined.match
+        parser_actions = engine.parser_actions
+        category_actions = engine.category_actions
+        parser_codes = engine.parser_codes
+        category_codes = engine.category_codes
+        keywords = PARSER_KEYWORDS
+        parser_symbols = PARSER_SYMBOLS
+        category_symbols = CATEGORY_SYMBOLS
+        category_keywords = CATEGORY_KEYWORDS
+        word_char = WORD_CHAR.match
+        id_code = parser_codes['ID']
+        parser = self.parser
+        add_type = parser.types.append
+        add_line = parser.lineno.append
+        add_pos = parser.lexpos.append
+        add_length = parser.length.append
+        add_code = self.category.codes.append
+        add_value = self.category.values.append
+        pos = 0
+        while pos < size:
+            m = match(data, pos)
+            if m is None:
+                start = IGNORED.match(data, pos).end()
+                if start >= size:
+                    break
+                # Ningún lexema empieza aquí: error en los dos perfiles
+                self.category_error(start)
+                self.parser_illegal(start)
+                pos = start + 1
+                continue
+            group = m.lastindex
+            start = m.start(group)
+            end = pos = m.end()
+            action = parser_actions[group]
+            if action == DIVERGE:
+                pos = self.resync(start)
+                continue
+            text = m.group(group)
+            # ---- perfil 'parser' ----
+            if action == NEWLINE:
+                self.lineno += end - start
+            elif self.stopped or action == SKIP:
+                pass
+            elif action == WORD:
+                add_type(parser_codes[keywords[text]] if text in keywords else id_code)
+                add_line(self.lineno)
+                add_pos(start)
+                add_length(end - start)
+            elif action == SYMBOL:
+                add_type(parser_codes[parser_symbols[text]])
+                add_line(self.lineno)
+                add_pos(start)
+                add_length(end - start)
+            elif action == SPLIT:
+                self.parser_split(text, start)
+            elif action == ILLEGAL:
+                self.parser_illegal(start)
+            else:
+                add_type(action)
+                add_line(self.lineno)
+                add_pos(start)
+                add_length(end - start)
+            # ---- perfil 'category' ----
+            action = category_actions[group]
+            if action == SKIP:
+                continue
+            if action == WORD:
+                action = 0 if text in category_keywords and not (
+                    start and word_char(data, start - 1) or word_char(data, end)) else 1
+            elif action == SYMBOL:
+                action = category_codes[category_symbols[text]]
+            add_code(action)
+            add_value(text)
+
+ENGINE = LexerEngine()
+
+def scan(data, profiles=PROFILES, errors=None):
+    """ENGINE.scan: {perfil: tokens} de un solo recorrido del código"""
+    return ENGINE.scan(data, profiles, errors)
@@ -0,0 +1,422 @@
+# Team 1 - Subject: Compilers
+# Members:
+# 1. Cano Nieto Carlos Arturo
+# 2. Cortes Bolaños Luis Angel
+# 3. Martinez Garcia Luis Angel
+# 4. Rodriguez Jaramillo Alejandro
+# 5. Urbano Meza Joseph Gael
+
+# Backend de ejecución: compila el AST de PARSER_C a bytecode y lo ejecuta en una VM.
+#
+# La VM usa un acumulador: cada expresión deja su valor en 'acc' y solo los
+# operandos derechos complejos pasan por la pila. Las variables y las constantes
+# viven en el mismo arreglo de slots, así que 'x = y + 1' son tres instrucciones
+# (LOAD y, ADD slot_de_1, STORE x). El código es un array('i') de pares
+# (opcode, argumento).
+#
+# Semántica (la misma que el constant folding de PARSER_C): enteros, '/' es división
+# entera y x / 0 = 0, las comparaciones dan 1 o 0, una variable declarada vale 0.
+# Sí se respeta el flujo de control de if/else y 'return' termina main.
+#
+# interpret() es un intérprete que recorre el árbol con la misma semántica; sirve
+# como referencia para probar la VM y para comparar su velocidad.
+
+from array import array
+
+from AST_C import BinOp, Number, Id, Declaration, Assignment, If, Printf, Return
+from PARSER_C import FOLD_OPERATORS, SymbolTable, evaluate_expression, parse_result
+
+# ==================== INSTRUCTION SET ====================
+
+LOAD = 0        # acc = slots[arg]
+STORE = 1       # slots[arg] = acc
+PUSH = 2        # pila <- acc
+JUMP_IF_FALSE = 3   # si acc == 0, salta a arg
+JUMP = 4        # salta a arg
+PRINT = 5       # salida <- strings[arg]
+RETURN = 6      # termina main con acc
+RETURN_NONE = 7     # termina main sin valor ('return;')
+# Operaciones binarias acc = acc OP derecho: con el derecho en slots[arg] ...
+ADD, SUB, MUL, DIV, GT, LT, EQ = range(8, 15)
+# ... o en el tope de la pila (se saca)
+ADD_S, SUB_S, MUL_S, DIV_S, GT_S, LT_S, EQ_S = range(15, 22)
+
+BINARY_OPS = {'+': ADD, '-': SUB, '*': MUL, '/': DIV, '>': GT, '<': LT, '==': EQ}
+STACK_OFFSET = ADD_S - ADD
+
+OPCODE_NAMES = {LOAD: 'LOAD', STORE: 'STORE', PUSH: 'PUSH', JUMP_IF_FALSE: 'JUMP_IF_FALSE',
+                JUMP: 'JUMP', PRINT: 'PRINT', RETURN: 'RETURN', RETURN_NONE: 'RETURN_NONE'}
+for _symbol, _opcode in BINARY_OPS.items():
+    OPCODE_NAMES[_opcode] = f"BINARY {_symbol}"
+    OPCODE_NAMES[_opcode + STACK_OFFSET] = f"BINARY_STACK {_symbol}"
+
+class CompileError(Exception):
+    """El programa no se puede compilar (errores de sintaxis o semánticos)"""
+    pass
+
+class Bytecode:
+    """Programa compilado: código, valores iniciales de los slots y textos de printf"""
+    def __init__(self, code, slots, strings, names, slot_names):
+        self.code = code                # array('i'): opcode, argumento, opcode, argumento, ...
+        self.slots = slots              # valores iniciales (variables en None hasta declararse, luego las constantes)
+        self.strings = strings          # textos de printf
+        self.names = names              # {nombre: slot} de las variables globales de main
+        self.slot_names = slot_names    # slot -> nombre (variables) para disassemble
+
+    def __len__(self):
+        return len(self.code) // 2
+
+    def disassemble(self):
+        """Listado legible del bytecode"""
+        lines = []
+        code = self.code
+        for pc in range(0, len(code), 2):
+            op, arg = code[pc], code[pc + 1]
+            name = OPCODE_NAMES[op]
+            if op in (LOAD, STORE) or ADD <= op <= EQ:
+                if arg < len(self.slot_names):
+                    detail = f"{arg} ({self.slot_names[arg]})"
+                else:
+                    detail = f"{arg} (={self.slots[arg]})"
+            elif op in (JUMP, JUMP_IF_FALSE):
+                detail = str(arg // 2)
+            elif op == PRINT:
+                detail = f"{arg} ({self.strings[arg]!r})"
+            else:
+                detail = ""
+            lines.append(f"{pc // 2:6}  {name:<18}{detail}")
+        return "\n".join(lines)
+
+class ExecutionResult:
+    """Resultado de ejecutar main: valor de return, salida de printf y variables globales"""
+    def __init__(self, return_value, output, variables, instructions=None):
+        self.return_value = return_value
+        self.output = output            # textos de printf en orden
+        self.variables = variables      # {nombre: valor} de las variables globales de main
+        self.instructions = instructions    # instrucciones ejecutadas (solo la VM)
+
+    def __eq__(self, other):
+        return (isinstance(other, ExecutionResult) and self.return_value == other.return_value
+                and self.output == other.output and self.variables == other.variables)
+
+    def __repr__(self):
+        return (f"ExecutionResult(return_value={self.return_value!r}, output={len(self.output)} lines, "
+                f"variables={self.variables!r})")
+
+# ==================== COMPILER ====================
+
+_NOT_CONSTANT = object()
+
+def _constant_values(expr):
+    """{id(nodo): valor} de las subexpresiones sin variables (se compilan como una constante)"""
+    values = {}
+    stack = [(expr, False)]
+    while stack:
+        node, visited = stack.pop()
+        cls = type(node)
+        if cls is Number:
+            values[id(node)] = node.value
+        elif cls is BinOp:
+            if not visited:
+                stack += ((node, True), (node.right, False), (node.left, False))
+                continue
+            left = values.get(id(node.left), _NOT_CONSTANT)
+            right = values.get(id(node.right), _NOT_CONSTANT)
+            if left is not _NOT_CONSTANT and right is not _NOT_CONSTANT:
+                values[id(node)] = FOLD_OPERATORS[node.op](left, right)
+    return values
+
+class Compiler:
+    """Traduce un Program (AST de PARSER_C) a Bytecode"""
+    def __init__(self):
+        self.code = array('i')
+        self.variables = 0
+        self.slot_names = []
+        self.constants = {}     # valor -> slot (los slots de constantes se numeran después)
+        self.strings = {}
+        self.scopes = [{}]      # nombre -> slot, por scope
+        self._constant_refs = []    # posiciones de argumentos que son slots de constantes
+
+    def compile(self, program):
+        if program is None or program[0] != 'program':
+            raise CompileError("No hay un programa que compilar")
+        self._statements(program.statements)
+        # Fin de main sin return: retorna 0
+        self._load(self._constant(0), True)
+        self._emit(RETURN)
+        # Las constantes van después de las variables: se recorren sus argumentos
+        base = self.variables
+        code = self.code
+        for pc in self._constant_refs:
+            code[pc] += base
+        slots = [None] * base + list(self.constants)
+        strings = list(self.strings)
+        return Bytecode(code, slots, strings, dict(self.scopes[0]), self.slot_names)
+
+    def _emit(self, op, arg=0):
+        self.code.append(op)
+        self.code.append(arg)
+        return len(self.code) - 1   # posición del argumento (para saltos y constantes)
+
+    def _constant(self, value):
+        slot = self.constants.get(value)
+        if slot is None:
+            slot = self.constants[value] = len(self.constants)
+        return slot
+
+    def _operand(self, node, constants):
+        """Slot de un operando simple (variable o constante), o None si hay que evaluarlo"""
+        value = constants.get(id(node), _NOT_CONSTANT)
+        if value is not _NOT_CONSTANT:
+            return self._constant(value), True
+        if type(node) is Id:
+            return self._lookup(node), False
+        return None, False
+
+    def _lookup(self, node):
+        name = node.name
+        for scope in reversed(self.scopes):
+            slot = scope.get(name)
+            if slot is not None:
+                return slot
+        raise CompileError(f"Variable '{name}' no declarada en línea {node.lineno}")
+
+    def _load(self, slot, constant):
+        position = self._emit(LOAD, slot)
+        if constant:
+            self._constant_refs.append(position)
+
+    def _expression(self, expr):
+        """Código que deja el valor de la expresión en el acumulador (iterativo: sin límite de profundidad)"""
+        constants = _constant_values(expr)
+        work = [expr]
+        while work:
+            item = work.pop()
+            if type(item) is tuple:
+                op, slot, constant = item
+                if slot is None:
+                    self._emit(op + STACK_OFFSET)
+                else:
+                    position = self._emit(op, slot)
+                    if constant:
+                        self._constant_refs.append(position)
+                continue
+            if item is PUSH:
+                self._emit(PUSH)
+                continue
+            slot, constant = self._operand(item, constants)
+            if slot is not None:
+                self._load(slot, constant)
+                continue
+            if type(item) is not BinOp:
+                raise CompileError(f"Expresión inválida en línea {item.lineno}: {item[0]}")
+            op = BINARY_OPS[item.op]
+            slot, constant = self._operand(item.right, constants)
+            if slot is not None:
+                # acc = izquierda; acc = acc OP slot
+                work += ((op, slot, constant), item.left)
+            else:
+                # acc = derecha; pila <- acc; acc = izquierda; acc = acc OP pila
+                work += ((op, None, False), item.left, PUSH, item.right)
+
+    def _statements(self, statements):
+        # Pila de (sentencias, índice, acción al terminar el bloque): los if anidados no usan recursión
+        pending = [(statements, 0, None)]
+        while pending:
+            body, index, on_exit = pending.pop()
+            if index == len(body):
+                if on_exit is not None:
+                    on_exit()
+                continue
+            pending.append((body, index + 1, on_exit))
+            node = body[index]
+            cls = type(node)
+            if cls is Declaration:
+                scope = self.scopes[-1]
+                slot = scope[node.name] = self.variables
+                self.variables += 1
+                self.slot_names.append(node.name)
+                # Declarar la pone en 0 (una variable oculta puede haber tenido otro valor antes)
+                self._load(self._constant(0), True)
+                self._emit(STORE, slot)
+            elif cls is Assignment:
+                self._expression(node.expr)
+                self._emit(STORE, self._lookup(node))
+            elif cls is Printf:
+                text = node.text
+                index_of = self.strings.get(text)
+                if index_of is None:
+                    index_of = self.strings[text] = len(self.strings)
+                self._emit(PRINT, index_of)
+            elif cls is Return:
+                if node.value is None:
+                    self._emit(RETURN_NONE)
+                else:
+                    self._expression(node.value)
+                    self._emit(RETURN)
+            elif cls is If:
+                self._if(node, pending)
+            else:
+                raise CompileError(f"Sentencia inválida en línea {node.lineno}: {node[0]}")
+
+    def _if(self, node, pending):
+        """Agenda el if: condición, cuerpo (con su scope), salto al final y else"""
+        self._expression(node.cond)
+        jump_false = self._emit(JUMP_IF_FALSE)
+        code = self.code
+        scopes = self.scopes
+
+        def end_else():
+            scopes.pop()
+            code[jump_end[0]] = len(code)
+
+        def end_body():
+            scopes.pop()
+            if node.orelse is None:
+                code[jump_false] = len(code)
+                return
+            jump_end.append(self._emit(JUMP))
+            code[jump_false] = len(code)
+            scopes.append({})
+            pending.append((node.orelse.body, 0, end_else))
+
+        jump_end = []
+        scopes.append({})
+        pending.append((node.body, 0, end_body))
+
+def compile_program(program):
+    """Bytecode de un Program de PARSER_C (sin errores semánticos)"""
+    return Compiler().compile(program)
+
+def compile_code(code):
+    """Parsea y compila código fuente; CompileError si tiene errores de sintaxis o semánticos"""
+    result = parse_result(code)
+    if not result.parsing_success or result.semantic_errors:
+        errors = result.semantic_errors or ["el parse no terminó"]
+        raise CompileError(f"El programa tiene errores: {errors[0]}")
+    return compile_program(result.ast)
+
+# ==================== VIRTUAL MACHINE ====================
+
+def execute(bytecode, count_instructions=False):
+    """Ejecuta main y retorna su ExecutionResult
+
+    El ciclo de despacho es una sola función con todo en variables locales y los
+    opcodes más frecuentes primero. count_instructions cuenta las instrucciones
+    ejecutadas (un poco más lento).
+    """
+    code = bytecode.code
+    slots = list(bytecode.slots)
+    strings = bytecode.strings
+    output = []
+    emit = output.append
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    acc = 0
+    pc = 0
+    executed = 0
+    while True:
+        op = code[pc]
+        arg = code[pc + 1]
+        pc += 2
+        if count_instructions:
+            executed += 1
+        if op == LOAD:
+            acc = slots[arg]
+        elif op == STORE:
+            slots[arg] = acc
+        elif op == ADD:
+            acc = acc + slots[arg]
+        elif op == SUB:
+            acc = acc - slots[arg]
+        elif op == MUL:
+            acc = acc * slots[arg]
+        elif op == DIV:
+            right = slots[arg]
+            acc = acc // right if right != 0 else 0
+        elif op == JUMP_IF_FALSE:
+            if not acc:
+                pc = arg
+        elif op == JUMP:
+            pc = arg
+        elif op == GT:
+            acc = 1 if acc > slots[arg] else 0
+        elif op == LT:
+            acc = 1 if acc < slots[arg] else 0
+        elif op == EQ:
+            acc = 1 if acc == slots[arg] else 0
+        elif op == PRINT:
+            emit(strings[arg])
+        elif op == PUSH:
+            push(acc)
+        elif op == ADD_S:
+            acc = acc + pop()
+        elif op == SUB_S:
+            acc = acc - pop()
+        elif op == MUL_S:
+            acc = acc * pop()
+        elif op == DIV_S:
+            right = pop()
+            acc = acc // right if right != 0 else 0
+        elif op == GT_S:
+            acc = 1 if acc > pop() else 0
+        elif op == LT_S:
+            acc = 1 if acc < pop() else 0
+        elif op == EQ_S:
+            acc = 1 if acc == pop() else 0
+        elif op == RETURN:
+            value = acc
+            break
+        elif op == RETURN_NONE:
+            value = None
+            break
+        else:
+            raise RuntimeError(f"Opcode inválido {op} en {pc // 2 - 1}")
+    # Las globales declaradas después de un return no llegaron a existir (siguen en None)
+    variables = {name: slots[slot] for name, slot in bytecode.names.items() if slots[slot] is not None}
+    return ExecutionResult(value, output, variables, executed if count_instructions else None)
+
+def run_code(code, count_instructions=False):
+    """Compila y ejecuta código fuente"""
+    return execute(compile_code(code), count_instructions)
+
+# ==================== TREE-WALKING INTERPRETER ====================
+
+def interpret(program):
+    """Ejecuta main recorriendo el AST (referencia para la VM); mismo ExecutionResult"""
+    table = SymbolTable()
+    output = []
+    value = 0
+    # Pila de (sentencias, índice, abrió un scope): sin recursión para los if anidados
+    pending = [(program.statements, 0, False)]
+    while pending:
+        body, index, scoped = pending.pop()
+        if index == len(body):
+            if scoped:
+                table.exit_scope()
+            continue
+        pending.append((body, index + 1, scoped))
+        node = body[index]
+        cls = type(node)
+        if cls is Declaration:
+            table.add_symbol(node.name, node.tipo.name, 0)
+        elif cls is Assignment:
+            table.update_symbol(node.name, evaluate_expression(node.expr, table))
+        elif cls is Printf:
+            output.append(node.text)
+        elif cls is Return:
+            value = evaluate_expression(node.value, table) if node.value is not None else None
+            break
+        elif cls is If:
+            branch = node.body if evaluate_expression(node.cond, table) else (
+                node.orelse.body if node.orelse is not None else None)
+            if branch is not None:
+                table.enter_scope()
+                pending.append((branch, 0, True))
+        else:
+            raise CompileError(f"Sentencia inválida en línea {node.lineno}: {node[0]}")
+    while table.depth:
+        table.exit_scope()
+    variables = {name: symbol.value for name, symbol in table.symbols.items()}
+    return ExecutionResult(value, output, variables)
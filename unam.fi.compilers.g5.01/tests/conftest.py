@@ -0,0 +1,6 @@
+# Los módulos del compilador se importan por nombre (import PARSER_C), como lo
+# hacen entre ellos: la carpeta del compilador va en sys.path.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
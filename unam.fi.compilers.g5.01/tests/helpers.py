@@ -0,0 +1,66 @@
+# Funciones de apoyo de las pruebas: entradas fijas y versiones de referencia.
+# Son copias propias (no se importan de BENCH_C), así que cambiar un benchmark no
+# cambia lo que las pruebas comparan.
+
+import importlib.util
+import os
+
+LEGACY_LEXER = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            'Lexer', 'LEX_C.py')
+
+def synthetic_program(statements):
+    """Programa válido con el número de sentencias indicado (el mismo texto para el mismo número)"""
+    lines = ["int main(){", "    int x;", "    int y;"]
+    for i in range(statements):
+        if i % 4 == 0:
+            lines.append(f"    x = {i} * 2 + y;")
+        elif i % 4 == 1:
+            lines.append(f"    y = (x - {i}) / 3;")
+        elif i % 4 == 2:
+            lines.append("    if (x > y){ printf(\"mayor\"); }else{ x = 1; }")
+        else:
+            lines.append("    printf(\"linea\");")
+    lines.append("    return 0;")
+    lines.append("}")
+    return "\n".join(lines)
+
+def load_legacy_lexer(path=LEGACY_LEXER):
+    """Lexer/LEX_C.py como módulo aparte (tiene el mismo nombre que el LEX_C del compilador)"""
+    spec = importlib.util.spec_from_file_location('LEGACY_LEX_C', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def legacy_analyze_code(module, code):
+    """analyze_code original de Lexer/LEX_C (cadena if/elif y listas por categoría) sobre el lexer de module
+
+    Retorna (reporte, {categoría: [valores]}, número de errores).
+    """
+    module.lexer.input(code)
+    tokens_by_type = {"Keywords": [], "Identifiers": [], "Operators": [], "Constants": [],
+                      "Punctuation": [], "Literals": []}
+    total_tokens = 0
+    for tok in module.lexer:
+        total_tokens += 1
+        if tok.type == "KEYWORDS":
+            tokens_by_type["Keywords"].append(tok.value)
+        elif tok.type == "IDENTIFIER":
+            tokens_by_type["Identifiers"].append(tok.value)
+        elif tok.type == "OPERATOR":
+            tokens_by_type["Operators"].append(tok.value)
+        elif tok.type == "CONSTANT":
+            tokens_by_type["Constants"].append(tok.value)
+        elif tok.type == "PUNCTUATION":
+            tokens_by_type["Punctuation"].append(tok.value)
+        elif tok.type == "LITERAL":
+            tokens_by_type["Literals"].append(tok.value)
+    result = "\n"
+    for error in module.errores:
+        result += f"{error}\n"
+    result += "\n=== Tokens ===\n"
+    for key, values in tokens_by_type.items():
+        result += f"{key}: {values}\n"
+    result += f"\nTotal de tokens = {total_tokens}"
+    errors = len(module.errores)
+    module.errores.clear()
+    return result, tokens_by_type, errors
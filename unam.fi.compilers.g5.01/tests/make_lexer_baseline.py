@@ -0,0 +1,88 @@
+"""Genera tests/data/lexer_baseline.json con la salida de los lexers del commit base
+
+Uso (desde la carpeta del compilador): python tests/make_lexer_baseline.py
+
+Los dos LEX_C originales (el del compilador y el de Lexer/) se sacan de git tal
+como estaban en BASELINE y se ejecutan sobre un corpus fijo. Para cada código se
+guardan los tokens del parser (tipo, valor, línea, posición), sus errores léxicos y
+el reporte de categorías. El corpus también queda en el archivo, así que el
+resultado no depende de GEN_C ni de SCANNER_C.
+"""
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+BASELINE = '6fad92a'
+HERE = os.path.dirname(os.path.abspath(__file__))
+COMPILER_DIR = os.path.dirname(HERE)
+OUTPUT = os.path.join(HERE, 'data', 'lexer_baseline.json')
+
+# Casos a mano: cada regla, palabras que empiezan con una palabra reservada, rachas de
+# caracteres ilegales, comillas sin cerrar, encabezados y saltos de línea de Windows
+CASES = [
+    "", "   \t ", "\n\n\n", "int x;", "int main(){ return 0; }",
+    "iffy interval printfx elsewhere returned charm shorts double_ int9 if9x floaty longer",
+    "if else int float char double long short return printf while for",
+    "007 3.14 1.2.3 12ab a12 _x __ x_1",
+    "a<=b a>=b a!=b a==b a===b a<==b a=b a<b a>b",
+    "+-*/ (){}; [],.: !",
+    '"hola" "a\\"b" "" "sin cerrar\n"dos\nlineas" "tab\t"',
+    "#include <stdio.h>\n#include \"x.h\"\n#include\n<a.h>\n#define X 1\n# include <b.h>",
+    "@ @@@ $$$$$$$$$$$$$$ ñandú café ¿x? `~^&|%",
+    "x = 1;\r\ny = 2;\r\n", "x\x0cy\x0bz", "// comentario\n/* bloque */",
+]
+
+PIECES = list('abz_09 \t\n\r"\\<>=!.,[]:;(){}+-*/#@$ñ') + [
+    '3.14', '<==', '!==', '>=', 'int ', 'if', 'printf', 'while', '"s"', '"a\\"b"', '#include <a.h>', 'iffy']
+
+def corpus():
+    sys.path.insert(0, COMPILER_DIR)
+    import GEN_C
+    codes = []
+    for name in sorted(os.listdir(COMPILER_DIR)):
+        if name.endswith('.txt'):
+            with open(os.path.join(COMPILER_DIR, name), encoding='utf-8') as file:
+                codes.append(file.read())
+    codes += CASES
+    codes += [GEN_C.generate_program(30, seed=seed, errors=seed) for seed in range(3)]
+    rng = random.Random(6)
+    codes += ["".join(rng.choice(PIECES) for _ in range(rng.randint(1, 40))) for _ in range(80)]
+    return codes
+
+def load_baseline(path, name, directory):
+    """El módulo 'path' como estaba en BASELINE (PLY necesita el módulo en sys.modules)"""
+    source = subprocess.run(['git', 'show', f'{BASELINE}:{path}'], cwd=COMPILER_DIR, check=True,
+                            capture_output=True).stdout
+    filename = os.path.join(directory, name + '.py')
+    with open(filename, 'wb') as file:
+        file.write(source)
+    spec = importlib.util.spec_from_file_location(name, filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        parser_lex = load_baseline('unam.fi.compilers.g5.01/LEX_C.py', 'BASELINE_LEX_C', directory)
+        category_lex = load_baseline('Lexer/LEX_C.py', 'BASELINE_LEGACY_LEX_C', directory)
+    cases = []
+    for code in corpus():
+        # El lexer original nunca reinicia la línea ni los errores entre análisis
+        parser_lex.lexer.lineno = 1
+        parser_lex.erroresLEX.clear()
+        tokens = [[token['type'], token['value'], token['lineno'], token['lexpos']]
+                  for token in parser_lex.analyze_code(code)]
+        cases.append({'code': code, 'tokens': tokens, 'errors': parser_lex.get_lexical_errors(),
+                      'report': category_lex.analyze_code(code)})
+    os.makedirs(os.path.dirname(OUTPUT), exist_ok=True)
+    with open(OUTPUT, 'w', encoding='utf-8', newline='\n') as file:
+        file.write("[\n" + ",\n".join(json.dumps(case, ensure_ascii=False) for case in cases) + "\n]\n")
+    print(f"{len(cases)} casos en {OUTPUT}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import pickle
+
+import pytest
+
+import PARSER_C
+from AST_C import BinOp, Declaration, Id, InvalidDeclaration, Number, Program, Tipo
+
+def test_indices_match_tuple_form():
+    node = BinOp('+', Number(1), Number(2))
+    form = node.astuple()
+    for index in range(-len(form), len(form)):
+        expected = node[index]
+        assert (expected.astuple() if hasattr(expected, 'astuple') else expected) == form[index]
+    assert node[-1] == Number(2) and node[-3] == '+'
+    assert node[1:] == ('+', Number(1), Number(2)) and node[::-1][0] == Number(2)
+    with pytest.raises(IndexError):
+        node[4]
+    with pytest.raises(IndexError):
+        node[-5]
+
+def test_equality_by_kind_and_fields():
+    a = Declaration(Tipo('int'), 'x', lineno=1, lexpos=0)
+    assert a == Declaration(Tipo('int'), 'x', lineno=7, lexpos=40)
+    assert hash(a) == hash(Declaration(Tipo('int'), 'x'))
+    assert a != Declaration(Tipo('float'), 'x')
+    assert a != InvalidDeclaration(Tipo('int'), 'x')
+    assert Number(1) != Id('x') and Number(1) != ('number', 1) and Number(1).astuple() == ('number', 1)
+    assert len({Number(1), Number(1), Number(2)}) == 2
+    assert Program([Number(1)]) != Program([Number(1), Number(1)])
+
+def test_parsed_trees_compare_by_value():
+    code = "int main(){ int x; x = 1 + 2; if (x > 1) { x = 3; } return x; }"
+    first = PARSER_C.parse_result(code).ast
+    second = PARSER_C.parse_result("\n\n" + code).ast
+    assert first is not second and first == second and hash(first) == hash(second)
+    assert first != PARSER_C.parse_result(code.replace("1 + 2", "1 + 3")).ast
+
+def test_deep_tree_equality_without_recursion():
+    left = right = Number(0)
+    for i in range(50_000):
+        left = BinOp('+', left, Number(i))
+        right = BinOp('+', right, Number(i))
+    assert left == right and hash(left) == hash(right) == hash(pickle.loads(pickle.dumps(left)))
+    assert left != BinOp('+', left.left, Number(-1))
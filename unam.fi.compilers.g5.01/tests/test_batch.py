@@ -0,0 +1,58 @@
+import json
+
+import BATCH_C
+
+GOOD = "int main() { int x; x = 4 * 5; return x; }"
+BAD = "int main() { int x x = ; }"
+
+def write_sources(folder, count):
+    paths = []
+    for i in range(count):
+        path = folder / f"p{i:03d}.c"
+        path.write_text(BAD if i % 5 == 4 else GOOD)
+        paths.append(str(path))
+    return paths
+
+def test_main_writes_json_lines_and_summary(tmp_path, capsys):
+    sources = tmp_path / "src"
+    (sources / "sub").mkdir(parents=True)
+    paths = write_sources(sources, 12) + write_sources(sources / "sub", 3)
+    (sources / "notes.md").write_text("no se analiza")
+    output = tmp_path / "out.jsonl"
+    status = BATCH_C.main([str(sources), '-j', '2', '--chunksize', '2', '-o', str(output)])
+    results = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert status == 1
+    assert [result['file'] for result in results] == sorted(paths)
+    failed = [result['file'] for result in results if not result['parsing_success']]
+    assert len(failed) == 2 and all(path.endswith('p004.c') or path.endswith('p009.c') for path in failed)
+    assert all(result['tokens'] > 0 and 'seconds' in result for result in results)
+    tokens = sum(result['tokens'] for result in results)
+    summary = capsys.readouterr().err
+    assert "=== BATCH SUMMARY ===" in summary
+    assert f"Files: {len(paths)} (2 failed to parse)\n" in summary
+    assert f"Tokens: {tokens}\n" in summary
+    assert "Throughput:" in summary and "Cache:" not in summary
+
+def test_main_to_stdout(tmp_path, capsys):
+    path = write_sources(tmp_path, 1)[0]
+    assert BATCH_C.main([path, '-j', '1']) == 0
+    out, err = capsys.readouterr()
+    result = json.loads(out)
+    assert result['file'] == path and result['parsing_success']
+    assert "Files: 1 (0 failed to parse)" in err
+
+def test_files_are_submitted_in_bounded_windows(tmp_path, monkeypatch):
+    monkeypatch.setattr(BATCH_C, 'TASKS_PER_WORKER', 2)
+    paths = write_sources(tmp_path, 40)
+    consumed = []
+
+    def listed():
+        for path in paths:
+            consumed.append(path)
+            yield path
+    results = BATCH_C.run_batch(listed(), workers=1, chunksize=3)
+    first = next(results)
+    # Una ventana de 2 tareas de 3 archivos; las siguientes se envían al consumir resultados
+    assert first['file'] == paths[0] and len(consumed) == 2 * 3
+    rest = list(results)
+    assert [result['file'] for result in [first] + rest] == paths
@@ -0,0 +1,43 @@
+import BATCH_C
+import CACHE_C
+import PARSER_C
+
+CODE = "int main() { int x; x = 4 * 5; if (x > 3) { int y; y = x; } return 0; }"
+
+def test_hits_are_independent_results():
+    cache = CACHE_C.ResultCache()
+    first = PARSER_C.parse_result(CODE, cache=cache)
+    second = PARSER_C.parse_result(CODE, cache=cache)
+    third = PARSER_C.parse_result(CODE, cache=cache)
+    assert cache.hits == 2
+    assert second is not third and second.ast is not third.ast
+    assert not first.cached and second.cached
+    # Leer un resultado (reporte, IR) no cambia lo que reciben los demás
+    second.to_text()
+    second.ir()
+    assert third.timings == {}
+    assert third._text is None
+    assert second.symbols['x'] is not third.symbols['x']
+    assert third.to_text() == first.to_text()
+    assert third.to_dict(include_ast=False)['symbols'] == first.to_dict(include_ast=False)['symbols']
+
+def test_disk_hit_has_no_timings(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    PARSER_C.parse_result(CODE, cache=CACHE_C.ResultCache(path=path))
+    loaded = PARSER_C.parse_result(CODE, cache=CACHE_C.ResultCache(path=path))
+    data = loaded.to_dict()
+    assert data['cached'] and data['timings'] == {}
+
+def test_batch_cache_drops_timings(tmp_path):
+    source = tmp_path / "main.c"
+    source.write_text(CODE)
+    BATCH_C._init_worker(cache_path=str(tmp_path / "batch.sqlite"))
+    try:
+        fresh = BATCH_C.analyze_file(str(source))
+        reused = BATCH_C.analyze_file(str(source))
+    finally:
+        BATCH_C._cache.close()
+        BATCH_C._session = BATCH_C._cache = None
+    assert not fresh['cached'] and 'timings' in fresh
+    assert reused['cached'] and 'timings' not in reused
+    assert reused['symbols'] == fresh['symbols']
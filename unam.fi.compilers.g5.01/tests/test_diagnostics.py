@@ -0,0 +1,55 @@
+import pytest
+
+import LEX_C
+
+CODE = "int a; @@@ b; $$$$$$$$$$$$$$ c; ` d;"
+RUNS = [
+    "Caracteres ilegales '@@@' en posiciones 7-9",
+    "Caracteres ilegales '$$$$$$$$$$...' en posiciones 14-27",
+    "Carácter ilegal '`' en posición 32",
+]
+
+def lex(code, backend, **options):
+    lexer_obj = LEX_C.new_lexer(backend)
+    tokens = [(tok.type, tok.value, tok.lexpos) for tok in LEX_C.iter_tokens(code, lexer_obj, **options)]
+    return tokens, lexer_obj.errors
+
+def test_diagnostics_cap():
+    errors = LEX_C.Diagnostics(max_errors=2)
+    assert errors.add('a') and not errors.aborted
+    assert not errors.add('b') and errors.aborted
+    assert list(errors) == ['a', 'b'] and len(errors) == 2 and errors[-1] == 'b'
+    unlimited = LEX_C.Diagnostics()
+    assert all(unlimited.add(str(i)) for i in range(1000)) and not unlimited.aborted
+
+@pytest.mark.parametrize('backend', LEX_C.LEXER_BACKENDS)
+@pytest.mark.parametrize('stream', [False, True], ids=['str', 'chunks'])
+def test_illegal_run_is_one_error(backend, stream):
+    code = CODE.encode() if stream else CODE
+    tokens, errors = lex(code, backend, chunk_size=4)
+    assert list(errors) == RUNS and not errors.aborted
+    assert ('ID', 'c', 29) in tokens and ('ID', 'd', 34) in tokens
+
+@pytest.mark.parametrize('backend', LEX_C.LEXER_BACKENDS)
+@pytest.mark.parametrize('stream', [False, True], ids=['str', 'chunks'])
+def test_cap_stops_in_the_middle_of_a_run(backend, stream):
+    # El límite se alcanza en la racha de '$' (que en modo streaming cruza varios
+    # bloques de 4 caracteres): se reporta completa una sola vez y no hay más tokens
+    code = CODE.encode() if stream else CODE
+    tokens, errors = lex(code, backend, max_errors=2, chunk_size=4)
+    assert list(errors) == RUNS[:2] and errors.aborted
+    assert tokens == [('INT', 'int', 0), ('ID', 'a', 4), ('SEMICOLON', ';', 5),
+                      ('ID', 'b', 11), ('SEMICOLON', ';', 12)]
+
+@pytest.mark.parametrize('backend', LEX_C.LEXER_BACKENDS)
+def test_cap_on_first_error(backend):
+    tokens, errors = lex("x = 1; " + "@" * 40 + " y = 2;", backend, max_errors=1)
+    assert errors.aborted and len(errors) == 1
+    assert errors[0] == "Caracteres ilegales '@@@@@@@@@@...' en posiciones 7-46"
+    assert [tok[1] for tok in tokens] == ['x', '=', 1, ';']
+
+def test_cap_through_analyze_code():
+    LEX_C.analyze_code(CODE, max_errors=2)
+    assert LEX_C.get_lexical_errors() == RUNS[:2]
+    LEX_C.analyze_code(CODE)
+    assert LEX_C.get_lexical_errors() == RUNS
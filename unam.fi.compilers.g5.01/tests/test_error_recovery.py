@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+import PARSER_C
+from helpers import synthetic_program
+
+SYNTAX_ERRORS = ["x = ;", "int = 3;", "if (x > ) { y = 1; }", "printf(;", "y = (x + 1;",
+                 "return return;", "x y;", "if (x) { y = 1 }", "else { x = 2; }"]
+
+@pytest.mark.parametrize('seed', range(16, 20))
+def test_all_injected_errors_reported_in_one_parse(seed):
+    rng = random.Random(seed)
+    base = synthetic_program(200).split("\n")
+    session = PARSER_C.AnalysisSession()
+    for _ in range(50):
+        lines = list(base)
+        # Un error cada varias líneas: PLY no reporta errores a menos de 3 tokens del anterior
+        for index in sorted(rng.sample(range(3, len(lines) - 2, 5), 6), reverse=True):
+            lines.insert(index, "    " + rng.choice(SYNTAX_ERRORS))
+        expected = {number for number, line in enumerate(lines, 1) if line.strip() in SYNTAX_ERRORS}
+        session.parse("\n".join(lines))
+        assert {line for line, column, message in session.syntax_errors} >= expected
+        assert not session.parsing_success
+        assert session.symbol_table.depth == 0
+        assert all(column >= 1 for line, column, message in session.syntax_errors)
+
+def test_unclosed_block_at_end_of_file():
+    session = PARSER_C.AnalysisSession()
+    session.parse("int main(){ int x; if (x > 1) { x = 2;")
+    assert session.syntax_errors and session.symbol_table.depth == 0
@@ -0,0 +1,28 @@
+import pytest
+
+import PARSER_C
+from AST_C import BinOp, Id, Number
+
+SUM = BinOp('+', Number(2), BinOp('*', Number(3), Number(4)))
+WITH_ID = BinOp('-', Id('x'), Number(1))
+
+@pytest.mark.parametrize('expr', [SUM, SUM.astuple()], ids=['node', 'tuple'])
+def test_constants_fold_without_table(expr):
+    # Forma anterior: evaluate_expression(expr), solo con constantes
+    assert PARSER_C.evaluate_expression(expr) == 14
+    assert PARSER_C.evaluate_expression(expr, None) == 14
+    assert PARSER_C.evaluate_expression(('binop', '/', ('number', 7), ('number', 0))) == 0
+    assert PARSER_C.evaluate_expression(('binop', '==', ('number', 7), ('number', 7))) == 1
+
+@pytest.mark.parametrize('expr', [WITH_ID, WITH_ID.astuple()], ids=['node', 'tuple'])
+def test_variables_need_a_table(expr):
+    assert PARSER_C.evaluate_expression(expr) is None
+    table = PARSER_C.SymbolTable()
+    table.add_symbol('x', 'int', 10)
+    assert PARSER_C.evaluate_expression(expr, table) == 9
+    assert PARSER_C.evaluate_expression(expr, symbol_table=table) == 9
+    assert PARSER_C.evaluate_expression(expr, PARSER_C.SymbolTable()) is None
+
+def test_not_an_expression():
+    assert PARSER_C.evaluate_expression('x') is None
+    assert PARSER_C.evaluate_expression(('id_error', 'x')) is None
@@ -0,0 +1,32 @@
+import pytest
+
+import GEN_C
+import PARSER_C
+
+@pytest.fixture(scope='module')
+def session():
+    return PARSER_C.AnalysisSession()
+
+@pytest.mark.parametrize('seed', range(20, 24))
+def test_valid_programs_pass_sdt(session, seed):
+    generator = GEN_C.ProgramGenerator(seed, max_depth=6)
+    for _ in range(25):
+        result = session.run(generator.program(300))
+        assert result.sdt_verified, result.semantic_errors[:3] or list(result.lexical_errors)[:3]
+
+@pytest.mark.parametrize('seed', range(20, 24))
+def test_injected_errors_are_reported(session, seed):
+    generator = GEN_C.ProgramGenerator(seed, max_depth=6)
+    for _ in range(25):
+        result = session.run(generator.program(300, 5))
+        lines = {line for line, column, message in result.syntax_errors}
+        for line, kind in generator.errors:
+            if kind == 'syntax':
+                assert line in lines
+            elif kind == 'lexical':
+                assert result.lexical_errors
+            else:
+                assert any('undeclared' in error for error in result.semantic_errors)
+
+def test_generator_is_deterministic():
+    assert GEN_C.generate_program(200, seed=7, errors=3) == GEN_C.generate_program(200, seed=7, errors=3)
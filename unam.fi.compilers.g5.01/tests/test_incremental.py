@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+import INCREMENTAL_C
+import PARSER_C
+
+BASE = "int main(){\n    int x;\n    x = 1;\n    if (x > 0) {\n        printf(\"si\");\n    }\n}"
+
+EDITS = [
+    BASE.replace("    int x;\n", "    int x;\n    int y;\n"),
+    BASE.replace("int main(){\n", "int main(){\nint main(){\n"),     # encabezado repetido
+    BASE.replace("    int x;\n", "    int main;\n"),                 # SDT: 'main' ya declarada
+    BASE.replace("    x = 1;\n", "    x = 1 +;\n"),
+    BASE,
+    BASE.replace("x = 1", "x = 2"),
+]
+
+def full_errors(code):
+    session = INCREMENTAL_C.IncrementalAnalyzer.parse_full(code, PARSER_C.AnalysisSession())
+    return session.parsing_success, list(session.semantic_errors)
+
+def test_update_turns_sdt_exceptions_into_diagnostics():
+    analyzer = INCREMENTAL_C.IncrementalAnalyzer()
+    analyzer.update(BASE)
+    for code in EDITS:
+        session = analyzer.update(code)
+        assert (session.parsing_success, list(session.semantic_errors)) == full_errors(code), code
+    assert "Variable 'main' ya está declarada" in INCREMENTAL_C.IncrementalAnalyzer().summary(EDITS[2])
+
+def test_full_parse_can_run_on_a_worker_thread():
+    analyzer = INCREMENTAL_C.IncrementalAnalyzer()
+    assert analyzer.update_incremental(BASE)
+    code = EDITS[2]
+    assert not analyzer.update_incremental(code)
+    results = []
+    worker = threading.Thread(target=lambda: results.append(
+        INCREMENTAL_C.IncrementalAnalyzer.parse_full(code, PARSER_C.AnalysisSession())))
+    worker.start()
+    worker.join()
+    analyzer.finish_full(code, results[0])
+    assert analyzer.last_mode == 'full' and analyzer.update(code) is results[0]
+    # Después del análisis completo el camino incremental sigue funcionando
+    assert analyzer.update_incremental(BASE) and analyzer.last_mode == 'incremental'
+    assert analyzer.session.parsing_success
+
+def test_cancelled_full_parse_raises():
+    session = PARSER_C.AnalysisSession()
+    session.cancel()
+    with pytest.raises(PARSER_C.AnalysisCancelled):
+        INCREMENTAL_C.IncrementalAnalyzer.parse_full(BASE, session, progress=lambda fraction: None)
@@ -0,0 +1,27 @@
+import pytest
+
+import GEN_C
+import IR_C
+import PARSER_C
+import VM_C
+
+def generated(index, statements):
+    generator = GEN_C.ProgramGenerator(22 + index, max_depth=index % 8, early_returns=index % 2 == 0)
+    program = PARSER_C.parse_result(generator.program(statements)).ast
+    return program, VM_C.execute(VM_C.compile_program(program))
+
+@pytest.mark.parametrize('index', range(0, 300, 2))
+def test_ir_matches_vm(index):
+    program, expected = generated(index, 30 + index * 3)
+    function = IR_C.lower(program)
+    assert IR_C.execute(function) == expected
+    for name, run in IR_C.PASSES:
+        single = IR_C.lower(program)
+        run(single)
+        assert IR_C.execute(single) == expected, name
+    for name, value in IR_C.exit_constants(function).items():
+        assert value is None or expected.variables.get(name, value) == value, name
+    before = function.size()
+    IR_C.optimize(function)
+    assert function.size() <= before
+    assert IR_C.execute(function) == expected
@@ -0,0 +1,34 @@
+import pytest
+
+import LEX_C
+import PARSER_C
+
+# Palabras que empiezan con una palabra reservada: son un solo ID, no IF/INT + ID
+PREFIXED = ['iffy', 'interval', 'int_x', 'if9', 'elsewhere', 'returned', 'floaty', 'chars',
+            'doubles', 'longer', 'shortcut', 'printfs']
+
+def lex(code, backend, **options):
+    lexer_obj = LEX_C.new_lexer(backend)
+    return [(tok.type, tok.value) for tok in LEX_C.iter_tokens(code, lexer_obj, **options)]
+
+@pytest.mark.parametrize('backend', LEX_C.LEXER_BACKENDS)
+@pytest.mark.parametrize('word', PREFIXED)
+def test_keyword_prefix_is_identifier(backend, word):
+    assert lex(word, backend) == [('ID', word)]
+    assert lex(f"{word}=1;", backend)[0] == ('ID', word)
+
+@pytest.mark.parametrize('backend', LEX_C.LEXER_BACKENDS)
+def test_keywords_alone(backend):
+    assert lex(" ".join(LEX_C.KEYWORDS), backend) == [(kind, word) for word, kind in LEX_C.KEYWORDS.items()]
+    assert lex("if(x)int", backend) == [('IF', 'if'), ('LPAREN', '('), ('ID', 'x'), ('RPAREN', ')'), ('INT', 'int')]
+
+@pytest.mark.parametrize('backend', LEX_C.LEXER_BACKENDS)
+def test_keyword_prefix_across_chunks(backend):
+    code = "int interval; iffy = interval;"
+    assert lex(code.encode(), backend, chunk_size=2) == lex(code, backend) == [
+        ('INT', 'int'), ('ID', 'interval'), ('SEMICOLON', ';'),
+        ('ID', 'iffy'), ('IGUALS', '='), ('ID', 'interval'), ('SEMICOLON', ';')]
+
+def test_keyword_prefix_parses_as_variable():
+    result = PARSER_C.parse_result("int main(){ int interval; int iffy; iffy = interval; return iffy; }")
+    assert result.parsing_success
@@ -0,0 +1,130 @@
+import bisect
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+
+import pytest
+
+import GEN_C
+import LEX_C
+import SCANNER_C
+from helpers import load_legacy_lexer
+
+# Piezas donde los perfiles cortan distinto: decimales, '!=', '<==', comillas con escapes...
+PIECES = list('abz_09 \t\n\r"\\<>=!.,[]:;(){}+-*/#@$ñ') + [
+    '3.14', '<==', '!==', '>=', 'int ', 'printf', 'while', '"s"', '"a\\"b"', '#include <a.h>']
+
+# Salida de los dos lexers del commit base sobre un corpus fijo (tests/make_lexer_baseline.py)
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'lexer_baseline.json'),
+          encoding='utf-8') as _file:
+    BASELINE = json.load(_file)
+
+WORD = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+BASELINE_ERROR = re.compile(r"Carácter ilegal '(.)' en posición (\d+)", re.S)
+
+@pytest.fixture(scope='module')
+def legacy():
+    return load_legacy_lexer()
+
+def expected_tokens(case):
+    """Tokens del lexer base, con el único cambio buscado: una palabra es un solo token
+
+    El lexer base partía 'iffy' en IF 'fy' e 'int9' en INT 9; ahora una palabra que no
+    es reservada es un ID completo.
+    """
+    code = case['code']
+    words = list(WORD.finditer(code))
+    starts = [word.start() for word in words]
+    result = []
+    last_word = None
+    for token in case['tokens']:
+        index = bisect.bisect_right(starts, token[3]) - 1
+        word = words[index] if index >= 0 and token[3] < words[index].end() else None
+        if word is not None and word is last_word:
+            result[-1] = ['ID', word.group(), result[-1][2], word.start()]
+        else:
+            result.append(token)
+        last_word = word
+    return result
+
+def expected_errors(case):
+    """Errores del lexer base, con cada racha de caracteres ilegales como un solo error
+
+    Una racha son caracteres ilegales seguidos que no son espacios, comillas ni '#'
+    (que sí pueden iniciar un token).
+    """
+    code = case['code']
+    runs = []
+    for message in case['errors']:
+        character, position = BASELINE_ERROR.fullmatch(message).groups()
+        position = int(position)
+        joins = not (character.isspace() or character in '"#')
+        if runs and runs[-1][2] and joins and runs[-1][1] == position:
+            runs[-1][1] = position + 1
+        else:
+            runs.append([position, position + 1, joins])
+    messages = []
+    for start, end, _ in runs:
+        if end - start == 1:
+            messages.append(f"Carácter ilegal '{code[start]}' en posición {start}")
+        else:
+            text = code[start:min(end, start + 10)] + ("..." if end - start > 10 else "")
+            messages.append(f"Caracteres ilegales '{text}' en posiciones {start}-{end - 1}")
+    return messages
+
+@pytest.mark.parametrize('backend', LEX_C.LEXER_BACKENDS)
+def test_parser_tokens_match_baseline(backend):
+    for case in BASELINE:
+        lexer_obj = LEX_C.new_lexer(backend)
+        buffer = LEX_C.TokenBuffer.from_code(case['code'], lexer_obj)
+        tokens = [[token['type'], token['value'], token['lineno'], token['lexpos']] for token in buffer.as_dicts()]
+        assert tokens == expected_tokens(case), case['code']
+        assert list(lexer_obj.errors) == expected_errors(case), case['code']
+
+def test_profiles_match_baseline(legacy):
+    for case in BASELINE:
+        buffer, category = LEX_C.analyze_profiles(case['code'])
+        assert [[token['type'], token['value'], token['lineno'], token['lexpos']]
+                for token in buffer.as_dicts()] == expected_tokens(case), case['code']
+        assert LEX_C.get_lexical_errors() == expected_errors(case), case['code']
+        assert category.report() == case['report'], case['code']
+        assert legacy.analyze_code(case['code']) == case['report'], case['code']
+
+def corpus(seed, cases):
+    rng = random.Random(seed)
+    programs = [GEN_C.generate_program(200, seed=seed + index, errors=index % 4) for index in range(5)]
+    return programs + ["".join(rng.choice(PIECES) for _ in range(rng.randint(0, 80))) for _ in range(cases)]
+
+@pytest.mark.parametrize('seed', range(25, 29))
+def test_profiles_match_ply_lexers(legacy, seed):
+    for code in corpus(seed, 750):
+        for max_errors in (None, 2):
+            ply = LEX_C.new_lexer('ply')
+            expected = LEX_C.TokenBuffer.from_code(code, ply, max_errors)
+            buffer, category = LEX_C.analyze_profiles(code, max_errors)
+            assert buffer.columns() == expected.columns(), code
+            assert LEX_C.get_lexical_errors() == list(ply.errors), code
+            report = legacy.analyze_code(code)
+            assert category.report() == report, code
+            assert SCANNER_C.scan(code, ('category',))['category'].report() == report, code
+
+def test_legacy_lexer_shares_compiler_modules():
+    path = list(sys.path)
+    legacy = load_legacy_lexer()
+    assert sys.path == path
+    assert legacy.SCANNER_C is SCANNER_C
+    assert legacy.lextab == f"lextab_{SCANNER_C.rules_signature(vars(legacy))}"
+
+def test_legacy_lexer_loads_only_the_rule_table():
+    # En un proceso nuevo, desde Lexer/: no ejecuta el LEX_C del compilador ni escribe en su carpeta
+    compiler_dir = os.path.dirname(os.path.abspath(LEX_C.__file__))
+    before = sorted(os.listdir(compiler_dir))
+    script = ("import sys, LEX_C; print(LEX_C.analyze_code('int x;').count('x'), "
+              "sorted(name for name in sys.modules if name.endswith('_C')))")
+    output = subprocess.run([sys.executable, '-c', script], cwd=os.path.join(compiler_dir, os.pardir, 'Lexer'),
+                            capture_output=True, text=True, check=True).stdout
+    assert output.split() == ['1', "['LEX_C']"]
+    assert sorted(os.listdir(compiler_dir)) == before
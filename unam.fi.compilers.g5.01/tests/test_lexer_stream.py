@@ -0,0 +1,43 @@
+import pytest
+
+import LEX_C
+
+def lex(source, **options):
+    tokens = [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in LEX_C.iter_tokens(source, **options)]
+    return tokens, list(LEX_C.lexer.errors)
+
+@pytest.mark.parametrize('backend', ['ply', 'fast'])
+def test_long_line_without_whitespace_is_cut(monkeypatch, backend):
+    monkeypatch.setattr(LEX_C, 'MAX_LINE', 256)
+    code = 'x=1;' * 5000 + 'if(x>1){y=2;}' * 500
+    sizes = []
+    lexer_obj = LEX_C.new_lexer(backend)
+    original = lexer_obj.input
+
+    def record(segment):
+        sizes.append(len(segment))
+        original(segment)
+    lexer_obj.input = record
+    streamed = [(tok.type, tok.value, tok.lexpos) for tok in
+                LEX_C.iter_tokens(code.encode(), lexer_obj, chunk_size=64)]
+    assert streamed == [(tok.type, tok.value, tok.lexpos) for tok in LEX_C.iter_tokens(code)]
+    assert len(sizes) > 50
+    assert max(sizes) <= 256 + 64
+
+@pytest.mark.parametrize('code', [
+    '"#include"\nint x;\n',
+    'x = "a;b(c)";' * 40 + '\n',
+    '#include "a\nb" int y;' * 20,
+    '#include\n<stdio.h>\n' + 'x;' * 200,
+    '@@@@;' * 100 + '"open' + 'y;' * 100,
+])
+def test_cuts_keep_tokens_and_errors(monkeypatch, code):
+    monkeypatch.setattr(LEX_C, 'MAX_LINE', 32)
+    whole = lex(code)
+    for chunk_size in (1, 3, 7, 64):
+        assert lex(code.encode(), chunk_size=chunk_size) == whole
+
+def test_unbreakable_token_is_kept_whole(monkeypatch):
+    monkeypatch.setattr(LEX_C, 'MAX_LINE', 32)
+    code = 'x = "' + 'a' * 1000 + '"; y;\n'
+    assert lex(code.encode(), chunk_size=16) == lex(code)
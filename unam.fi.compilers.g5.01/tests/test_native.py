@@ -0,0 +1,31 @@
+import pytest
+
+import Asm_Obj
+import GEN_C
+import PARSER_C
+import VM_C
+
+pytestmark = pytest.mark.skipif(not Asm_Obj.TOOLCHAIN_AVAILABLE,
+                                reason="no C compiler to assemble and link")
+
+@pytest.mark.parametrize('index', range(0, 100, 2))
+def test_native_matches_vm(index):
+    generator = GEN_C.ProgramGenerator(23 + index, max_depth=index % 8, early_returns=index % 2 == 0)
+    program = PARSER_C.parse_result(generator.program(30 + index * 7)).ast
+    expected = VM_C.execute(VM_C.compile_program(program))
+    for optimize in (True, False):
+        assert Asm_Obj.run_native(program, optimize)[0] == expected, optimize
+
+# Constantes fuera de 64 bits (un literal, y un producto que IR_C pliega): GEN_C no
+# las genera. La VM usa enteros de Python, así que se compara con su resultado reducido.
+@pytest.mark.parametrize('code', [
+    "int main(){ int a; a = 99999999999999999999; return a; }",
+    "int main(){ int a; a = 1000000; a = a * a; a = a * a; return a; }",
+])
+def test_native_wraps_to_64_bits(code):
+    program = PARSER_C.parse_result(code).ast
+    vm = VM_C.execute(VM_C.compile_program(program))
+    expected = VM_C.ExecutionResult(Asm_Obj.int64(vm.return_value), vm.output,
+                                    {name: Asm_Obj.int64(value) for name, value in vm.variables.items()})
+    for optimize in (True, False):
+        assert Asm_Obj.run_native(program, optimize)[0] == expected, optimize
@@ -0,0 +1,91 @@
+import pickle
+import threading
+import time
+import tracemalloc
+
+import PROFILE_C
+from PROFILE_C import Profiler
+
+SIZE = 2 ** 20
+
+def make_buffer():
+    return bytearray(SIZE)
+
+def test_phases_accumulate():
+    profiler = Profiler()
+    for _ in range(3):
+        with profiler.phase('lex'):
+            pass
+    with profiler.phase('parse'):
+        time.sleep(0.01)
+    assert profiler.phases['lex'].calls == 3 and profiler.phases['parse'].calls == 1
+    assert profiler.timings['parse'] >= 0.01
+    assert set(profiler.as_dict()) == {'lex', 'parse'} and 'allocated' not in profiler.as_dict()['lex']
+    assert profiler.summary().splitlines()[-1].startswith('total')
+    assert profiler.profile_text() == "cProfile capture not enabled"
+
+def test_trace_memory_and_capture():
+    profiler = Profiler(capture=True, trace_memory=True)
+    with profiler.phase('build'):
+        data = make_buffer()
+    stats = profiler.phases['build']
+    assert stats.allocated >= SIZE and stats.peak >= SIZE
+    assert not tracemalloc.is_tracing()
+    assert 'make_buffer' in profiler.profile_text()
+    copy = pickle.loads(pickle.dumps(profiler))
+    assert copy.profile is None and copy.phases['build'].peak == stats.peak
+    del data
+
+def test_nested_phase_does_not_reset_outer_capture():
+    profiler = Profiler(capture=True, trace_memory=True)
+    with profiler.phase('outer'):
+        data = bytearray(SIZE)
+        del data
+        with profiler.phase('inner'):
+            pass
+        # La fase interna solo mide tiempo: el pico de la externa sigue contando 'data'
+        with Profiler(capture=True, trace_memory=True).phase('other'):
+            pass
+    assert profiler.phases['outer'].peak >= SIZE
+    assert profiler.phases['inner'].allocated is None and profiler.phases['inner'].calls == 1
+    assert not tracemalloc.is_tracing()
+
+def test_concurrent_capture_is_serialized():
+    entered = threading.Event()
+    events = []
+    profilers = [Profiler(capture=True, trace_memory=True) for _ in range(2)]
+
+    def first():
+        with profilers[0].phase('work'):
+            entered.set()
+            data = bytearray(SIZE)
+            time.sleep(0.2)
+            events.append(('first tracing', tracemalloc.is_tracing()))
+            del data
+        events.append(('first done', None))
+
+    def second():
+        entered.wait()
+        with profilers[1].phase('work'):
+            events.append(('second started', None))
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # La segunda fase empieza hasta que termina la primera y no le apaga tracemalloc
+    assert [name for name, _ in events] == ['first tracing', 'first done', 'second started']
+    assert events[0][1] is True
+    assert profilers[0].phases['work'].peak >= SIZE
+    assert PROFILE_C._capture_thread is None and not PROFILE_C._capture_lock.locked()
+
+def test_capture_lock_released_on_error():
+    profiler = Profiler(trace_memory=True)
+    try:
+        with profiler.phase('fails'):
+            raise ValueError
+    except ValueError:
+        pass
+    assert not PROFILE_C._capture_lock.locked() and not tracemalloc.is_tracing()
+    assert profiler.phases['fails'].calls == 1
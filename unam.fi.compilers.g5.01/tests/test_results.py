@@ -0,0 +1,59 @@
+import json
+import pickle
+
+import pytest
+
+import AST_C
+import CACHE_C
+import PARSER_C
+
+SMALL = """int main() {
+    int x;
+    x = 2 + 3 * 4;
+    if (x > 10) { int y; y = x - 1; } else { printf("no"); }
+    return 0;
+}
+"""
+
+def long_sum(terms):
+    """Programa válido con una suma de 'terms' términos (un AST de esa profundidad)"""
+    return "int main() { int x; x = " + " + ".join(["1"] * terms) + "; return 0; }"
+
+def test_rows_round_trip():
+    ast = PARSER_C.parse_result(SMALL).ast
+    copy = AST_C.from_rows(AST_C.to_rows(ast))
+    assert AST_C.as_tuple(copy) == AST_C.as_tuple(ast)
+    assert copy.statements[1].expr.folded == 14
+    assert (copy.lineno, copy.lexpos) == (ast.lineno, ast.lexpos)
+
+def test_as_tuple_matches_tuple_form():
+    ast = PARSER_C.parse_result("int main() { int x; x = 1 + 2; }").ast
+    assert AST_C.as_tuple(ast) == ('program', [('declaration', ('tipo', 'int'), 'x'),
+                                               ('assignment', 'x', ('binop', '+', ('number', 1), ('number', 2)))])
+
+@pytest.fixture(scope='module')
+def deep():
+    result = PARSER_C.parse_result(long_sum(2500))
+    assert result.parsing_success
+    return result
+
+def test_deep_ast_pickle(deep):
+    loaded = pickle.loads(pickle.dumps(deep, pickle.HIGHEST_PROTOCOL))
+    assert loaded.ast.statements[1].expr.folded == 2500
+    assert loaded.to_text() == deep.to_text()
+
+def test_deep_ast_json(deep):
+    data = json.loads(deep.to_json())
+    rebuilt = AST_C.from_rows(data['ast'])
+    assert rebuilt.statements[1].expr.folded == 2500
+    # Comparar tuplas tan anidadas también es recursivo: se comparan las tablas
+    assert json.dumps(AST_C.to_rows(rebuilt)) == json.dumps(data['ast'])
+
+def test_deep_ast_disk_cache(tmp_path):
+    code = long_sum(2500)
+    path = str(tmp_path / "results.sqlite")
+    first = PARSER_C.parse_result(code, cache=CACHE_C.ResultCache(path=path))
+    cache = CACHE_C.ResultCache(path=path)
+    second = PARSER_C.parse_result(code, cache=cache)
+    assert cache.disk_hits == 1
+    assert second.to_text() == first.to_text()
@@ -0,0 +1,84 @@
+import pytest
+
+import PARSER_C
+
+def analyze(code):
+    session = PARSER_C.AnalysisSession()
+    session.parse(code)
+    return session
+
+def semantic_only(session):
+    """Errores semánticos sin los de sintaxis (que también se copian a semantic_errors)"""
+    syntax = {message for line, column, message in session.syntax_errors}
+    return [message for message in session.semantic_errors if message not in syntax]
+
+def test_inner_declaration_shadows_outer():
+    session = analyze("int main(){ int x; x = 1; if (x > 0) { int x; x = 5; } x = x + 1; return x; }")
+    assert session.parsing_success and session.semantic_errors == []
+    # La asignación del bloque fue a la x interna: la externa sigue en 1 + 1
+    assert session.symbol_table.symbols['x'].value == 2
+    assert [(symbol.name, symbol.depth, symbol.value) for symbol in session.symbol_table.scoped] == [('x', 1, 5)]
+
+def test_outer_variable_visible_in_block():
+    session = analyze("int main(){ int x; if (x > 0) { x = 2; } return x; }")
+    assert session.semantic_errors == []
+    assert session.symbol_table.symbols['x'].value == 2
+
+def test_nested_shadowing_restores_each_level():
+    session = analyze("int main(){ int x; if (x > 0) { int x; if (x > 1) { int x; x = 3; } x = 2; } x = 1; return x; }")
+    assert session.parsing_success and session.semantic_errors == []
+    assert session.symbol_table.symbols['x'].value == 1
+    assert [(symbol.depth, symbol.value) for symbol in session.symbol_table.scoped] == [(2, 3), (1, 2)]
+
+@pytest.mark.parametrize('code', [
+    "int main(){ int x; if (x > 0) { int y; y = 2; } y = 3; return 0; }",
+    "int main(){ int x; if (x > 0) { x = 2; } else { int y; y = x; } y = 1; return x; }",
+    "int main(){ int x; if (x > 0) { int y; } return y; }",
+])
+def test_block_declaration_not_visible_after_close(code):
+    session = analyze(code)
+    assert session.parsing_success
+    assert session.semantic_errors == ["Variable 'y' no declarada"]
+    assert 'y' not in session.symbol_table.symbols
+
+@pytest.mark.parametrize('code, name', [
+    ("int main(){ int x; int x; return 0; }", 'x'),
+    ("int main(){ int x; if (x > 0) { int y; float y; } return 0; }", 'y'),
+])
+def test_redeclaration_in_same_scope(code, name):
+    assert analyze(code).semantic_errors == [f"Variable '{name}' ya está declarada"]
+
+def test_same_name_in_sibling_blocks():
+    session = analyze("int main(){ int x; if (x > 0) { int y; y = 1; } else { int y; y = 2; } int y; y = 3; return y; }")
+    assert session.parsing_success and session.semantic_errors == []
+    assert [(symbol.depth, symbol.value) for symbol in session.symbol_table.scoped] == [(1, 1), (1, 2)]
+
+@pytest.mark.parametrize('code', [
+    "int main(){ int x; if (x > 0) { int y; y = ; } int y; y = 1; return y; }",
+    "int main(){ int x; if (x > ) { int y; y = 1; } int y; y = 2; return y; }",
+    "int main(){ int x; if (x > 0) { if (x > 1) { int y; y = 1 } } int y; y = 2; return y; }",
+    "int main(){ int x; else { int y; y = 1; } int y; y = 2; return y; }",
+])
+def test_scopes_balanced_after_error_recovery(code):
+    # Después de recuperarse, cada bloque se cerró: la 'y' externa se declara sin conflicto
+    session = analyze(code)
+    assert not session.parsing_success and session.syntax_errors
+    assert semantic_only(session) == []
+    assert session.symbol_table.depth == 0
+    assert session.symbol_table.symbols['y'].depth == 0
+    assert all(symbol.depth > 0 for symbol in session.symbol_table.scoped)
+
+def test_symbol_table_scopes():
+    table = PARSER_C.SymbolTable()
+    outer = table.add_symbol('a', 'int', 1)
+    table.enter_scope()
+    inner = table.add_symbol('a', 'float', 2)
+    assert table.lookup('a') is inner and inner.shadowed is outer and table.depth == 1
+    with pytest.raises(PARSER_C.SemanticError):
+        table.add_symbol('a', 'int')
+    table.exit_scope()
+    assert table.lookup('a') is outer and table.scoped == [inner] and inner.shadowed is None
+    with pytest.raises(PARSER_C.SemanticError):
+        table.exit_scope()
+    with pytest.raises(PARSER_C.SemanticError):
+        table.get_symbol('b')
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import CACHE_C
+import LEX_C
+import PARSER_C
+
+def analyze(i):
+    """Un análisis en su propia sesión; con error léxico en una de cada tres"""
+    code = f"int main(){{ int v{i}; v{i} = {i} + 1; return v{i}; }}"
+    if i % 3 == 0:
+        code += " $"
+    session = PARSER_C.AnalysisSession()
+    session.parse(code)
+    symbols = {name: symbol.value for name, symbol in session.symbol_table.symbols.items() if name != 'main'}
+    return (session.parsing_success, symbols, list(session.semantic_errors), len(session.lexical_errors))
+
+def test_parallel_sessions_do_not_mix_results():
+    runs = 400
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(analyze, range(runs)))
+    failures = [i for i, result in enumerate(results)
+                if result != (True, {f"v{i}": i + 1}, [], 1 if i % 3 == 0 else 0)]
+    assert failures == []
+
+def test_session_is_reusable():
+    session = PARSER_C.AnalysisSession()
+    session.parse("int main(){ int a; a = 1 $; }")
+    assert len(session.lexical_errors) == 1
+    session.parse("int main(){ int b; b = 2; }")
+    assert len(session.lexical_errors) == 0
+    assert 'a' not in session.symbol_table.symbols and session.symbol_table.symbols['b'].value == 2
+
+def lex(args):
+    """analyze_code en el hilo del pool; un código con i errores léxicos, repetido para la caché"""
+    i, cache = args
+    code = f"x{i} = {i};" + " @" * (i % 5)
+    tokens = LEX_C.analyze_code(code, cache=cache)
+    errors = LEX_C.get_lexical_errors()
+    return [token['value'] for token in tokens], errors
+
+def test_parallel_analyze_code_keeps_errors_per_call():
+    cache = CACHE_C.ResultCache()
+    jobs = [(i % 40, cache if i % 2 else None) for i in range(800)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lex, jobs))
+    failures = [i for (i, _), (values, errors) in zip(jobs, results)
+                if values != [f"x{i}", '=', i, ';'] or len(errors) != i % 5]
+    assert failures == [] and cache.hits > 0
+
+def test_lexical_errors_are_a_copy():
+    LEX_C.analyze_code("a = 1 @;")
+    errors = LEX_C.get_lexical_errors()
+    errors.clear()
+    assert len(LEX_C.get_lexical_errors()) == 1
+    LEX_C.analyze_code("a = 1;")
+    assert LEX_C.get_lexical_errors() == []
@@ -0,0 +1,82 @@
+import glob
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+COMPILER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TABLE_PREFIXES = ('lextab_', 'parsetab_', '.tables_')
+
+@pytest.fixture
+def compiler(tmp_path):
+    """Copia de los módulos del compilador sin tablas guardadas"""
+    for path in glob.glob(os.path.join(COMPILER_DIR, '*.py')):
+        if not os.path.basename(path).startswith(TABLE_PREFIXES):
+            shutil.copy(path, tmp_path)
+    return tmp_path
+
+def run(directory, script="import INCREMENTAL_C"):
+    return subprocess.Popen([sys.executable, '-c', script], cwd=directory,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+def check(process):
+    out, err = process.communicate(timeout=120)
+    assert process.returncode == 0, err
+    return out
+
+def tables(directory):
+    return {name: os.path.getmtime(os.path.join(directory, name))
+            for name in os.listdir(directory) if name.startswith(TABLE_PREFIXES)}
+
+def lr_signature(path):
+    namespace = {}
+    with open(path, encoding='utf-8') as file:
+        exec(file.read(), namespace)
+    return namespace['_lr_signature']
+
+def edit(path, old, new):
+    with open(path, newline='', encoding='utf-8') as file:
+        text = file.read()
+    assert old in text
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        file.write(text.replace(old, new, 1))
+
+def test_tables_written_once_and_reused(compiler):
+    check(run(compiler))
+    written = tables(compiler)
+    assert sorted(name for name in written if not name.startswith('lextab_')) == ['parsetab_c.py', 'parsetab_stmt.py']
+    assert len([name for name in written if name.startswith('lextab_')]) == 1
+    check(run(compiler))
+    assert tables(compiler) == written
+
+def test_concurrent_imports_share_the_tables(compiler):
+    processes = [run(compiler, "import INCREMENTAL_C, PARSER_C; "
+                               "print(PARSER_C.parse_result('int main(){ int x; x = 1; return x; }').parsing_success)")
+                 for _ in range(6)]
+    assert [check(process).strip() for process in processes] == ['True'] * 6
+    names = sorted(tables(compiler))
+    assert len(names) == 3 and not any(name.startswith('.tables_') for name in names)
+
+def test_rule_change_regenerates_lextab(compiler):
+    check(run(compiler))
+    before = tables(compiler)
+    edit(compiler / 'SCANNER_C.py', "BLANKS = ' \\t'", "BLANKS = ' \\t\\f'")
+    check(run(compiler))
+    after = tables(compiler)
+    old = [name for name in before if name.startswith('lextab_')]
+    new = [name for name in after if name.startswith('lextab_')]
+    assert len(new) == 1 and new != old
+    assert after['parsetab_c.py'] == before['parsetab_c.py']
+
+def test_grammar_change_regenerates_parsetab(compiler):
+    check(run(compiler))
+    signature = lr_signature(compiler / 'parsetab_c.py')
+    edit(compiler / 'PARSER_C.py', "# ==================== PARSER + SDT ENTRY POINT",
+         "def p_statement_empty(p):\n    'statement : SEMICOLON'\n    p[0] = None\n\n"
+         "# ==================== PARSER + SDT ENTRY POINT")
+    script = "import PARSER_C; print(PARSER_C.parse_result('int main(){ ; return 0; }').parsing_success)"
+    assert check(run(compiler, script)).strip() == 'True'
+    assert lr_signature(compiler / 'parsetab_c.py') != signature
+    assert 'statement -> SEMICOLON' in open(compiler / 'parsetab_c.py', encoding='utf-8').read()
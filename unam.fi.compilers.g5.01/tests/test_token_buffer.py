@@ -0,0 +1,65 @@
+import pickle
+
+import pytest
+
+import CACHE_C
+import LEX_C
+from helpers import synthetic_program
+
+CODES = [
+    "",
+    "int main(){ int x; x = 42; printf(\"a b;c\"); return x; }",
+    "#include <stdio.h>\nfloat y;\n\n  y = 3.14 <= 2 != 1;\n\"sin cerrar\n@@ x $ 7\tif9 iffy\n",
+    "int iffy;\r\nlong interval = 123456789;\r\n",
+    synthetic_program(60),
+]
+
+def per_token_dicts(code):
+    """Formato anterior de analyze_code: un dict por LexToken de PLY"""
+    return [{'type': tok.type, 'value': tok.value, 'lineno': tok.lineno, 'lexpos': tok.lexpos}
+            for tok in LEX_C.iter_tokens(code, LEX_C.new_lexer('ply'))]
+
+def assert_matches(buffer, expected):
+    assert len(buffer) == len(expected)
+    assert buffer.as_dicts() == expected
+    for view, token in zip(buffer, expected):
+        assert (view.type, view.value, view.lineno, view.lexpos) == tuple(token.values())
+        assert {key: view[key] for key in view.keys()} == token
+        assert view == token and view.as_dict() == token
+    if expected:
+        assert buffer[-1] == expected[-1] and buffer[1:3] == expected[1:3]
+
+@pytest.mark.parametrize('backend', LEX_C.LEXER_BACKENDS)
+@pytest.mark.parametrize('code', CODES, ids=range(len(CODES)))
+def test_buffer_matches_per_token_dicts(backend, code):
+    expected = per_token_dicts(code)
+    buffer = LEX_C.TokenBuffer.from_code(code, LEX_C.new_lexer(backend))
+    assert_matches(buffer, expected)
+    columns = pickle.loads(pickle.dumps(buffer.columns()))
+    assert_matches(LEX_C.TokenBuffer.from_columns(code, columns), expected)
+
+@pytest.mark.parametrize('code', CODES, ids=range(len(CODES)))
+def test_profiles_buffer_matches_per_token_dicts(code):
+    buffer, _ = LEX_C.analyze_profiles(code)
+    assert_matches(buffer, per_token_dicts(code))
+
+@pytest.mark.parametrize('code', CODES, ids=range(len(CODES)))
+def test_cached_analysis_matches_per_token_dicts(tmp_path, code):
+    expected = per_token_dicts(code)
+    path = str(tmp_path / "lex.sqlite")
+    cache = CACHE_C.ResultCache()
+    first = LEX_C.analyze_code(code, cache=cache)
+    errors = LEX_C.get_lexical_errors()
+    hit = LEX_C.analyze_code(code, cache=cache)
+    assert cache.hits == 1 and hit is not first
+    assert_matches(hit, expected)
+    assert LEX_C.get_lexical_errors() == errors
+    disk = CACHE_C.ResultCache(path=path)
+    LEX_C.analyze_code(code, cache=disk)
+    disk.close()
+    reloaded = CACHE_C.ResultCache(path=path)
+    try:
+        assert_matches(LEX_C.analyze_code(code, cache=reloaded), expected)
+        assert reloaded.disk_hits == 1 and LEX_C.get_lexical_errors() == errors
+    finally:
+        reloaded.close()
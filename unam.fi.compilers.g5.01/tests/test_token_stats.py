@@ -0,0 +1,29 @@
+from collections import Counter
+
+import pytest
+
+import GEN_C
+from helpers import legacy_analyze_code, load_legacy_lexer
+
+@pytest.fixture(scope='module')
+def legacy():
+    return load_legacy_lexer()
+
+def test_token_stats_match_per_file_lists(legacy):
+    corpus = GEN_C.generate_corpus(30, 60, seed=24, errors=1, error_kinds=('lexical',)) + ["", "@ $"]
+    stats = legacy.TokenStats()
+    histogram = Counter()
+    identifiers = Counter()
+    for index, code in enumerate(corpus):
+        assert stats.add(code, f"file{index}") == index
+        report, lists, errors = legacy_analyze_code(legacy, code)
+        assert stats.report(index) == report
+        entry = stats.file_stats()[index]
+        assert {key: entry[key] for key in legacy.CATEGORIES} == {key: len(values) for key, values in lists.items()}
+        assert entry['errors'] == errors
+        assert entry['distinct_identifiers'] == len(set(lists["Identifiers"]))
+        histogram.update({key: len(values) for key, values in lists.items()})
+        identifiers.update(lists["Identifiers"])
+    assert stats.histogram() == dict(histogram)
+    assert stats.identifier_frequencies() == sorted(identifiers.items(), key=lambda item: (-item[1], item[0]))
+    assert len(stats.summary(5).splitlines()) == 1 + len(legacy.CATEGORIES) + 2 + 5 + 3 + len(corpus)
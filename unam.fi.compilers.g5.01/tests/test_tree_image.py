@@ -0,0 +1,19 @@
+import PARSER_C
+
+def test_graph_labels_and_edges():
+    ast = PARSER_C.parse_result('int main(){ int x; x = 1 + 2; if (x > 1) { printf("hi"); } }').ast
+    nodes, edges = PARSER_C.tree_graph(ast)
+    labels = [label for node_id, label, shape, fillcolor in nodes]
+    assert labels == ['programa', 'declaracion', 'tipo: int', 'id: x', 'asignacion', 'id: x', '+',
+                      'num: 1', 'num: 2', 'if', 'condición', '>', 'id: x', 'num: 1', 'cuerpo if',
+                      'printf', '"hi"']
+    assert edges[:3] == [('0', '1'), ('1', '2'), ('1', '3')]
+    assert len(edges) == len(nodes) - 1
+
+def test_deep_expression_exports_without_recursion():
+    terms = 3000
+    result = PARSER_C.parse_result("int main(){ int x; x = " + " + ".join(["1"] * terms) + "; }")
+    image = PARSER_C.SyntaxTreeImage(result.ast)
+    dot = image.to_dot()
+    assert dot.count('label="+"') == terms - 1
+    assert image.to_svg().count('<text') == len(image.graph[0])
@@ -0,0 +1,18 @@
+import pytest
+
+import GEN_C
+import PARSER_C
+import VM_C
+
+@pytest.mark.parametrize('depth', range(8))
+def test_vm_matches_tree_walking(depth):
+    for index in range(depth, 300, 8):
+        generator = GEN_C.ProgramGenerator(21 + index, max_depth=depth)
+        program = PARSER_C.parse_result(generator.program(50 + index * 3)).ast
+        assert VM_C.execute(VM_C.compile_program(program)) == VM_C.interpret(program), index
+
+def test_execute_reports_output_and_return():
+    program = PARSER_C.parse_result(
+        'int main(){ int x; x = 6 * 7; if (x > 40) { printf("big"); } return x; }').ast
+    result = VM_C.execute(VM_C.compile_program(program))
+    assert (result.return_value, result.output, result.variables) == (42, ['big'], {'x': 42})